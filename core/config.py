@@ -6,11 +6,21 @@ FPS = 60
 # Player
 PLAYER_SPEED = 12.0  # Panda units/sec equivalent
 PLAYER_MAX_HP = 100
+PLAYER_SIZE = 36     # px, side of the 2D player box
 RESPAWN_TIME = 3.0
 
+# Enemies (2D / raycaster bots)
+ENEMY_SIZE = 36
+ENEMY_SPEED = 120.0            # px/sec
+ENEMY_COOLDOWN = 0.6           # seconds between shots
+ENEMY_ACCURACY_NOISE = 0.08    # radians of aim jitter either way
+
 # Gun / Paintball
 AMMO_CAPACITY = 20
 RELOAD_TIME = 1.2
+FIRE_COOLDOWN = 0.12
+PAINTBALL_SPEED = 720.0  # px/sec
+PAINTBALL_RADIUS = 6
 
 # Colors (RGB 0-255 for compatibility with old code)
 WHITE = (255,255,255)
@@ -0,0 +1,316 @@
+# core/spatial.py
+import math
+import numpy as np
+import pygame
+
+
+class SpatialGrid:
+    """
+    Uniform-grid index over static solid rects (map walls, obstacles).
+
+    Each rect is bucketed under every cell it overlaps, so rect/point/segment
+    queries only look at the few cells they touch instead of every solid. With
+    cell == tile size, a tile map puts exactly one wall in each occupied cell.
+    Iterating the grid yields all rects, so code that walks a plain list of
+    solids keeps working.
+    """
+
+    def __init__(self, rects=(), cell=48):
+        self.cell = int(cell)
+        self.rects = []
+        self.buckets = {}     # (cx, cy) -> [rect index]
+        self.full = set()     # cells entirely covered by one solid (tile walls)
+        self._spans = False   # some rect covers more than one cell
+        self._occ = None
+        self.reset(rects)
+
+    def reset(self, rects=()):
+        """Re-index from scratch (e.g. after a map edit); references stay valid."""
+        self.rects = []
+        self.buckets = {}
+        self.full = set()
+        self._spans = False
+        self._occ = None
+        for r in rects:
+            self.insert(r)
+
+    def __iter__(self):
+        return iter(self.rects)
+
+    def __len__(self):
+        return len(self.rects)
+
+    def _cells(self, r):
+        c = self.cell
+        return (r.left // c, r.top // c, (r.right - 1) // c, (r.bottom - 1) // c)
+
+    def insert(self, rect):
+        r = pygame.Rect(rect)
+        i = len(self.rects)
+        self.rects.append(r)
+        x0, y0, x1, y1 = self._cells(r)
+        if x1 > x0 or y1 > y0:
+            self._spans = True
+        self._occ = None
+        c = self.cell
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                self.buckets.setdefault((cx, cy), []).append(i)
+                if r.contains((cx * c, cy * c, c, c)):
+                    self.full.add((cx, cy))
+
+    def occupancy(self):
+        """
+        (cx0, cy0, mask) where mask[cy - cy0, cx - cx0] is True for cells holding
+        any solid; for vectorized prefilters. Cached until the next insert/reset.
+        """
+        if self._occ is None:
+            if not self.buckets:
+                self._occ = (0, 0, np.zeros((1, 1), dtype=bool))
+            else:
+                xs, ys = (np.array(v) for v in zip(*self.buckets))
+                x0, y0 = int(xs.min()), int(ys.min())
+                mask = np.zeros((int(ys.max()) - y0 + 1, int(xs.max()) - x0 + 1), dtype=bool)
+                mask[ys - y0, xs - x0] = True
+                self._occ = (x0, y0, mask)
+        return self._occ
+
+    def query_rect(self, rect):
+        """Solids overlapping rect."""
+        r = pygame.Rect(rect)
+        if r.w <= 0 or r.h <= 0:
+            return []
+        x0, y0, x1, y1 = self._cells(r)
+        out = []
+        seen = set() if self._spans else None
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                for i in self.buckets.get((cx, cy), ()):
+                    if seen is not None:
+                        if i in seen:
+                            continue
+                        seen.add(i)
+                    s = self.rects[i]
+                    if r.colliderect(s):
+                        out.append(s)
+        return out
+
+    def collides_rect(self, rect):
+        """True if any solid overlaps rect (stops at the first one)."""
+        r = pygame.Rect(rect)
+        if r.w <= 0 or r.h <= 0:
+            return False
+        x0, y0, x1, y1 = self._cells(r)
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                for i in self.buckets.get((cx, cy), ()):
+                    if r.colliderect(self.rects[i]):
+                        return True
+        return False
+
+    def query_point(self, x, y):
+        """Solids containing the point."""
+        c = self.cell
+        return [self.rects[i] for i in self.buckets.get((int(x // c), int(y // c)), ())
+                if self.rects[i].collidepoint(x, y)]
+
+    def segment_cells(self, a, b):
+        """Cells crossed by segment a-b, in order (grid DDA)."""
+        c = self.cell
+        ax, ay = a[0] / c, a[1] / c
+        bx, by = b[0] / c, b[1] / c
+        cx, cy = math.floor(ax), math.floor(ay)
+        ex, ey = math.floor(bx), math.floor(by)
+        dx, dy = bx - ax, by - ay
+        sx = 1 if dx > 0 else -1
+        sy = 1 if dy > 0 else -1
+        tdx = abs(1.0 / dx) if dx else math.inf
+        tdy = abs(1.0 / dy) if dy else math.inf
+        tx = ((cx + 1 - ax) if dx > 0 else (ax - cx)) * tdx if dx else math.inf
+        ty = ((cy + 1 - ay) if dy > 0 else (ay - cy)) * tdy if dy else math.inf
+        yield cx, cy
+        for _ in range(abs(ex - cx) + abs(ey - cy)):
+            if tx < ty:
+                tx += tdx
+                cx += sx
+            else:
+                ty += tdy
+                cy += sy
+            yield cx, cy
+
+    def line_of_sight(self, a, b):
+        """
+        Exact test that no solid lies on segment a-b. Walks the crossed cells;
+        a fully covered cell blocks outright (so a tile map never tests a rect),
+        other solids in the cell get a float segment/rect test.
+        """
+        full = self.full
+        buckets = self.buckets
+        for cell in self.segment_cells(a, b):
+            if cell in full:
+                return False
+            for i in buckets.get(cell, ()):
+                if segment_hits_rect(a, b, self.rects[i]):
+                    return False
+        return True
+
+    def sweep(self, a, b, radius=0.0):
+        """
+        Earliest contact of a circle of `radius` moving a->b with any solid:
+        (t in [0, 1], rect), or None. Only solids in and around the crossed
+        cells are tested.
+        """
+        reach = -(-int(math.ceil(radius)) // self.cell) if radius else 0
+        best = None
+        seen = set()
+        for cx, cy in self.segment_cells(a, b):
+            for ny in range(cy - reach, cy + reach + 1):
+                for nx in range(cx - reach, cx + reach + 1):
+                    for i in self.buckets.get((nx, ny), ()):
+                        if i in seen:
+                            continue
+                        seen.add(i)
+                        t = sweep_rect(a, b, self.rects[i], radius)
+                        if t is not None and (best is None or t < best[0]):
+                            best = (t, self.rects[i])
+        return best
+
+    def query_segment(self, a, b, pad=0):
+        """
+        Solids the segment a-b passes through, nearest cell first. pad grows each
+        solid by that many pixels per side.
+        """
+        return list(self._segment_hits(a, b, pad))
+
+    def segment_clear(self, a, b, pad=0):
+        """True if no solid lies on segment a-b (stops at the first one)."""
+        for _ in self._segment_hits(a, b, pad):
+            return False
+        return True
+
+    def _segment_hits(self, a, b, pad):
+        # with pad, a grown solid can reach into the crossed cells from a neighbour
+        reach = -(-int(pad) // self.cell) if pad else 0
+        seen = set()
+        for cx, cy in self.segment_cells(a, b):
+            for ny in range(cy - reach, cy + reach + 1):
+                for nx in range(cx - reach, cx + reach + 1):
+                    for i in self.buckets.get((nx, ny), ()):
+                        if i in seen:
+                            continue
+                        seen.add(i)
+                        s = self.rects[i]
+                        if (s.inflate(pad * 2, pad * 2) if pad else s).clipline(a, b):
+                            yield s
+
+
+class PointHash:
+    """
+    Uniform hash of moving circles (players, bots), rebuilt every tick. A
+    query only looks at the cells within reach of the query point, so finding
+    who a splash touches costs a few cells instead of a pass over everyone.
+    """
+
+    def __init__(self, cell=64):
+        self.cell = int(cell)
+        self.buckets = {}   # (cx, cy) -> [(x, y, radius, item)]
+        self.reach = 0.0    # largest radius inserted since the last rebuild
+
+    def rebuild(self, items, circle):
+        """Re-index items; circle(item) -> (x, y, radius)."""
+        c = self.cell
+        self.buckets = {}
+        self.reach = 0.0
+        for it in items:
+            x, y, r = circle(it)
+            self.buckets.setdefault((int(x // c), int(y // c)), []).append((x, y, r, it))
+            self.reach = max(self.reach, r)
+
+    def query(self, x, y, pad=0.0):
+        """Items whose circle, grown by pad, contains (x, y)."""
+        c = self.cell
+        span = self.reach + pad
+        x0, x1 = int((x - span) // c), int((x + span) // c)
+        y0, y1 = int((y - span) // c), int((y + span) // c)
+        out = []
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                for px, py, r, it in self.buckets.get((cx, cy), ()):
+                    if (px - x) ** 2 + (py - y) ** 2 <= (r + pad) ** 2:
+                        out.append(it)
+        return out
+
+
+def sweep_rect(a, b, r, radius=0.0):
+    """
+    Time of impact in [0, 1] of a circle of `radius` moving a->b against rect r,
+    or None. The rect is grown by radius on every side (corners count as
+    square, slightly early); 0 if the start already overlaps. Float slab
+    clipping, no pixel rounding.
+    """
+    ax, ay = a[0], a[1]
+    dx, dy = b[0] - ax, b[1] - ay
+    t0, t1 = 0.0, 1.0
+    for d, lo, hi, o in ((dx, r.left - radius, r.right + radius, ax), (dy, r.top - radius, r.bottom + radius, ay)):
+        if d == 0:
+            if o < lo or o >= hi:
+                return None
+            continue
+        u0, u1 = (lo - o) / d, (hi - o) / d
+        if u0 > u1:
+            u0, u1 = u1, u0
+        t0, t1 = max(t0, u0), min(t1, u1)
+        if t0 > t1:
+            return None
+    return t0
+
+
+def segment_hits_rect(a, b, r):
+    """Float segment vs rect test (slab clipping), no pixel rounding."""
+    return sweep_rect(a, b, r) is not None
+
+
+def solids_near(solids, rect):
+    """Solids worth testing against rect: a SpatialGrid query, or the whole list."""
+    if isinstance(solids, SpatialGrid):
+        return solids.query_rect(rect)
+    return solids
+
+
+def benchmark(sizes=(16, 32, 64, 128, 256), entities=64, frames=60, density=0.15, tile=48, seed=1):
+    """
+    Per-frame collision cost on random tile maps of growing size: `entities`
+    moving boxes tested against the walls by full list scan and via the grid.
+    """
+    import random
+    import time
+    rng = random.Random(seed)
+    rows = []
+    for n in sizes:
+        walls = [pygame.Rect(x * tile, y * tile, tile, tile)
+                 for y in range(n) for x in range(n) if rng.random() < density]
+        grid = SpatialGrid(walls, tile)
+        boxes = [pygame.Rect(rng.randrange(n * tile), rng.randrange(n * tile), 36, 36) for _ in range(entities)]
+        moves = [(rng.choice((-3, 3)), rng.choice((-3, 3))) for _ in boxes]
+
+        def run(query):
+            hits = 0
+            moving = [b.copy() for b in boxes]
+            t0 = time.perf_counter()
+            for _ in range(frames):
+                for b, (mx, my) in zip(moving, moves):
+                    b.move_ip(mx, my)
+                    hits += len(query(b))
+            return (time.perf_counter() - t0) * 1000 / frames, hits
+
+        scan_ms, scan_hits = run(lambda b: [w for w in walls if b.colliderect(w)])
+        grid_ms, grid_hits = run(lambda b: grid.query_rect(b))
+        assert scan_hits == grid_hits
+        rows.append({"size": n, "walls": len(walls), "scan_ms": round(scan_ms, 4), "grid_ms": round(grid_ms, 4)})
+    return rows
+
+
+if __name__ == "__main__":
+    for row in benchmark():
+        print(f"{row['size']:>4}x{row['size']:<4} walls={row['walls']:>6}  "
+              f"scan={row['scan_ms']:9.3f} ms/frame  grid={row['grid_ms']:7.3f} ms/frame")
@@ -1,4 +1,5 @@
 import math, pygame
+from core.spatial import SpatialGrid
 
 def clamp(v, lo, hi):
     return max(lo, min(hi, v))
@@ -21,6 +22,9 @@ def angle_deg(a, b):
     return math.degrees(math.acos(d))
 
 def line_of_sight(start, end, solids, step=8):
+    # Indexed solids: exact grid traversal over the cells the segment crosses
+    if isinstance(solids, SpatialGrid):
+        return solids.line_of_sight(start, end)
     # Sample along the line to see if intersects any wall rect
     vx, vy = end[0]-start[0], end[1]-start[1]
     dist = max(1, int(math.hypot(vx, vy) / step))
@@ -31,3 +35,39 @@ def line_of_sight(start, end, solids, step=8):
         if any(p.colliderect(r) for r in solids):
             return False
     return True
+
+
+class VisibilityCache:
+    """
+    Per-tick memo of line_of_sight between pairs of points. A->B and B->A share
+    one entry (endpoints are stored in a fixed order), and repeated queries
+    within a tick are answered from the table. Call next_tick() once positions
+    change; hits/misses count over the cache's lifetime.
+    """
+    def __init__(self, solids):
+        self.solids = solids
+        self.table = {}
+        self.hits = 0
+        self.misses = 0
+        self.ticks = 0
+
+    def next_tick(self):
+        self.table.clear()
+        self.ticks += 1
+
+    def visible(self, a, b):
+        a = (float(a[0]), float(a[1]))
+        b = (float(b[0]), float(b[1]))
+        key = (a, b) if a <= b else (b, a)
+        seen = self.table.get(key)
+        if seen is None:
+            self.misses += 1
+            seen = self.table[key] = line_of_sight(key[0], key[1], self.solids)
+        else:
+            self.hits += 1
+        return seen
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "ticks": self.ticks,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0}
@@ -1,8 +1,11 @@
 import random, math, pygame
+import numpy as np
 from core import settings as S
-from core.utils import norm, length, line_of_sight, angle_deg
+from core.utils import norm, length, angle_deg
 from .projectile import Paintball
 
+HUNT_RANGE = 900  # px; an unseen target this close is tracked along the flow field
+
 class BotController:
     def __init__(self, player_ref, color=(220,64,64)):
         self.p = player_ref
@@ -28,9 +31,9 @@ class BotController:
         if self.target:
             to = self.target.pos - self.p.pos
             dist = to.length()
-            if dist < S.BOT_SIGHT_RANGE and line_of_sight(self.p.pos, self.target.pos, game.solids):
+            if dist < S.BOT_SIGHT_RANGE and game.visibility.visible(self.p.pos, self.target.pos):
                 self.state = "chase"
-                move = to.normalize()
+                move = to / dist if dist > 0 else pygame.Vector2(0, 0)
                 if dist > 140:
                     move *= 1.0
                 else:
@@ -40,16 +43,13 @@ class BotController:
                     if self.fire_cd <= 0 and self.p.ammo > 0 and self.p.reload_t <= 0:
                         shoot = True
                         self.fire_cd = S.BOT_FIRE_COOLDOWN
+            elif dist < HUNT_RANGE:
+                self.state = "hunt"
+                move = self._steer(game, self.target.pos)
             else:
                 self.state = "patrol"
         if self.state == "patrol":
-            self.repath_t -= dt
-            if self.waypoint is None or self.repath_t <= 0 or (self.p.pos - self.waypoint).length() < 32:
-                self.waypoint = pygame.Vector2(random.choice(game.spawn_points))
-                self.repath_t = random.uniform(1.0, 2.5)
-            move = (self.waypoint - self.p.pos)
-            if move.length_squared() > 0:
-                move = move.normalize()
+            move = self._patrol(dt, game)
 
         # reload occasionally
         if self.p.ammo <= 0 and self.p.reload_t <= 0:
@@ -57,6 +57,130 @@ class BotController:
 
         return (move, shoot)
 
+    def _patrol(self, dt, game):
+        self.repath_t -= dt
+        if self.waypoint is None or self.repath_t <= 0 or (self.p.pos - self.waypoint).length() < 32:
+            self.waypoint = pygame.Vector2(random.choice(game.spawn_points))
+            self.repath_t = random.uniform(1.0, 2.5)
+        return self._steer(game, self.waypoint)
+
+    def _steer(self, game, goal):
+        # shared flow field around walls; straight line until the field reaches us
+        move = game.paths.steer(self.p.pos, goal)
+        if move is None:
+            move = goal - self.p.pos
+            if move.length_squared() > 0:
+                move = move.normalize()
+        return move
+
     def _pick_target(self, game):
         candidates = [pl for pl in game.players if pl.alive and pl is not self.p]
         return random.choice(candidates) if candidates else None
+
+
+class BatchBotAI:
+    """
+    Ticks every BotController at once. Perception (distance, sight range, aim
+    cone), the chase/back-off/fire decisions, patrol waypoint timers, reloads
+    and flow-field steering are evaluated as NumPy arrays over all bots in one
+    pass. Only re-picking a lost target, drawing a new patrol waypoint and the
+    (cached) line-of-sight test for targets within sight range stay per bot.
+    States, moves and shots match BotController.update.
+    """
+
+    def __init__(self, bots):
+        self.bots = bots   # shared with Game.bots, so spawns are picked up
+
+    def update(self, dt, game, bots=None):
+        """
+        Tick bots (all of them, or the given subset); returns {player id: (move
+        Vector2, shoot)}. dt may be one value or one per bot (time since each
+        bot last thought, see game/ai_lod.py).
+        """
+        bots = self.bots if bots is None else bots
+        n = len(bots)
+        if not n:
+            return {}
+        dt = np.broadcast_to(np.asarray(dt, dtype=np.float64), (n,))
+        for b in bots:
+            if b.p.alive and (b.target is None or not b.target.alive or b.target is b.p):
+                b.target = b._pick_target(game)
+
+        # one row per bot, gathered in a single pass
+        rows = []
+        for b in bots:
+            p = b.p
+            t = b.target if b.target is not None else p
+            w = b.waypoint if b.waypoint is not None else p.pos
+            rows.append((p.alive, t is not p, b.state == "patrol", b.waypoint is not None, b.fire_cd, b.repath_t,
+                         p.pos.x, p.pos.y, t.pos.x, t.pos.y, w.x, w.y, p.vel.x, p.vel.y, p.ammo, p.reload_t))
+        a = np.array(rows, dtype=np.float64)
+        alive = a[:, 0] > 0
+        has_t = alive & (a[:, 1] > 0)
+        was_patrol, has_wp = a[:, 2] > 0, a[:, 3] > 0
+        fire_cd = np.maximum(0.0, a[:, 4] - dt)
+        repath_t = a[:, 5]
+        pos, tpos, wp, vel = a[:, 6:8], a[:, 8:10], a[:, 10:12], a[:, 12:14]
+        ammo, reload_t = a[:, 14], a[:, 15]
+
+        to = tpos - pos
+        dist = np.hypot(to[:, 0], to[:, 1])
+        seen = np.zeros(n, dtype=bool)
+        for i in np.flatnonzero(has_t & (dist < S.BOT_SIGHT_RANGE)).tolist():
+            seen[i] = game.visibility.visible(bots[i].p.pos, bots[i].target.pos)
+        hunt = has_t & ~seen & (dist < HUNT_RANGE)
+        # a bot without a target keeps its last state (and idles unless patrolling)
+        patrol = alive & ~seen & ~hunt & (has_t | was_patrol)
+
+        # chase: advance, or back off when too close
+        move = np.zeros((n, 2))
+        move[seen] = (to / np.maximum(dist, 1e-9)[:, None] * np.where(dist > 140, 1.0, -0.6)[:, None])[seen]
+        # angle(to, vel) < FOV  <=>  cos(angle) > cos(FOV)
+        aim = vel + (1e-3, 0.0)
+        cos = (to * aim).sum(axis=1) / np.maximum(dist * np.hypot(aim[:, 0], aim[:, 1]), 1e-12)
+        aimed = (cos > math.cos(math.radians(S.BOT_FOV_DEG))) | (dist < 220)
+        shoot = seen & aimed & (fire_cd <= 0) & (ammo > 0) & (reload_t <= 0)
+        fire_cd[shoot] = S.BOT_FIRE_COOLDOWN
+        reload = alive & (ammo <= 0) & (reload_t <= 0)
+
+        # patrol: new waypoint when the timer runs out or the old one is reached
+        repath_t[patrol] -= dt[patrol]
+        reached = np.hypot(pos[:, 0] - wp[:, 0], pos[:, 1] - wp[:, 1]) < 32
+        due = patrol & (~has_wp | (repath_t <= 0) | reached)
+        for i in np.flatnonzero(due).tolist():
+            wp[i] = random.choice(game.spawn_points)
+            repath_t[i] = random.uniform(1.0, 2.5)
+
+        # hunt/patrol: shared flow fields, straight at the goal until they reach us
+        walk = np.flatnonzero(hunt | patrol)
+        if len(walk):
+            goals = np.where(hunt[walk, None], tpos[walk], wp[walk])
+            d = game.paths.steer_many(pos[walk], goals)
+            miss = np.isnan(d[:, 0])
+            if miss.any():
+                g = goals[miss] - pos[walk][miss]
+                l = np.hypot(g[:, 0], g[:, 1])
+                d[miss] = g / np.where(l > 0, l, 1.0)[:, None]
+            move[walk] = d
+
+        out = {}
+        for b, live, cd, st_chase, st_hunt, st_patrol, new_wp, w, rt, mv, sh, rl in zip(
+                bots, alive.tolist(), fire_cd.tolist(), seen.tolist(), hunt.tolist(), patrol.tolist(),
+                due.tolist(), wp.tolist(), repath_t.tolist(), move.tolist(), shoot.tolist(), reload.tolist()):
+            b.fire_cd = cd
+            if not live:
+                out[b.p.id] = (pygame.Vector2(0, 0), False)
+                continue
+            if st_chase:
+                b.state = "chase"
+            elif st_hunt:
+                b.state = "hunt"
+            elif st_patrol:
+                b.state = "patrol"
+                b.repath_t = rt
+                if new_wp:
+                    b.waypoint = pygame.Vector2(w)
+            if rl:
+                b.p.reload_t = 1.2
+            out[b.p.id] = (pygame.Vector2(mv), sh)
+        return out
@@ -0,0 +1,186 @@
+import math
+import time
+
+import numpy as np
+
+AI_BUDGET_MS = 2.0     # AI think time allowed per frame
+NEAR_RANGE = 600       # px to the nearest human: think every frame
+FAR_RANGE = 1400       # px: beyond this (or out of view) bots think at the far rate
+THINK_HZ = {"mid": 15.0, "far": 5.0, "idle": 2.0}
+IDLE_GROUPS = 4        # idle bots think together in this many staggered batches
+ACTIVE_STATES = ("chase", "hunt")
+IDLE_STATES = ("patrol", "idle")
+
+_GOLDEN = 0.6180339887498949
+
+
+class _Slot:
+    __slots__ = ("seq", "tier", "last", "next", "decision")
+
+    def __init__(self, seq, now):
+        self.seq = seq
+        self.tier = "near"
+        self.last = now
+        self.next = now
+        self.decision = None
+
+
+class ThinkScheduler:
+    """
+    Level-of-detail think scheduling for bots. Each bot gets a tier from its
+    distance to the nearest human (and whether it is in view) and its state:
+
+        near   within NEAR_RANGE, or fighting within FAR_RANGE: every frame
+        mid    within FAR_RANGE: THINK_HZ["mid"]
+        far    further away or out of view: THINK_HZ["far"]
+        idle   far and in an idle state: THINK_HZ["idle"], in IDLE_GROUPS batches
+
+    Rated bots are staggered (golden-ratio phase per bot) so their thinks
+    spread over frames. Each frame the due bots are taken longest overdue
+    first (nearest tier on a tie), and only as many as the per-frame budget
+    allows: the cost of a think is learned from record() (select) or timed
+    directly (run). Bots left over stay due and come first next frame, so an
+    overloaded frame slows every tier a little instead of starving the far
+    ones. Between thinks a bot replays its last decision (remember/between).
+    """
+
+    def __init__(self, position, state=None, in_view=None, budget_ms=AI_BUDGET_MS,
+                 near=NEAR_RANGE, far=FAR_RANGE, rates=None):
+        self.position = position   # agent -> (x, y)
+        self.state = state         # agent -> state name, or None
+        self.in_view = in_view     # agent -> bool, or None (distance only)
+        self.budget_ms = budget_ms
+        self.near, self.far = near, far
+        self.rates = dict(THINK_HZ, **(rates or {}))
+        self.now = 0.0
+        self.slots = {}            # agent -> _Slot
+        self.cost_ms = None        # smoothed cost of one think
+        self.thinks = 0
+        self.deferred = 0          # due thinks pushed to a later frame by the budget
+        self._seq = 0
+
+    # ---------- tiers ----------
+    def _slot(self, agent):
+        s = self.slots.get(agent)
+        if s is None:
+            s = self.slots[agent] = _Slot(self._seq, self.now)
+            self._seq += 1
+        return s
+
+    def _tiers(self, agents, humans):
+        pos = np.array([self.position(a) for a in agents], dtype=np.float64).reshape(-1, 2)
+        hum = np.array(humans, dtype=np.float64).reshape(-1, 2)
+        if len(hum):
+            d = np.sqrt(((pos[:, None, :] - hum[None, :, :]) ** 2).sum(axis=2)).min(axis=1)
+        else:
+            d = np.full(len(pos), np.inf)
+        tiers = []
+        for a, dist in zip(agents, d.tolist()):
+            st = self.state(a) if self.state else None
+            seen = self.in_view(a) if self.in_view else True
+            if seen and (dist < self.near or (st in ACTIVE_STATES and dist < self.far)):
+                tiers.append("near")
+            elif seen and dist < self.far:
+                tiers.append("mid")
+            elif st in IDLE_STATES:
+                tiers.append("idle")
+            else:
+                tiers.append("far")
+        return tiers
+
+    def _reschedule(self, s):
+        if s.tier == "near":
+            s.next = self.now
+            return
+        period = 1.0 / self.rates[s.tier]
+        if s.tier == "idle":
+            # shared slots, so idle bots think together in a few batches
+            phase = (s.seq % IDLE_GROUPS) / IDLE_GROUPS * period
+            s.next = (math.floor((self.now - phase) / period) + 1) * period + phase
+        else:
+            # keep the cadence from the due time; start over if it fell a whole period behind
+            s.next = s.next + period if s.next + period > self.now else self.now + period
+
+    # ---------- scheduling ----------
+    def _due(self, dt, agents, humans):
+        self.now += dt
+        order = {"near": 0, "mid": 1, "far": 2, "idle": 3}
+        due = []
+        for a, tier in zip(agents, self._tiers(agents, humans)):
+            s = self._slot(a)
+            if tier != s.tier:
+                s.tier = tier
+                if tier == "near":
+                    s.next = self.now
+                elif s.next > s.last:
+                    s.next = min(s.next, s.last + 1.0 / self.rates[tier])
+                else:
+                    # nothing pending (new, or was thinking every frame): spread over the period
+                    s.next = self.now + (s.seq * _GOLDEN % 1.0) / self.rates[tier]
+            if s.next <= self.now:
+                due.append((s.next, order[tier], s.seq, a, s))
+        due.sort(key=lambda e: e[:3])
+        return due
+
+    def _take(self, s):
+        # capped, so a bot left out for a while (dead, despawned) does not catch up in one jump
+        elapsed = min(self.now - s.last, 1.0 / min(self.rates.values()))
+        s.last = self.now
+        self._reschedule(s)
+        self.thinks += 1
+        return elapsed
+
+    def select(self, dt, agents, humans):
+        """
+        Advance the clock by dt and pick the bots that think this frame, within
+        the budget; returns [(agent, elapsed since its last think)]. Time the
+        batch and report it with record().
+        """
+        due = self._due(dt, agents, humans)
+        cap = len(due) if not self.cost_ms else max(1, int(self.budget_ms / self.cost_ms))
+        self.deferred += max(0, len(due) - cap)
+        return [(e[3], self._take(e[4])) for e in due[:cap]]
+
+    def record(self, count, ms):
+        """Measured time of a select()ed batch of count thinks."""
+        if count:
+            per = ms / count
+            self.cost_ms = per if self.cost_ms is None else 0.8 * self.cost_ms + 0.2 * per
+
+    def run(self, dt, agents, humans, think):
+        """
+        Per-agent variant: call think(agent, elapsed) for due bots until the
+        budget is spent (at least one runs). Returns the number that thought.
+        """
+        due = self._due(dt, agents, humans)
+        deadline = time.perf_counter() + self.budget_ms / 1000.0
+        done = 0
+        for e in due:
+            if done and time.perf_counter() >= deadline:
+                break
+            think(e[3], self._take(e[4]))
+            done += 1
+        self.deferred += len(due) - done
+        return done
+
+    # ---------- decisions ----------
+    def remember(self, agent, decision):
+        self._slot(agent).decision = decision
+
+    def between(self, agent, default=None):
+        """The agent's last decision, replayed until it thinks again."""
+        s = self.slots.get(agent)
+        return default if s is None or s.decision is None else s.decision
+
+    def forget(self, agents):
+        """Drop slots of agents no longer present."""
+        keep = set(agents)
+        for a in [a for a in self.slots if a not in keep]:
+            del self.slots[a]
+
+    def stats(self):
+        tiers = {}
+        for s in self.slots.values():
+            tiers[s.tier] = tiers.get(s.tier, 0) + 1
+        return {"tiers": tiers, "thinks": self.thinks, "deferred": self.deferred,
+                "cost_ms": round(self.cost_ms or 0.0, 4)}
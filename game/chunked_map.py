@@ -0,0 +1,227 @@
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+from core import settings as S
+from core.spatial import SpatialGrid
+from .map import FLOOR_COLOR, WALL, merge_tiles
+
+CHUNK_TILES = 32            # chunk edge in tiles
+MAX_RESIDENT_CHUNKS = 64    # LRU bound on loaded chunks
+ACTIVE_RADIUS = 1           # chunks kept loaded around each tracked position (in chunks)
+
+
+class Chunk:
+    """One resident CHUNK_TILES square: tile copy, merged colliders, index, draw layer."""
+    __slots__ = ("cx", "cy", "tiles", "walls", "solids", "layer", "layer_key")
+
+    def __init__(self, cx, cy, tiles):
+        self.cx, self.cy = cx, cy
+        self.tiles = tiles
+        self.walls = []
+        self.solids = SpatialGrid(cell=S.TILE_SIZE)
+        self.layer = None
+        self.layer_key = None
+        self.rebuild()
+
+    def rebuild(self):
+        t = S.TILE_SIZE
+        ox, oy = self.cx * CHUNK_TILES, self.cy * CHUNK_TILES
+        self.walls = [pygame.Rect((ox + x) * t, (oy + y) * t, w * t, h * t)
+                      for x, y, w, h in merge_tiles(self.tiles)]
+        self.solids.reset(self.walls)
+        self.layer = None
+
+
+class ChunkedSolids(SpatialGrid):
+    """
+    SpatialGrid facade over a ChunkedTileMap: the same queries, answered by the
+    chunks they touch (loading them on demand). Iterating yields only resident
+    colliders. Colliders are merged per chunk, so none crosses a chunk edge.
+    """
+
+    def __init__(self, tilemap):
+        super().__init__(cell=S.TILE_SIZE)
+        self.map = tilemap
+
+    def __iter__(self):
+        for ch in list(self.map.chunks.values()):
+            yield from ch.walls
+
+    def __len__(self):
+        return sum(len(ch.walls) for ch in self.map.chunks.values())
+
+    def query_rect(self, rect):
+        r = pygame.Rect(rect)
+        out = []
+        for ch in self.map.chunks_in_rect(r):
+            out.extend(ch.solids.query_rect(r))
+        return out
+
+    def collides_rect(self, rect):
+        r = pygame.Rect(rect)
+        return any(ch.solids.collides_rect(r) for ch in self.map.chunks_in_rect(r))
+
+    def query_point(self, x, y):
+        ch = self.map.chunk_at_px(x, y)
+        return ch.solids.query_point(x, y) if ch is not None else []
+
+    def line_of_sight(self, a, b):
+        # walls are whole tiles, so a crossed wall tile blocks outright
+        tile = self.map.tile
+        for cx, cy in self.segment_cells(a, b):
+            if tile(cx, cy) == WALL:
+                return False
+        return True
+
+    def occupancy(self):
+        return None   # no whole-map view; callers skip their prefilter
+
+    def sweep(self, a, b, radius=0.0):
+        grow = int(radius) + 1
+        box = pygame.Rect(min(a[0], b[0]) - grow, min(a[1], b[1]) - grow,
+                          abs(b[0] - a[0]) + 2 * grow, abs(b[1] - a[1]) + 2 * grow)
+        hits = [h for h in (ch.solids.sweep(a, b, radius) for ch in self.map.chunks_in_rect(box)) if h]
+        return min(hits, key=lambda h: h[0]) if hits else None
+
+    def _segment_hits(self, a, b, pad):
+        grow = pad + 1
+        box = pygame.Rect(min(a[0], b[0]) - grow, min(a[1], b[1]) - grow,
+                          abs(b[0] - a[0]) + 2 * grow, abs(b[1] - a[1]) + 2 * grow)
+        for ch in self.map.chunks_in_rect(box):
+            yield from ch.solids._segment_hits(a, b, pad)
+
+
+class ChunkedTileMap:
+    """
+    TileMap backend for very large arenas. The tile grid stays in its source
+    array (typically memory-mapped from a .pbmap, see game/mapfile.py) and is
+    split into CHUNK_TILES squares that are copied in, merged into colliders and
+    indexed only when touched. track() keeps the chunks around active players
+    loaded; beyond max_resident the least recently used chunk is dropped.
+    Runtime edits (set_tile) are kept aside and re-applied when a chunk reloads.
+
+    Same surface as TileMap: width, height, tiles, spawn_points, solids, walls
+    (resident only), window(), set_tile(), on_edit, draw().
+    """
+
+    def __init__(self, map_json, max_resident=MAX_RESIDENT_CHUNKS):
+        self.tiles = np.asarray(map_json["tiles"], dtype=np.uint8)
+        self.height, self.width = self.tiles.shape
+        self.spawn_points = [pygame.Vector2(p) for p in map_json.get("spawns", [(80,80),(600,400),(1000,600)])]
+        self.max_resident = max(1, max_resident)
+        self.chunks = OrderedDict()   # (cx, cy) -> Chunk, least recently used first
+        self.edits = {}               # (x, y) -> tile value set at runtime
+        self.on_edit = []             # callbacks (x, y, value) after set_tile
+        self.solids = ChunkedSolids(self)
+        self.loads = 0
+        self.evictions = 0
+
+    @property
+    def walls(self):
+        return list(self.solids)
+
+    # ---------- chunks ----------
+    def chunk(self, cx, cy):
+        """Resident chunk (cx, cy), loading it if needed; None outside the map."""
+        key = (cx, cy)
+        ch = self.chunks.get(key)
+        if ch is not None:
+            self.chunks.move_to_end(key)
+            return ch
+        x0, y0 = cx * CHUNK_TILES, cy * CHUNK_TILES
+        if cx < 0 or cy < 0 or x0 >= self.width or y0 >= self.height:
+            return None
+        tiles = np.array(self.tiles[y0:y0 + CHUNK_TILES, x0:x0 + CHUNK_TILES])
+        for (x, y), v in self.edits.items():
+            if x0 <= x < x0 + CHUNK_TILES and y0 <= y < y0 + CHUNK_TILES:
+                tiles[y - y0, x - x0] = v
+        ch = self.chunks[key] = Chunk(cx, cy, tiles)
+        self.loads += 1
+        while len(self.chunks) > self.max_resident:
+            self.chunks.popitem(last=False)
+            self.evictions += 1
+        return ch
+
+    def chunk_at_px(self, x, y):
+        span = CHUNK_TILES * S.TILE_SIZE
+        return self.chunk(int(x // span), int(y // span))
+
+    def chunks_in_rect(self, rect):
+        """Chunks overlapping a pixel rect (clipped to the map)."""
+        span = CHUNK_TILES * S.TILE_SIZE
+        nx, ny = -(-self.width // CHUNK_TILES), -(-self.height // CHUNK_TILES)
+        x0, y0 = max(0, rect.left // span), max(0, rect.top // span)
+        x1, y1 = min(nx - 1, (rect.right - 1) // span), min(ny - 1, (rect.bottom - 1) // span)
+        return [self.chunk(cx, cy) for cy in range(y0, y1 + 1) for cx in range(x0, x1 + 1)]
+
+    def track(self, positions, radius=ACTIVE_RADIUS):
+        """Load (and mark most recently used) the chunks around each pixel position."""
+        span = CHUNK_TILES * S.TILE_SIZE
+        for p in positions:
+            pcx, pcy = int(p[0] // span), int(p[1] // span)
+            for cy in range(pcy - radius, pcy + radius + 1):
+                for cx in range(pcx - radius, pcx + radius + 1):
+                    self.chunk(cx, cy)
+
+    def stats(self):
+        return {"resident": len(self.chunks), "loads": self.loads, "evictions": self.evictions}
+
+    # ---------- tiles ----------
+    def tile(self, x, y):
+        """Tile value at tile coords; outside the map counts as wall."""
+        if x < 0 or y < 0 or x >= self.width or y >= self.height:
+            return WALL
+        ch = self.chunk(x // CHUNK_TILES, y // CHUNK_TILES)
+        return int(ch.tiles[y % CHUNK_TILES, x % CHUNK_TILES])
+
+    def window(self, x0, y0, x1, y1):
+        """
+        Tile values of columns x0..x1-1, rows y0..y1-1 with edits applied. Reads
+        only that slice of the source grid and loads no chunks.
+        """
+        out = np.array(self.tiles[y0:y1, x0:x1])
+        for (x, y), v in self.edits.items():
+            if x0 <= x < x1 and y0 <= y < y1:
+                out[y - y0, x - x0] = v
+        return out
+
+    def is_open(self, px, py):
+        """True if the pixel position is on a floor tile."""
+        t = S.TILE_SIZE
+        return self.tile(int(px // t), int(py // t)) != WALL
+
+    def open_spawns(self):
+        """Spawn points not covered by a wall (edits included)."""
+        return [p for p in self.spawn_points if self.is_open(p.x, p.y)]
+
+    def set_tile(self, x, y, value):
+        self.edits[(x, y)] = value
+        ch = self.chunks.get((x // CHUNK_TILES, y // CHUNK_TILES))
+        if ch is not None and ch.tiles[y % CHUNK_TILES, x % CHUNK_TILES] != value:
+            ch.tiles[y % CHUNK_TILES, x % CHUNK_TILES] = value
+            ch.rebuild()
+        for fn in self.on_edit:
+            fn(x, y, value)
+
+    # ---------- drawing ----------
+    def _chunk_layer(self, ch, tile_surf, target):
+        key = tile_surf
+        if ch.layer is None or ch.layer_key is not key:
+            t = S.TILE_SIZE
+            h, w = ch.tiles.shape
+            layer = pygame.Surface((w * t, h * t), 0, target)
+            layer.fill(FLOOR_COLOR)
+            ys, xs = np.nonzero(ch.tiles == WALL)
+            layer.blits([(tile_surf, (int(x) * t, int(y) * t)) for x, y in zip(xs, ys)], doreturn=False)
+            ch.layer, ch.layer_key = layer, key
+        return ch.layer
+
+    def draw(self, surf, tile_surf, camera=(0, 0)):
+        """Draw the part of the map under the view whose top-left is `camera` (pixels)."""
+        surf.fill(FLOOR_COLOR)
+        view = pygame.Rect(int(camera[0]), int(camera[1]), *surf.get_size())
+        span = CHUNK_TILES * S.TILE_SIZE
+        for ch in self.chunks_in_rect(view):
+            surf.blit(self._chunk_layer(ch, tile_surf, surf), (ch.cx * span - view.x, ch.cy * span - view.y))
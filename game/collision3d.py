@@ -0,0 +1,119 @@
+# game/collision3d.py
+from panda3d.core import (BitMask32, CollisionHandlerQueue, CollisionNode, CollisionPlane, CollisionPolygon,
+                          CollisionSegment, CollisionSphere, CollisionTraverser, Plane, Point3, Vec3)
+
+WALL_MASK = BitMask32.bit(0)
+TEAM_BITS = {}  # team name -> into-mask bit, handed out on first use
+
+
+def team_mask(team_name):
+    if team_name not in TEAM_BITS:
+        TEAM_BITS[team_name] = BitMask32.bit(1 + len(TEAM_BITS))
+    return TEAM_BITS[team_name]
+
+
+def enemy_mask(team_name):
+    """What a ball fired by team_name can hit: walls and every other known team."""
+    mask = BitMask32(WALL_MASK)
+    for name, bit in TEAM_BITS.items():
+        if name != team_name:
+            mask |= bit
+    return mask
+
+
+class HitDetector3D:
+    """
+    Paintball hits through Panda3D's CollisionTraverser instead of Python
+    distance checks. Each live ball carries a CollisionSegment covering the
+    distance it moved this frame (so fast balls cannot skip through a bot or a
+    wall), bots carry CollisionSpheres on their team's bit, and the arena walls
+    and ground sit on WALL_MASK. A ball's from-mask is the walls plus the
+    enemy teams, so friendly balls never even reach the handler.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.trav = CollisionTraverser("paintballs")
+        self.queue = CollisionHandlerQueue()
+
+    # ---------- static / targets ----------
+    def add_ground(self, z=0.0):
+        cn = CollisionNode("ground")
+        cn.add_solid(CollisionPlane(Plane(Vec3(0, 0, 1), Point3(0, 0, z))))
+        self._static(cn)
+
+    def add_wall(self, a, b, height):
+        """Vertical wall quad from a to b (x, y), hit from either side."""
+        p = [Point3(a[0], a[1], 0), Point3(b[0], b[1], 0), Point3(b[0], b[1], height), Point3(a[0], a[1], height)]
+        cn = CollisionNode("wall")
+        cn.add_solid(CollisionPolygon(*p))
+        cn.add_solid(CollisionPolygon(*reversed(p)))
+        self._static(cn)
+
+    def _static(self, cn):
+        cn.set_into_collide_mask(WALL_MASK)
+        cn.set_from_collide_mask(BitMask32.all_off())
+        self.root.attach_new_node(cn)
+
+    def add_target(self, ent, team_name, radius=1.0):
+        """Hit sphere on ent.node; entries report ent as the target."""
+        cn = CollisionNode(f"hit-{ent.name}")
+        cn.add_solid(CollisionSphere(0, 0, 0, radius))
+        cn.set_into_collide_mask(team_mask(team_name))
+        cn.set_from_collide_mask(BitMask32.all_off())
+        ent.node.attach_new_node(cn).set_python_tag("target", ent)
+
+    # ---------- balls ----------
+    def _collider(self, ball):
+        # pooled nodes keep their collider between shots
+        cnp = ball.node.get_python_tag("collider")
+        if cnp is None:
+            cn = CollisionNode("paintball-ray")
+            cn.add_solid(CollisionSegment(Point3(0, 0, 0), Point3(0, 1, 0)))
+            cn.set_into_collide_mask(BitMask32.all_off())
+            cnp = ball.node.attach_new_node(cn)
+            ball.node.set_python_tag("collider", cnp)
+        return cnp
+
+    def add_ball(self, ball, team_name):
+        cnp = self._collider(ball)
+        cnp.node().set_from_collide_mask(enemy_mask(team_name))
+        cnp.set_python_tag("ball", ball)
+
+    def drop(self, ball):
+        """Stop testing a ball (expired or hit)."""
+        cnp = ball.node.get_python_tag("collider")
+        if cnp is not None and self.trav.has_collider(cnp):
+            self.trav.remove_collider(cnp)
+
+    def resolve(self, balls):
+        """
+        Traverse once for the balls that moved this frame. Returns (ball,
+        target, point) for each ball's earliest contact; target is None for a
+        wall or the ground, and bots that are already down are passed over.
+        """
+        # only balls that moved this frame are tested, each along exactly its step
+        self.trav.clear_colliders()
+        for ball in balls:
+            if not ball.alive or ball.step.length_squared() <= 1e-12:
+                continue
+            cnp = ball.node.get_python_tag("collider")
+            seg = cnp.node().modify_solid(0)
+            # node-local segment from last frame's position to this one
+            seg.set_point_a(Point3(-ball.step))
+            seg.set_point_b(Point3(0, 0, 0))
+            self.trav.add_collider(cnp, self.queue)
+        self.queue.clear_entries()
+        self.trav.traverse(self.root)
+        self.queue.sort_entries()  # nearest to each segment's start first
+        hits, done = [], set()
+        for entry in self.queue.entries:
+            ball = entry.get_from_node_path().get_python_tag("ball")
+            if id(ball) in done or not ball.alive:
+                continue
+            target = entry.get_into_node_path().get_python_tag("target")
+            if target is not None and not target.alive:
+                continue
+            done.add(id(ball))
+            hits.append((ball, target, entry.get_surface_point(self.root)))
+        return hits
@@ -3,6 +3,7 @@ from game.player import Player
 from core.config import ENEMY_ACCURACY_NOISE, ENEMY_COOLDOWN, ENEMY_SIZE, ENEMY_SPEED, RED, RED
 from game.projectile import Paintball
 from game.gun import PaintballGun
+from core.spatial import solids_near
 
 class Enemy:
     def __init__(self, x, y, name, color, team_name):
@@ -15,49 +16,70 @@ class Enemy:
         self.fire_cd = 0.0
         self.gun = PaintballGun()
         self.invuln = 0.6
+        self.carry = [0.0, 0.0]  # sub-pixel motion not yet applied to the rect
 
     def center(self):
         return (self.rect.centerx, self.rect.centery)
 
     def update(self, dt, player_pos, obstacles):
+        self.tick(dt)
+        heading, shot = self.think(player_pos)
+        self.step(heading, dt, obstacles)
+        return shot
+
+    def tick(self, dt):
+        """Per-frame timers (cooldowns, spawn protection, reload)."""
         self.fire_cd = max(0, self.fire_cd - dt)
         if self.invuln > 0: self.invuln -= dt
         self.gun.update(dt)
+
+    def think(self, player_pos):
+        """Decide: returns (heading toward the player, Paintball fired or None)."""
         # simple chase toward player with obstacle avoidance by sliding
         px, py = player_pos
         cx, cy = self.center()
         dx, dy = px - cx, py - cy
         l = max(1e-6, (dx*dx+dy*dy)**0.5)
-        mvx, mvy = dx/l, dy/l
+        heading = (dx/l, dy/l)
+
+        # shoot occasionally when roughly aligned
+        shot = None
+        if l < 500 and self.fire_cd <= 0 and self.gun.ammo > 0 and self.gun.reload_t <= 0:
+            # add some inaccuracy
+            ang = math.atan2(dy, dx) + random.uniform(-ENEMY_ACCURACY_NOISE, ENEMY_ACCURACY_NOISE)
+            dirv = (math.cos(ang), math.sin(ang))
+            self.fire_cd = ENEMY_COOLDOWN
+            self.gun.ammo -= 1
+            shot = Paintball((cx, cy), dirv, self, self.team_name, self.color)
+        elif self.gun.ammo <= 0:
+            self.gun.start_reload()
+        return heading, shot
 
+    def step(self, heading, dt, obstacles):
+        """Move dt along heading (unit vector), sliding along obstacles."""
+        mvx, mvy = heading
         # move step-by-step (basic AABB resolving)
         step = ENEMY_SPEED * dt
+        # per-frame steps are often under a pixel: keep the remainder for the next frame
+        fx, fy = self.carry[0] + mvx*step, self.carry[1] + mvy*step
+        ix, iy = int(fx), int(fy)
+        self.carry = [fx - ix, fy - iy]
         # horizontal
-        self.rect.x += int(mvx*step)
-        for ob in obstacles:
+        before = self.rect.copy()
+        self.rect.x += ix
+        for ob in solids_near(obstacles, self.rect.union(before)):
             if self.rect.colliderect(ob):
                 if mvx > 0: self.rect.right = ob.left
                 else: self.rect.left = ob.right
+                self.carry[0] = 0.0
         # vertical
-        self.rect.y += int(mvy*step)
-        for ob in obstacles:
+        before = self.rect.copy()
+        self.rect.y += iy
+        for ob in solids_near(obstacles, self.rect.union(before)):
             if self.rect.colliderect(ob):
                 if mvy > 0: self.rect.bottom = ob.top
                 else: self.rect.top = ob.bottom
-
-        # shoot occasionally when roughly aligned
-        dist = ((px-cx)**2 + (py-cy)**2) ** 0.5
-        if dist < 500 and self.fire_cd <= 0 and self.gun.ammo > 0 and self.gun.reload_t <= 0:
-            aimx, aimy = px, py
-            # add some inaccuracy
-            ang = math.atan2(aimy-cy, aimx-cx) + random.uniform(-ENEMY_ACCURACY_NOISE, ENEMY_ACCURACY_NOISE)
-            dirv = (math.cos(ang), math.sin(ang))
-            self.fire_cd = ENEMY_COOLDOWN
-            self.gun.ammo -= 1
-            return Paintball((cx, cy), dirv, self, self.team_name, self.color)
-        if self.gun.ammo <= 0:
-            self.gun.start_reload()
-        return None
+                self.carry[1] = 0.0
 
     def take_hit(self, dmg):
         if not self.alive or self.invuln > 0: return False
@@ -1,14 +1,22 @@
 import math
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
 import pygame
-from typing import Iterable, List, Optional, Sequence, Tuple
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
 
-from core.config import WIDTH, HEIGHT, BG, WHITE, FPS
+from core.config import WIDTH, HEIGHT, WHITE, FPS
+from game.fps_parallel import StripPool
+from game.fps_resolution import DynamicResolution
+from game.fps_textures import WallTextures
 
 # --------------------------------------------------------------------------------------
 # Core params (kept)
 # --------------------------------------------------------------------------------------
 FOV = math.radians(70)     # field of view
-NUM_RAYS = 240             # number of vertical slices
+NUM_RAYS = WIDTH           # number of vertical slices (one ray per screen column)
 MAX_DEPTH = 1000           # max ray distance (pixels)
 WALL_SIZE = 64             # world tile size in pixels
 STEP = 4                   # ray march step in pixels
@@ -23,6 +31,8 @@ BOB_FREQ = 8.0
 FOG_COLOR = (35, 38, 42)   # matches ground; used to fade distant walls
 FOG_DENSITY = 0.0025       # exponential fog density (higher = thicker fog)
 VIGNETTE_ALPHA = 80        # subtle darkening at edges; 0 disables
+SKY_COLOR = (62, 78, 112)
+GROUND_COLOR = (35, 38, 42)
 
 EPS = 1e-9
 
@@ -41,6 +51,147 @@ def grid_at(game_map: Sequence[Sequence[int]], x: float, y: float) -> int:
     return game_map[gy][gx]
 
 
+_grid_cache: Tuple[object, Optional[np.ndarray]] = (None, None)
+
+
+def grid_array(game_map: Union[Sequence[Sequence[int]], np.ndarray]) -> np.ndarray:
+    """
+    NEW: NumPy copy of the map grid (shape (h, w), uint8) for the batched ray engine.
+    The last converted list-of-lists map is cached by identity; call
+    invalidate_grid_array() after editing a map in place.
+    """
+    global _grid_cache
+    if isinstance(game_map, np.ndarray):
+        return game_map
+    src, arr = _grid_cache
+    if src is not game_map or arr is None:
+        arr = np.asarray(game_map, dtype=np.uint8)
+        _grid_cache = (game_map, arr)
+    return arr
+
+
+def invalidate_grid_array() -> None:
+    """Drop the cached NumPy copy made by grid_array() and its distance field."""
+    global _grid_cache, _field_cache
+    _grid_cache = (None, None)
+    _field_cache = (None, None, 0.0)
+
+
+# --------------------------------------------------------------------------------------
+# Distance field (empty-space skipping)
+# --------------------------------------------------------------------------------------
+SKIP_MIN_DIST = 3       # fields below this cannot save a DDA step, so no jump is tried
+SKIP_MIN_OPENNESS = 6.0  # mean field over empty cells needed before batched casts skip
+
+_field_cache: Tuple[object, Optional[np.ndarray], float] = (None, None, 0.0)
+
+
+def chebyshev_distance(grid: np.ndarray) -> np.ndarray:
+    """
+    NEW: Per-cell Chebyshev distance (in cells) to the nearest non-zero cell.
+    Walls are 0, their 8 neighbours 1, and so on; every cell within distance
+    d - 1 of a cell with value d is empty. Maps without walls get max(w, h).
+    Two-pass 3x3 chamfer with unit weights (exact for this metric): one sweep
+    down and one up, each row relaxed against the previous row and then along
+    itself with a running minimum, so the cost is linear in the map size.
+    """
+    h, w = grid.shape
+    cap = max(w, h)
+    walls = grid != 0
+    if not walls.any():
+        return np.full((h, w), cap, dtype=np.int32)
+    big = w + h
+    field = np.where(walls, 0, big).astype(np.int32)
+    idx = np.arange(w, dtype=np.int32)
+    prev = np.full(w + 2, big, dtype=np.int32)
+    for rows in (range(h), range(h - 1, -1, -1)):
+        prev[:] = big
+        for y in rows:
+            row = np.minimum(field[y], np.minimum(np.minimum(prev[:-2], prev[1:-1]), prev[2:]) + 1)
+            # d[x] = min(d[x'] + |x - x'|): running minimum from the left, then from the right
+            row = np.minimum(row, np.minimum.accumulate(row - idx) + idx)
+            row = np.minimum(row, np.minimum.accumulate((row + idx)[::-1])[::-1] - idx)
+            field[y] = row
+            prev[1:-1] = row
+    return field
+
+
+def distance_field(game_map: Union[Sequence[Sequence[int]], np.ndarray]) -> np.ndarray:
+    """
+    NEW: Cached chebyshev_distance of the map, built on first use after a map loads
+    (and again after invalidate_grid_array()).
+    """
+    return _cached_field(game_map)[0]
+
+
+def _cached_field(game_map) -> Tuple[np.ndarray, float]:
+    """(field, openness) for the map; openness is the mean field over empty cells."""
+    global _field_cache
+    grid = grid_array(game_map)
+    src, field, openness = _field_cache
+    if src is not grid or field is None:
+        field = chebyshev_distance(grid)
+        field.setflags(write=False)
+        empty = field[field > 0]
+        openness = float(empty.mean()) if empty.size else 0.0
+        _field_cache = (grid, field, openness)
+    return field, openness
+
+
+def skip_field(game_map: Union[Sequence[Sequence[int]], np.ndarray]) -> Optional[np.ndarray]:
+    """
+    NEW: distance_field for maps open enough that batched casts gain from jumping
+    (mean distance over empty cells >= SKIP_MIN_OPENNESS), else None. On tight
+    maps every ray ends within a few cells and the jump bookkeeping costs more
+    than the steps it saves.
+    """
+    field, openness = _cached_field(game_map)
+    return field if openness >= SKIP_MIN_OPENNESS else None
+
+
+def _skip_field_for(game_map, skip: Optional[bool]) -> Optional[np.ndarray]:
+    """Resolve a `skip` argument (True / False / None = auto) to a field or None."""
+    if skip is None:
+        return skip_field(game_map)
+    return distance_field(game_map) if skip else None
+
+
+def _skip_counts(d, side_x, side_y, delta_x, delta_y):
+    """
+    Crossings per axis that provably stay inside the empty (2d-1)^2 square around
+    the current cell: every crossing strictly before the first one leaving the
+    square, minus one for float safety. Works on floats or NumPy arrays.
+    Callers advance side_x/side_y by adding delta once per crossing, as the DDA
+    step does: side + j * delta rounds differently from the stepped sum and
+    breaks exact side_x == side_y ties (rays through grid corners) the other way.
+    """
+    k = d - 1
+    t_exit = np.minimum(side_x + k * delta_x, side_y + k * delta_y)
+    jx = np.ceil((t_exit - side_x) / delta_x) - 1
+    jy = np.ceil((t_exit - side_y) / delta_y) - 1
+    jx = np.where(np.isfinite(jx), np.clip(jx, 0, k), 0)
+    jy = np.where(np.isfinite(jy), np.clip(jy, 0, k), 0)
+    return jx, jy
+
+
+def _skip_counts_scalar(d: int, side_x: float, side_y: float, delta_x: float, delta_y: float) -> Tuple[int, int]:
+    """_skip_counts for one ray in plain floats (NumPy calls per step cost more than the jump saves)."""
+    k = d - 1
+    fx = side_x < math.inf and delta_x < math.inf
+    fy = side_y < math.inf and delta_y < math.inf
+    if fx and fy:
+        t_exit = min(side_x + k * delta_x, side_y + k * delta_y)
+    elif fx:
+        t_exit = side_x + k * delta_x
+    elif fy:
+        t_exit = side_y + k * delta_y
+    else:
+        return 0, 0
+    jx = min(max(math.ceil((t_exit - side_x) / delta_x) - 1, 0), k) if fx else 0
+    jy = min(max(math.ceil((t_exit - side_y) / delta_y) - 1, 0), k) if fy else 0
+    return jx, jy
+
+
 # --------------------------------------------------------------------------------------
 # Ray casting
 # --------------------------------------------------------------------------------------
@@ -58,7 +209,9 @@ def cast_single_ray_dda(
     py: float,
     angle: float,
     game_map: Sequence[Sequence[int]],
-    max_depth: float = MAX_DEPTH
+    max_depth: float = MAX_DEPTH,
+    *,
+    field: Optional[np.ndarray] = None,
 ) -> Tuple[float, bool, int, float, float, float, int]:
     """
     NEW: Robust DDA ray cast in grid space.
@@ -67,6 +220,9 @@ def cast_single_ray_dda(
       - tex_u: [0..1] fractional coord along the wall (for texturing)
       - hit_x/y: impact point in pixels
       - cell_value: the map value that was hit
+    With `field` (see distance_field) the march jumps across open space; the
+    hit is bit-identical to the plain march, corner ties included. A jump costs more Python than the steps it
+    saves on one ray, so hitscan and line_of_sight cast without it.
     """
     # Convert to grid units (tile = 1)
     pos_x = px / WALL_SIZE
@@ -109,6 +265,20 @@ def cast_single_ray_dda(
 
     while steps < max_steps:
         steps += 1
+        if field is not None and 0 <= map_x < map_w and 0 <= map_y < map_h:
+            d = field.item(map_y, map_x)
+            if d >= SKIP_MIN_DIST:
+                sx = side_x if side_x == side_x else math.inf  # NaN -> never stepped
+                sy = side_y if side_y == side_y else math.inf
+                jx, jy = _skip_counts_scalar(d, sx, sy, delta_x, delta_y)
+                # add delta once per crossing, as the step below does: j * delta
+                # rounds differently and flips side_x == side_y corner ties
+                for _ in range(jx):
+                    side_x += delta_x
+                for _ in range(jy):
+                    side_y += delta_y
+                map_x += jx * step_x
+                map_y += jy * step_y
         if side_x < side_y:
             side_x += delta_x
             map_x += step_x
@@ -184,6 +354,330 @@ def build_depth_map(
     return out
 
 
+class DepthBuffer(NamedTuple):
+    """Per-ray results of the batched engine as parallel arrays (length == num_rays)."""
+    dist: np.ndarray    # float64, perpendicular distance in pixels
+    hit: np.ndarray     # bool
+    side: np.ndarray    # int8, 0 vertical grid line, 1 horizontal
+    tex_u: np.ndarray   # float64, [0..1] along the wall
+    cell: np.ndarray    # uint8, map value that was hit (0 on miss)
+
+
+class RayFan(NamedTuple):
+    """Per-ray direction data the DDA needs, derived once per camera angle."""
+    dx: np.ndarray        # cos of ray angle
+    dy: np.ndarray        # sin of ray angle
+    delta_x: np.ndarray   # |1/dx| (inf when dx ~ 0)
+    delta_y: np.ndarray
+    step_x: np.ndarray    # -1 / +1
+    step_y: np.ndarray
+
+    def strip(self, lo: int, hi: int) -> "RayFan":
+        return RayFan(*(a[lo:hi] for a in self))
+
+
+def ray_fan(dx: np.ndarray, dy: np.ndarray) -> RayFan:
+    """NEW: Build a RayFan from unit ray directions."""
+    with np.errstate(divide="ignore"):
+        delta_x = np.where(np.abs(dx) < EPS, np.inf, np.abs(1.0 / dx))
+        delta_y = np.where(np.abs(dy) < EPS, np.inf, np.abs(1.0 / dy))
+    return RayFan(dx, dy, delta_x, delta_y, np.where(dx < 0, -1, 1), np.where(dy < 0, -1, 1))
+
+
+class RayTable:
+    """
+    NEW: Camera-plane ray table for a fixed (num_rays, fov). The per-ray angle
+    offsets' cos/sin are computed once; a new camera angle only rotates them
+    (4 multiplies + 2 adds per ray) and rebuilds the DDA deltas, and frames where
+    the angle did not change (pure movement) reuse the whole fan.
+    """
+
+    def __init__(self, num_rays: int, fov: float) -> None:
+        offsets = -fov / 2 + np.arange(num_rays) * (fov / num_rays)
+        self.num_rays = num_rays
+        self.fov = fov
+        self.cos_off = np.cos(offsets)
+        self.sin_off = np.sin(offsets)
+        self._angle: Optional[float] = None
+        self._fan: Optional[RayFan] = None
+
+    def fan(self, angle: float) -> RayFan:
+        if angle != self._angle or self._fan is None:
+            c, s = math.cos(angle), math.sin(angle)
+            self._fan = ray_fan(c * self.cos_off - s * self.sin_off, s * self.cos_off + c * self.sin_off)
+            self._angle = angle
+        return self._fan
+
+
+@lru_cache(maxsize=16)
+def ray_table(num_rays: int = NUM_RAYS, fov: float = FOV) -> RayTable:
+    """NEW: Shared RayTable per (num_rays, fov); dynamic resolution steps each get one."""
+    return RayTable(num_rays, fov)
+
+
+def build_depth_buffer(
+    px: float,
+    py: float,
+    angle: float,
+    game_map: Union[Sequence[Sequence[int]], np.ndarray],
+    *,
+    num_rays: int = NUM_RAYS,
+    fov: float = FOV,
+    max_depth: float = MAX_DEPTH,
+    pool: Optional[StripPool] = None,
+    skip: Optional[bool] = None,
+) -> DepthBuffer:
+    """
+    NEW: Vectorized counterpart of build_depth_map. Runs DDA for the whole ray fan
+    at once on NumPy arrays; build_depth_map/cast_single_ray_dda stay the reference.
+    Ray directions come from the cached RayTable for (num_rays, fov).
+    With a StripPool the fan is split into strips that are marched concurrently,
+    each writing into its slice of one shared output buffer.
+    skip: march with distance-field jumps (True), plain DDA (False) or decide from
+    the map's openness (None, see skip_field). Results are identical either way.
+    """
+    grid = grid_array(game_map)
+    fan = ray_table(num_rays, fov).fan(angle)
+    field = _skip_field_for(grid, skip)
+    if pool is None:
+        return _dda_march(px, py, fan, grid, max_depth, field=field)
+
+    out = DepthBuffer(
+        np.empty(num_rays), np.empty(num_rays, dtype=bool), np.empty(num_rays, dtype=np.int8),
+        np.empty(num_rays), np.empty(num_rays, dtype=grid.dtype),
+    )
+
+    def strip(lo: int, hi: int) -> None:
+        _dda_march(px, py, fan.strip(lo, hi), grid, max_depth,
+                   out=DepthBuffer(*(a[lo:hi] for a in out)), field=field)
+
+    pool.run(strip, num_rays)
+    return out
+
+
+def _dda_march(
+    px: Union[float, np.ndarray],
+    py: Union[float, np.ndarray],
+    fan: RayFan,
+    grid: np.ndarray,
+    max_depth: Union[float, np.ndarray],
+    out: Optional[DepthBuffer] = None,
+    field: Optional[np.ndarray] = None,
+) -> DepthBuffer:
+    """
+    Batched DDA; mirrors cast_single_ray_dda step for step. px/py/max_depth may be
+    scalars (one camera) or per-ray arrays (many shooters). Results are written into
+    `out` (e.g. a strip of a larger buffer) when given. With `field` each ray first
+    jumps across the empty square around its cell, then takes its normal step.
+    """
+    ray_dx, ray_dy, delta_x, delta_y, step_x, step_y = fan
+    n = ray_dx.shape[0]
+    map_h, map_w = grid.shape
+    pos_x = np.broadcast_to(np.asarray(px, dtype=np.float64) / WALL_SIZE, (n,))
+    pos_y = np.broadcast_to(np.asarray(py, dtype=np.float64) / WALL_SIZE, (n,))
+    map_x0 = np.floor(pos_x).astype(np.intp)
+    map_y0 = np.floor(pos_y).astype(np.intp)
+
+    with np.errstate(invalid="ignore"):
+        side_x = np.where(ray_dx < 0, (pos_x - map_x0) * delta_x, (map_x0 + 1.0 - pos_x) * delta_x)
+        side_y = np.where(ray_dy < 0, (pos_y - map_y0) * delta_y, (map_y0 + 1.0 - pos_y) * delta_y)
+
+    hit = np.zeros(n, dtype=bool)
+    side = np.zeros(n, dtype=np.int8)
+    cell = np.zeros(n, dtype=grid.dtype)
+    end_x = np.zeros(n, dtype=np.intp)
+    end_y = np.zeros(n, dtype=np.intp)
+
+    # Only rays still marching are kept in the working set
+    ids = np.arange(n)
+    mx = map_x0.copy()
+    my = map_y0.copy()
+    sx = side_x.copy()
+    sy = side_y.copy()
+    dx, dy = delta_x, delta_y
+    stx, sty = step_x, step_y
+
+    max_steps = (map_w + map_h) * 4 + 1
+    for _ in range(max_steps):
+        if ids.size == 0:
+            break
+        if field is not None:
+            inside = (mx >= 0) & (mx < map_w) & (my >= 0) & (my < map_h)
+            d = np.where(inside, field[np.where(inside, my, 0), np.where(inside, mx, 0)], 0)
+            jump = d >= SKIP_MIN_DIST
+            if jump.any():
+                with np.errstate(invalid="ignore"):
+                    jx, jy = _skip_counts(d, np.where(np.isnan(sx), np.inf, sx),
+                                          np.where(np.isnan(sy), np.inf, sy), dx, dy)
+                    jx = np.where(jump, jx, 0).astype(np.intp)
+                    jy = np.where(jump, jy, 0).astype(np.intp)
+                    # one add per crossing, bit-identical to stepping (see cast_single_ray_dda)
+                    for i in range(int(max(jx.max(), jy.max()))):
+                        sx = np.where(jx > i, sx + dx, sx)
+                        sy = np.where(jy > i, sy + dy, sy)
+                mx = mx + jx * stx
+                my = my + jy * sty
+        go_x = sx < sy
+        go_y = ~go_x
+        sx = np.where(go_x, sx + dx, sx)
+        mx = np.where(go_x, mx + stx, mx)
+        sy = np.where(go_y, sy + dy, sy)
+        my = np.where(go_y, my + sty, my)
+        side[ids] = go_y
+
+        inside = (mx >= 0) & (mx < map_w) & (my >= 0) & (my < map_h)
+        cells = grid[np.where(inside, my, 0), np.where(inside, mx, 0)]
+        struck = inside & (cells != 0)
+        if struck.any():
+            hid = ids[struck]
+            hit[hid] = True
+            cell[hid] = cells[struck]
+            end_x[hid] = mx[struck]
+            end_y[hid] = my[struck]
+
+        keep = inside & ~struck
+        if not keep.all():
+            ids, mx, my, sx, sy = ids[keep], mx[keep], my[keep], sx[keep], sy[keep]
+            dx, dy, stx, sty = dx[keep], dy[keep], stx[keep], sty[keep]
+
+    # Perpendicular distance to wall in grid units
+    denom_x = np.where(np.abs(ray_dx) > EPS, ray_dx, EPS)
+    denom_y = np.where(np.abs(ray_dy) > EPS, ray_dy, EPS)
+    perp = np.where(
+        side == 0,
+        (end_x - pos_x + (1 - step_x) * 0.5) / denom_x,
+        (end_y - pos_y + (1 - step_y) * 0.5) / denom_y,
+    )
+    perp = np.maximum(perp, 0.0)
+    dist = np.where(hit, np.minimum(perp * WALL_SIZE, max_depth), np.asarray(max_depth, dtype=np.float64))
+
+    wall_x = np.where(side == 0, pos_y + perp * ray_dy, pos_x + perp * ray_dx)
+    tex_u = np.where(hit, wall_x - np.floor(wall_x), 0.0)
+    if out is None:
+        return DepthBuffer(dist, hit, side, tex_u, cell)
+    for dst, src in zip(out, (dist, hit, side, tex_u, cell)):
+        dst[...] = src
+    return out
+
+
+def depth_parity_error(
+    px: float,
+    py: float,
+    angle: float,
+    game_map: Sequence[Sequence[int]],
+    *,
+    pool: Optional[StripPool] = None,
+    skip: Optional[bool] = None,
+    **kwargs,
+) -> float:
+    """
+    Compare build_depth_buffer against the per-ray reference path.
+    Returns the largest absolute difference over dist and tex_u (tex_u compared
+    modulo 1), or inf if any ray disagrees on hit/side. pool and skip only go
+    to build_depth_buffer; other keywords (num_rays, fov, max_depth) to both.
+    """
+    ref = build_depth_map(px, py, angle, game_map, **kwargs)
+    fast = build_depth_buffer(px, py, angle, game_map, pool=pool, skip=skip, **kwargs)
+    worst = 0.0
+    for i, (dist, hit, side, tex_u) in enumerate(ref):
+        if bool(fast.hit[i]) != hit or (hit and int(fast.side[i]) != side):
+            return float("inf")
+        du = abs(float(fast.tex_u[i]) - tex_u)
+        worst = max(worst, abs(float(fast.dist[i]) - dist), min(du, 1.0 - du))
+    return worst
+
+
+def _depth_distances(depth: Union[DepthBuffer, Sequence[Tuple[float, bool, int, float]]]) -> Sequence[float]:
+    """Per-ray distances from either depth representation."""
+    if isinstance(depth, DepthBuffer):
+        return depth.dist
+    return [d[0] for d in depth]
+
+
+# --------------------------------------------------------------------------------------
+# Static render layers (cached; only dynamic parts are drawn per frame)
+# --------------------------------------------------------------------------------------
+_layers: dict = {}
+MAX_CACHED_LAYERS = 32
+
+
+def cached_layer(key: tuple, build):
+    """
+    NEW: Return the layer stored under key, building it once with build().
+    Keys carry resolution and parameters, so a settings change simply selects a
+    new layer; map layers are keyed by map identity and keep the map alive
+    (see invalidate_render_layers).
+    """
+    layer = _layers.get(key)
+    if layer is None:
+        if len(_layers) >= MAX_CACHED_LAYERS:
+            _layers.clear()
+        layer = _layers[key] = build()
+    return layer
+
+
+def invalidate_render_layers() -> None:
+    """NEW: Drop every cached layer and the NumPy map copy; call after editing a map in place."""
+    _layers.clear()
+    invalidate_grid_array()
+
+
+def _rgba32(color: Sequence[int]) -> np.uint32:
+    """Pack an RGB color the same way a (.., 4) uint8 buffer is viewed as uint32."""
+    return np.array([*color[:3], 255], dtype=np.uint8).view(np.uint32)[0]
+
+
+def backdrop_column(h: int, sky: Tuple[int, int, int] = SKY_COLOR, ground: Tuple[int, int, int] = GROUND_COLOR) -> np.ndarray:
+    """NEW: Packed sky/ground pixel column (length h) used as the framebuffer background."""
+    def build() -> np.ndarray:
+        rows = np.arange(h)
+        col = np.where(rows < h // 2, _rgba32(sky), _rgba32(ground))
+        col.setflags(write=False)
+        return col
+    return cached_layer(("backdrop", h, tuple(sky), tuple(ground)), build)
+
+
+def vignette_overlay(size: Tuple[int, int], alpha: int = VIGNETTE_ALPHA) -> pygame.Surface:
+    """NEW: Pre-baked vignette overlay for the given resolution and strength."""
+    def build() -> pygame.Surface:
+        w, h = size
+        overlay = pygame.Surface((w, h), pygame.SRCALPHA)
+        # Radial gradient approximation using concentric rects (cheap)
+        steps = 10
+        for i in range(steps):
+            a = int(alpha * (i + 1) / steps)
+            pad = int((i + 1) * (min(w, h) * 0.03))
+            pygame.draw.rect(
+                overlay,
+                (0, 0, 0, a),
+                (0 - pad, 0 - pad, w + pad * 2, h + pad * 2),
+                width=pad * 2,
+                border_radius=24
+            )
+        return overlay
+    return cached_layer(("vignette", tuple(size), alpha), build)
+
+
+def minimap_layer(game_map: Sequence[Sequence[int]], cell: int) -> pygame.Surface:
+    """NEW: Static mini-map layer (background + tiles), including the 2px frame."""
+    map_h = len(game_map)
+    map_w = len(game_map[0])
+
+    def build() -> pygame.Surface:
+        w = map_w * cell
+        h = map_h * cell
+        layer = pygame.Surface((w + 4, h + 4), pygame.SRCALPHA)
+        pygame.draw.rect(layer, (18, 20, 22), (0, 0, w + 4, h + 4), 0, border_radius=4)
+        for gy in range(map_h):
+            for gx in range(map_w):
+                color = (60, 60, 66) if game_map[gy][gx] else (28, 30, 36)
+                pygame.draw.rect(layer, color, (2 + gx * cell, 2 + gy * cell, cell - 1, cell - 1))
+        return layer
+    # the entry holds the map, so its id cannot be reused by another map while cached
+    _, layer = cached_layer(("minimap", id(game_map), map_w, map_h, cell), lambda: (game_map, build()))
+    return layer
+
+
 # --------------------------------------------------------------------------------------
 # Rendering
 # --------------------------------------------------------------------------------------
@@ -200,48 +694,49 @@ def render_first_person(
     fog_color: Tuple[int, int, int] = FOG_COLOR,
     fog_density: float = FOG_DENSITY,
     show_minimap: bool = False,
+    textures: Optional[WallTextures] = None,
+    resolution: Optional[DynamicResolution] = None,
+    pool: Optional[StripPool] = None,
+    timings: Optional[Dict[str, float]] = None,
 ) -> None:
-    """Render sky/ground, wall slices, crosshair, (optional) sprites and weapon."""
-    screen.fill(BG)
-    half_h = HEIGHT // 2
-
-    # Sky / ground
-    pygame.draw.rect(screen, (62, 78, 112), (0, 0, WIDTH, half_h))
-    pygame.draw.rect(screen, (35, 38, 42), (0, half_h, WIDTH, half_h))
+    """
+    Render sky/ground, wall slices, crosshair, (optional) sprites and weapon.
+    Passing `textures` opts into textured walls (see rasterize_textured_walls).
+    Passing `resolution` lets its current scale pick the ray count and, if enabled,
+    a lower internal wall resolution that is upscaled when presented.
+    Passing `pool` casts rays and rasterizes columns strip-parallel.
+    Passing `timings` fills it with per-stage milliseconds (RENDER_STAGES).
+    """
+    lap = _stage_clock(timings)
+    num_rays = NUM_RAYS if resolution is None else resolution.num_rays(NUM_RAYS)
+    size = screen.get_size()
+    internal = size if resolution is None else resolution.render_size(size)
 
     # Depth buffer (perp distances, already fish-eye safe)
-    depth = build_depth_map(px, py, angle, game_map, num_rays=NUM_RAYS, fov=FOV, max_depth=MAX_DEPTH)
-
-    col_w = WIDTH / NUM_RAYS
+    depth = build_depth_buffer(px, py, angle, game_map, num_rays=num_rays, fov=FOV, max_depth=MAX_DEPTH, pool=pool)
+    lap("depth")
 
-    # Walls
-    for r, (dist, hit, side, tex_u) in enumerate(depth):
-        if not hit:
-            continue
-
-        # Wall slice height (standard perspective scale)
-        slice_h = max(8, int((WALL_SIZE * 420) / (dist + 0.001)))
-
-        # Base grey, with slight darkening on "side" hits for simple lighting
-        shade = max(30, min(230, int(255 - (dist * 0.18))))
-        if side == 1:
-            shade = int(shade * 0.85)
-
-        # Apply exponential fog
-        fog = math.exp(-fog_density * dist)
-        color = (
-            int(shade * fog + fog_color[0] * (1 - fog)),
-            int(shade * fog + fog_color[1] * (1 - fog)),
-            int(shade * fog + fog_color[2] * (1 - fog)),
-        )
-
-        x = int(r * col_w)
-        y = half_h - slice_h // 2
-        pygame.draw.rect(screen, color, (x, y, int(col_w) + 1, slice_h))
+    # Sky / ground + walls rasterized into one pixel buffer, blitted once
+    frame = frame_buffer(internal)
+    if textures is None:
+        rasterize_walls(frame, depth, fog_color=fog_color, fog_density=fog_density, max_depth=MAX_DEPTH, pool=pool)
+    else:
+        t0 = time.perf_counter()
+        rasterize_textured_walls(frame, depth, textures, fog_color=fog_color, fog_density=fog_density,
+                                 max_depth=MAX_DEPTH, pool=pool)
+        textures.record((time.perf_counter() - t0) * 1000.0)
+    if internal == size:
+        pygame.surfarray.blit_array(screen, frame[..., :3])
+    else:
+        low = present_surface(internal)
+        pygame.surfarray.blit_array(low, frame[..., :3])
+        pygame.transform.scale(low, size, screen)
+    lap("walls")
 
     # Sprites (billboards) with occlusion
     if sprites:
         render_sprites(screen, px, py, angle, sprites, depth, fov=FOV)
+    lap("sprites")
 
     # Crosshair & weapon
     draw_crosshair(screen)  # kept API (now supports optional spread)
@@ -250,10 +745,203 @@ def render_first_person(
     # Optional vignette for atmosphere
     if VIGNETTE_ALPHA > 0:
         draw_vignette(screen, VIGNETTE_ALPHA)
+    lap("postfx")
 
     # Optional mini-map overlay (top-left)
     if show_minimap:
         render_minimap(screen, game_map, px, py, angle, rays=depth, sprites=sprites)
+    lap("minimap")
+
+
+RENDER_STAGES = ("depth", "walls", "sprites", "postfx", "minimap")
+
+
+def _stage_clock(timings: Optional[Dict[str, float]]):
+    """lap(stage) records ms since the previous lap into timings; a no-op without timings."""
+    if timings is None:
+        return lambda stage: None
+    last = [time.perf_counter()]
+
+    def lap(stage: str) -> None:
+        now = time.perf_counter()
+        timings[stage] = (now - last[0]) * 1000.0
+        last[0] = now
+    return lap
+
+
+@lru_cache(maxsize=8)
+def wall_color_lut(
+    fog_color: Tuple[int, int, int] = FOG_COLOR,
+    fog_density: float = FOG_DENSITY,
+    max_depth: float = MAX_DEPTH,
+) -> np.ndarray:
+    """
+    NEW: Precomputed distance -> wall color table, shape (2, int(max_depth) + 1, 4) uint8
+    RGBA, indexed [side, int(dist)]. Same shade/side-darkening/exponential fog as the
+    original per-column math.
+    """
+    d = np.arange(int(max_depth) + 1, dtype=np.float64)
+    shade = np.clip((255 - d * 0.18).astype(np.int64), 30, 230)
+    shades = np.stack([shade, (shade * 0.85).astype(np.int64)])       # (2, n)
+    fog = np.exp(-fog_density * d)[None, :, None]                       # (1, n, 1)
+    fc = np.asarray(fog_color, dtype=np.float64)[None, None, :]          # (1, 1, 3)
+    lut = np.full((2, d.size, 4), 255, dtype=np.uint8)
+    lut[..., :3] = (shades[:, :, None] * fog + fc * (1 - fog)).astype(np.uint8)
+    lut.setflags(write=False)
+    return lut
+
+
+TEXTURE_SHADE_BANDS = 64   # distance bands baked into the shaded texture atlas
+
+
+@lru_cache(maxsize=8)
+def wall_shade_lut(
+    fog_color: Tuple[int, int, int] = FOG_COLOR,
+    fog_density: float = FOG_DENSITY,
+    max_depth: float = MAX_DEPTH,
+    bands: int = TEXTURE_SHADE_BANDS,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    NEW: Textured counterpart of wall_color_lut, sampled at the centre of each
+    distance band: (scale, add) where a texel c is shaded as
+    (c * scale[side, band] >> 8) + add[band]. scale is (2, bands) uint16
+    (256 == 1.0), add is (bands, 3) uint8 fog color contribution.
+    """
+    d = (np.arange(bands) + 0.5) * (max_depth / bands)
+    shade = np.clip((255 - d * 0.18).astype(np.int64), 30, 230)
+    shades = np.stack([shade, (shade * 0.85).astype(np.int64)])
+    fog = np.exp(-fog_density * d)
+    scale = (shades / 255.0 * fog[None, :] * 256).astype(np.uint16)
+    add = (np.asarray(fog_color, dtype=np.float64)[None, :] * (1 - fog)[:, None]).astype(np.uint8)
+    scale.setflags(write=False)
+    add.setflags(write=False)
+    return scale, add
+
+
+_frame: Optional[np.ndarray] = None
+
+
+def frame_buffer(size: Tuple[int, int]) -> np.ndarray:
+    """
+    NEW: Reusable (w, h, 4) uint8 RGBA pixel buffer matching the target surface size.
+    Four channels so each pixel can be written as a single uint32; blit frame[..., :3].
+    """
+    global _frame
+    w, h = size
+    if _frame is None or _frame.shape[:2] != (w, h):
+        _frame = np.zeros((w, h, 4), dtype=np.uint8)
+    return _frame
+
+
+_present: Optional[pygame.Surface] = None
+
+
+def present_surface(size: Tuple[int, int]) -> pygame.Surface:
+    """NEW: Reusable low-resolution target that the framebuffer is copied into before upscaling."""
+    global _present
+    if _present is None or _present.get_size() != tuple(size):
+        _present = pygame.Surface(size)
+    return _present
+
+
+def rasterize_walls(
+    frame: np.ndarray,
+    depth: DepthBuffer,
+    *,
+    fog_color: Tuple[int, int, int] = FOG_COLOR,
+    fog_density: float = FOG_DENSITY,
+    max_depth: float = MAX_DEPTH,
+    pool: Optional[StripPool] = None,
+) -> None:
+    """
+    NEW: Write sky/ground and every wall column into frame (see frame_buffer) in one
+    pass. Screen column x samples ray x * num_rays // w, so any ray count works.
+    With a StripPool, column strips are rasterized concurrently in place.
+    """
+    w, h = frame.shape[:2]
+    half_h = h // 2
+    n = len(depth.dist)
+    lut = wall_color_lut(tuple(fog_color), fog_density, max_depth).view(np.uint32)[..., 0]
+    backdrop = backdrop_column(h)
+    rows = np.arange(h)
+
+    def strip(lo: int, hi: int) -> None:
+        ray = (np.arange(lo, hi) * n) // w
+        dist = depth.dist[ray]
+        colors = lut[depth.side[ray], np.minimum(dist.astype(np.int64), lut.shape[1] - 1)]
+
+        # Wall slice extents (standard perspective scale, relative to the output height)
+        slice_h = np.maximum(8, (WALL_SIZE * 420 * (h / HEIGHT) / (dist + 0.001)).astype(np.int64))
+        top = half_h - slice_h // 2
+        mask = depth.hit[ray][:, None] & (rows >= top[:, None]) & (rows < (top + slice_h)[:, None])
+        frame[lo:hi].view(np.uint32)[..., 0] = np.where(mask, colors[:, None], backdrop[None, :])
+
+    if pool is None:
+        strip(0, w)
+    else:
+        pool.run(strip, w)
+
+
+def rasterize_textured_walls(
+    frame: np.ndarray,
+    depth: DepthBuffer,
+    textures: WallTextures,
+    *,
+    fog_color: Tuple[int, int, int] = FOG_COLOR,
+    fog_density: float = FOG_DENSITY,
+    max_depth: float = MAX_DEPTH,
+    pool: Optional[StripPool] = None,
+) -> None:
+    """
+    NEW: Textured variant of rasterize_walls. Each screen column resolves to one
+    pre-sliced, pre-shaded texel strip (texture by hit cell value, mip level by
+    wall height, shading by side and distance band) and is sampled down that
+    strip. When the pass runs over textures.budget_ms, columns are sampled every
+    textures.stride pixels and widened.
+    """
+    w, h = frame.shape[:2]
+    half_h = h // 2
+    n = len(depth.dist)
+    stride = textures.stride
+    bands = TEXTURE_SHADE_BANDS
+
+    # Pick the pre-shaded atlas copy for this side/distance band
+    fog_color = tuple(fog_color)
+    scale, add = wall_shade_lut(fog_color, fog_density, max_depth, bands)
+    atlas = textures.shaded_atlas((fog_color, fog_density, max_depth, bands), scale, add)
+    backdrop = backdrop_column(h)
+    rows = np.arange(h, dtype=np.int32)
+
+    def strip(lo: int, hi: int) -> None:
+        cols = np.arange(lo, hi, stride)
+        ray = (cols * n) // w
+        dist = depth.dist[ray]
+
+        # Wall slice extents (standard perspective scale, relative to the output height)
+        slice_h = np.maximum(8, (WALL_SIZE * 420 * (h / HEIGHT) / (dist + 0.001)).astype(np.int64))
+        top = half_h - slice_h // 2
+        texel_strip, tsize = textures.column_strips(depth.cell[ray], depth.tex_u[ray], slice_h)
+        band = depth.side[ray] * bands + np.minimum(bands - 1, (dist * (bands / max_depth)).astype(np.int64))
+        texel_strip = texel_strip + band * textures.atlas.size
+
+        # Rows inside the slice (negative rel wraps to a huge unsigned value)
+        rel = rows[None, :] - top.astype(np.int32)[:, None]
+        span = np.where(depth.hit[ray], slice_h, 0).astype(np.uint32)
+        mask = rel.view(np.uint32) < span[:, None]
+
+        vstep = ((tsize - 1e-3) / slice_h).astype(np.float32)
+        v = (rel * vstep[:, None]).astype(np.int32)
+        texels = np.take(atlas, texel_strip[:, None] + v, mode="clip")
+
+        out = np.where(mask, texels, backdrop[None, :])
+        if stride > 1:
+            out = np.repeat(out, stride, axis=0)[:hi - lo]
+        frame[lo:hi].view(np.uint32)[..., 0] = out
+
+    if pool is None:
+        strip(0, w)
+    else:
+        pool.run(strip, w, align=stride)
 
 
 def draw_crosshair(screen: pygame.Surface, spread: int = 0) -> None:
@@ -290,12 +978,10 @@ def draw_weapon(screen: pygame.Surface, t: float, gun_img: Optional[pygame.Surfa
 def hitscan(px: float, py: float, angle: float, max_range: float, game_map: Sequence[Sequence[int]]) -> Tuple[bool, float, float, float]:
     """
     Raycast for shooting; return (hit, x, y, distance).
-    Upgraded to use DDA for accurate impact points.
+    Upgraded to use DDA for accurate impact points (single cast).
     """
-    dist, hit, *_rest = cast_single_ray_dda(px, py, angle, game_map, max_range)
+    dist, hit, _side, _tex_u, hx, hy, _cell = cast_single_ray_dda(px, py, angle, game_map, max_range)
     if hit:
-        # reconstruct hit point from returned tuple to avoid drift
-        _, _, _, _, hx, hy, _ = cast_single_ray_dda(px, py, angle, game_map, max_range)
         return True, hx, hy, dist
     # Fall back if no hit within range
     hx = px + math.cos(angle) * max_range
@@ -303,6 +989,116 @@ def hitscan(px: float, py: float, angle: float, max_range: float, game_map: Sequ
     return False, hx, hy, max_range
 
 
+def line_of_sight(ax: float, ay: float, bx: float, by: float, game_map: Sequence[Sequence[int]]) -> bool:
+    """
+    NEW: True if no wall cell lies between pixel positions a and b. One DDA cast
+    from a toward b stopped at |ab|.
+    """
+    span = math.hypot(bx - ax, by - ay)
+    if span < EPS:
+        return True
+    angle = math.atan2(by - ay, bx - ax)
+    dist, hit, *_ = cast_single_ray_dda(ax, ay, angle, game_map, span)
+    return not hit or dist >= span
+
+
+class HitResult(NamedTuple):
+    """Outcome of an entity-aware hitscan."""
+    hit: bool                  # an entity or a wall was struck within range
+    x: float                   # impact point (or end of range)
+    y: float
+    dist: float
+    entity: Optional[object]   # entity struck first; None for wall / miss
+
+
+class BatchHits(NamedTuple):
+    """Per-shot results of hitscan_batch (length == number of shots)."""
+    dist: np.ndarray     # float64, distance to the first thing struck (or max range)
+    x: np.ndarray        # float64 impact / end point
+    y: np.ndarray
+    entity: np.ndarray   # intp, index into boxes of the entity struck, -1 if none
+    wall: np.ndarray     # bool, a wall was struck before any entity
+
+
+def hitscan_batch(
+    origins: np.ndarray,
+    angles: np.ndarray,
+    max_range: Union[float, np.ndarray],
+    game_map: Union[Sequence[Sequence[int]], np.ndarray],
+    boxes: Optional[np.ndarray] = None,
+    *,
+    ignore: Optional[np.ndarray] = None,
+    skip: Optional[bool] = None,
+) -> BatchHits:
+    """
+    NEW: Resolve many shooters' rays in one call (bot volleys, server-side checks).
+    origins: (n, 2) pixel positions; angles: (n,) radians; boxes: (m, 4) entity
+    AABBs as (x, y, w, h) in pixels. Each ray is DDA-cast once against the walls,
+    then slab-tested against every box up to its wall distance; the nearest box
+    wins. ignore: optional (n,) box index per shot to skip (the shooter), -1 for none.
+    skip: distance-field jumps as in build_depth_buffer.
+    """
+    origins = np.asarray(origins, dtype=np.float64).reshape(-1, 2)
+    angles = np.asarray(angles, dtype=np.float64).reshape(-1)
+    ox, oy = origins[:, 0], origins[:, 1]
+    dx, dy = np.cos(angles), np.sin(angles)
+
+    grid = grid_array(game_map)
+    walls = _dda_march(ox, oy, ray_fan(dx, dy), grid, max_range, field=_skip_field_for(grid, skip))
+    dist = walls.dist.copy()
+    entity = np.full(len(angles), -1, dtype=np.intp)
+
+    if boxes is not None and len(boxes):
+        b = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        x0, y0 = b[:, 0][None, :], b[:, 1][None, :]
+        x1, y1 = x0 + b[:, 2][None, :], y0 + b[:, 3][None, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inv_x = (1.0 / dx)[:, None]
+            inv_y = (1.0 / dy)[:, None]
+            tx0, tx1 = (x0 - ox[:, None]) * inv_x, (x1 - ox[:, None]) * inv_x
+            ty0, ty1 = (y0 - oy[:, None]) * inv_y, (y1 - oy[:, None]) * inv_y
+        # fmin/fmax skip the NaNs produced by axis-parallel rays on a slab edge
+        t_near = np.fmax(np.fmin(tx0, tx1), np.fmin(ty0, ty1))
+        t_far = np.fmin(np.fmax(tx0, tx1), np.fmax(ty0, ty1))
+        t_enter = np.maximum(t_near, 0.0)
+        struck = (t_far >= t_enter) & (t_enter <= dist[:, None])
+        if ignore is not None:
+            ign = np.asarray(ignore, dtype=np.intp).reshape(-1, 1)
+            struck &= np.arange(b.shape[0])[None, :] != ign
+        t_enter = np.where(struck, t_enter, np.inf)
+        nearest = np.argmin(t_enter, axis=1)
+        t_best = t_enter[np.arange(len(angles)), nearest]
+        got = np.isfinite(t_best)
+        entity[got] = nearest[got]
+        dist[got] = t_best[got]
+
+    return BatchHits(dist, ox + dx * dist, oy + dy * dist, entity, walls.hit & (entity < 0))
+
+
+def hitscan_entities(
+    px: float,
+    py: float,
+    angle: float,
+    max_range: float,
+    game_map: Sequence[Sequence[int]],
+    entities: Sequence[object],
+    *,
+    shrink: int = 0,
+) -> HitResult:
+    """
+    NEW: Single-shot entity-aware hitscan. Casts once against the walls, then
+    tests each entity's `.rect` (deflated by `shrink` px) up to the wall distance,
+    returning the nearest entity or the wall impact.
+    """
+    boxes = np.array([tuple(pygame.Rect(e.rect).inflate(-shrink, -shrink)) for e in entities],
+                     dtype=np.float64).reshape(-1, 4)
+    res = hitscan_batch(np.array([[px, py]]), np.array([angle]), max_range, game_map, boxes)
+    idx = int(res.entity[0])
+    hit = idx >= 0 or bool(res.wall[0])
+    return HitResult(hit, float(res.x[0]), float(res.y[0]), float(res.dist[0]),
+                     entities[idx] if idx >= 0 else None)
+
+
 # --------------------------------------------------------------------------------------
 # New: Billboards (sprite) rendering with depth occlusion
 # --------------------------------------------------------------------------------------
@@ -317,21 +1113,61 @@ class Sprite:
         self.scale = scale
 
 
+SPRITE_CACHE_SIZE = 256     # max pre-scaled sprite images kept
+SPRITE_HEIGHT_QUANT = 4     # projected heights are snapped to this many pixels
+SPRITE_MAX_HEIGHT = HEIGHT * 4
+
+_sprite_cache: "OrderedDict[Tuple[pygame.Surface, int], pygame.Surface]" = OrderedDict()
+
+
+def scaled_sprite(image: pygame.Surface, height: int) -> pygame.Surface:
+    """
+    NEW: LRU-cached smoothscale of image to a quantized projected height.
+    Keyed by (image, quantized height); the aspect ratio follows the source image.
+    """
+    hq = max(SPRITE_HEIGHT_QUANT, min(SPRITE_MAX_HEIGHT, int(round(height / SPRITE_HEIGHT_QUANT)) * SPRITE_HEIGHT_QUANT))
+    key = (image, hq)
+    img = _sprite_cache.get(key)
+    if img is not None:
+        _sprite_cache.move_to_end(key)
+        return img
+    w = max(1, int(hq * (image.get_width() / image.get_height())))
+    img = pygame.transform.smoothscale(image, (w, hq))
+    _sprite_cache[key] = img
+    if len(_sprite_cache) > SPRITE_CACHE_SIZE:
+        _sprite_cache.popitem(last=False)
+    return img
+
+
+def clear_sprite_cache() -> None:
+    """NEW: Drop all pre-scaled sprite images (e.g. after replacing sprite art)."""
+    _sprite_cache.clear()
+
+
+def visible_spans(visible: np.ndarray) -> List[Tuple[int, int]]:
+    """NEW: Contiguous True runs of a 1-D mask as [(start, end), ...], end exclusive."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], visible.view(np.int8), [0]))))
+    return list(zip(edges[0::2].tolist(), edges[1::2].tolist()))
+
+
 def render_sprites(
     screen: pygame.Surface,
     px: float,
     py: float,
     angle: float,
     sprites: Iterable[Sprite],
-    depth: Sequence[Tuple[float, bool, int, float]],
+    depth: Union[DepthBuffer, Sequence[Tuple[float, bool, int, float]]],
     *,
     fov: float = FOV,
 ) -> None:
     """
-    NEW: Project and draw billboards with coarse column-occlusion using depth buffer.
+    NEW: Project and draw billboards with column-occlusion using depth buffer.
+    Visible columns are merged into spans so each span is a single blit.
     """
-    # Precompute for mapping screen-x -> depth index
-    col_w = WIDTH / max(1, len(depth))
+    dists = np.asarray(_depth_distances(depth), dtype=np.float64)
+    # Wall distance per screen column
+    n = max(1, len(dists))
+    col_dist = dists[np.minimum(n - 1, (np.arange(WIDTH) * n) // WIDTH)]
 
     # Draw far-to-near for better blending
     items: List[Tuple[float, Sprite]] = []
@@ -340,7 +1176,7 @@ def render_sprites(
         dy = s.y - py
         dist = math.hypot(dx, dy)
         items.append((dist, s))
-    items.sort(reverse=True)
+    items.sort(key=lambda it: it[0], reverse=True)
 
     for dist, s in items:
         # Angle to sprite
@@ -351,24 +1187,21 @@ def render_sprites(
 
         # Projected height
         h = max(10, int((WALL_SIZE * 420 * s.scale) / (dist + 0.001)))
-        img = pygame.transform.smoothscale(s.image, (int(h * (s.image.get_width() / s.image.get_height())), h))
-        w = img.get_width()
+        img = scaled_sprite(s.image, h)
+        w, h = img.get_size()
 
         # Screen position
         screen_x = int((da / fov + 0.5) * WIDTH - w // 2)
         screen_y = HEIGHT // 2 - h // 2
 
-        # Column-occlusion using depth
-        # Walk across sprite columns and blit visible stripes
-        for sx in range(w):
-            col_x = screen_x + sx
-            if 0 <= col_x < WIDTH:
-                depth_idx = min(len(depth) - 1, max(0, int(col_x / col_w)))
-                wall_dist = depth[depth_idx][0]
-                if dist < wall_dist - 1.0:  # small epsilon to reduce z-fighting
-                    # Blit one-pixel column (fast enough for small sprite count)
-                    column = img.subsurface((sx, 0, 1, h))
-                    screen.blit(column, (col_x, screen_y))
+        # Column-occlusion using depth, clipped to the screen
+        x0 = max(0, screen_x)
+        x1 = min(WIDTH, screen_x + w)
+        if x0 >= x1:
+            continue
+        visible = dist < col_dist[x0:x1] - 1.0  # small epsilon to reduce z-fighting
+        for start, end in visible_spans(visible):
+            screen.blit(img, (x0 + start, screen_y), (x0 + start - screen_x, 0, end - start, h))
 
 
 # --------------------------------------------------------------------------------------
@@ -381,7 +1214,7 @@ def render_minimap(
     py: float,
     angle: float,
     *,
-    rays: Optional[Sequence[Tuple[float, bool, int, float]]] = None,
+    rays: Optional[Union[DepthBuffer, Sequence[Tuple[float, bool, int, float]]]] = None,
     sprites: Optional[Iterable[Sprite]] = None,
     scale: float = 0.2,
     margin: int = 8,
@@ -389,22 +1222,11 @@ def render_minimap(
     """
     NEW: Compact world mini-map in the top-left corner with optional rays & sprites.
     """
-    map_h = len(game_map)
-    map_w = len(game_map[0])
     cell = int(WALL_SIZE * scale)
-
-    w = map_w * cell
-    h = map_h * cell
     x0, y0 = margin, margin
 
-    # Background
-    pygame.draw.rect(screen, (18, 20, 22), (x0 - 2, y0 - 2, w + 4, h + 4), 0, border_radius=4)
-
-    # Tiles
-    for gy in range(map_h):
-        for gx in range(map_w):
-            color = (60, 60, 66) if game_map[gy][gx] else (28, 30, 36)
-            pygame.draw.rect(screen, color, (x0 + gx * cell, y0 + gy * cell, cell - 1, cell - 1))
+    # Background + tiles (static, cached)
+    screen.blit(minimap_layer(game_map, cell), (x0 - 2, y0 - 2))
 
     # Player
     ptx = x0 + (px / WALL_SIZE) * cell
@@ -415,11 +1237,14 @@ def render_minimap(
     pygame.draw.line(screen, (240, 200, 80), (ptx, pty), (ex, ey), 2)
 
     # Rays preview
-    if rays:
+    if rays is not None:
+        ray_dists = _depth_distances(rays)
         ray_fov = FOV
         start_ang = angle - ray_fov / 2
-        step = ray_fov / max(1, len(rays))
-        for i, (dist, hit, *_rest) in enumerate(rays):
+        step = ray_fov / max(1, len(ray_dists))
+        stride = max(1, len(ray_dists) // 240)  # keep the preview readable at one ray per column
+        for i in range(0, len(ray_dists), stride):
+            dist = ray_dists[i]
             ang = start_ang + i * step
             rx = ptx + math.cos(ang) * (dist / WALL_SIZE) * cell
             ry = pty + math.sin(ang) * (dist / WALL_SIZE) * cell
@@ -434,20 +1259,7 @@ def render_minimap(
 
 
 def draw_vignette(screen: pygame.Surface, alpha: int = VIGNETTE_ALPHA) -> None:
-    """NEW: Subtle vignette post effect to focus the view."""
+    """NEW: Subtle vignette post effect to focus the view (overlay baked once per size/alpha)."""
     if alpha <= 0:
         return
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-    # Radial gradient approximation using concentric rects (cheap)
-    steps = 10
-    for i in range(steps):
-        a = int(alpha * (i + 1) / steps)
-        pad = int((i + 1) * (min(WIDTH, HEIGHT) * 0.03))
-        pygame.draw.rect(
-            overlay,
-            (0, 0, 0, a),
-            (0 - pad, 0 - pad, WIDTH + pad * 2, HEIGHT + pad * 2),
-            width=pad * 2,
-            border_radius=24
-        )
-    screen.blit(overlay, (0, 0))
+    screen.blit(vignette_overlay((WIDTH, HEIGHT), alpha), (0, 0))
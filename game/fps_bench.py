@@ -0,0 +1,320 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # stdout carries the JSON report
+
+import json
+import math
+import platform
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pygame
+
+from core.config import HEIGHT, WIDTH
+
+# --------------------------------------------------------------------------------------
+# Headless benchmark for the first-person renderer (game/fps.py)
+# --------------------------------------------------------------------------------------
+PATHS = ("loop", "cross", "spin")
+PERCENTILES = (50, 90, 95, 99)
+GATE_PERCENTILE = "p95"
+GATE_TOLERANCE = 0.10      # allowed relative p95 frame-time growth over a baseline
+WARMUP_FRAMES = 10         # untimed frames per run (layer/LUT/sprite caches fill here)
+SPRITE_COUNT = 24
+
+
+def generate_map(size: int, density: float = 0.08, seed: int = 1) -> List[List[int]]:
+    """
+    Random size x size arena: border walls, scattered wall cells at `density`,
+    and the cells the scripted camera paths run through carved clear.
+    """
+    rng = np.random.default_rng(seed)
+    grid = (rng.random((size, size)) < density).astype(np.uint8)
+    grid[0, :] = grid[-1, :] = grid[:, 0] = grid[:, -1] = 1
+    grid[1, 1:-1] = grid[-2, 1:-1] = grid[1:-1, 1] = grid[1:-1, -2] = 0   # loop
+    idx = np.arange(1, size - 1)
+    grid[idx, idx] = 0                                                    # cross
+    return grid.tolist()
+
+
+def _waypoints(name: str, w: int, h: int) -> List[Tuple[float, float]]:
+    """Path waypoints in cell units; all lie on cells generate_map keeps clear."""
+    lo_x, lo_y, hi_x, hi_y = 1.5, 1.5, w - 1.5, h - 1.5
+    if name == "loop":
+        return [(lo_x, lo_y), (hi_x, lo_y), (hi_x, hi_y), (lo_x, hi_y), (lo_x, lo_y)]
+    if name == "cross":
+        return [(lo_x, lo_y), (hi_x, hi_y)]
+    raise ValueError(f"unknown camera path {name!r}")
+
+
+def camera_path(name: str, game_map: Sequence[Sequence[int]], frames: int) -> Iterator[Tuple[float, float, float]]:
+    """
+    Scripted camera: yields (px, py, angle) for `frames` frames.
+    loop  - walks the inner ring of the map facing the direction of travel
+    cross - walks the main diagonal with a slow side-to-side sweep
+    spin  - turns a full circle on the spot at the map centre
+    Legs that would cross a wall (hand-made maps such as fps_map; generated
+    maps keep them clear) detour over clear cells instead.
+    """
+    from game.fps import WALL_SIZE as cell
+
+    h, w = len(game_map), len(game_map[0])
+    if name == "spin":
+        cx, cy = _clear_cell_near(game_map, w // 2, h // 2)
+        for i in range(frames):
+            yield (cx + 0.5) * cell, (cy + 0.5) * cell, i * 2 * math.pi / frames
+        return
+
+    pts = np.array(_route(game_map, _waypoints(name, w, h)))
+    seg = np.hypot(*np.diff(pts, axis=0).T)
+    bounds = np.concatenate([[0.0], np.cumsum(seg)])
+    for i in range(frames):
+        s = bounds[-1] * i / max(1, frames - 1)
+        k = min(int(np.searchsorted(bounds, s, side="right")) - 1, len(seg) - 1)
+        f = (s - bounds[k]) / seg[k] if seg[k] else 0.0
+        (x0, y0), (x1, y1) = pts[k], pts[k + 1]
+        angle = math.atan2(y1 - y0, x1 - x0)
+        if name == "cross":
+            angle += 0.6 * math.sin(i * 0.15)
+        yield (x0 + (x1 - x0) * f) * cell, (y0 + (y1 - y0) * f) * cell, angle
+
+
+def _segment_clear(game_map: Sequence[Sequence[int]], a: Tuple[float, float], b: Tuple[float, float]) -> bool:
+    """True if no wall cell lies on segment a-b (cell units, sampled every 1/8 cell)."""
+    n = max(1, int(math.hypot(b[0] - a[0], b[1] - a[1]) * 8))
+    return all(game_map[int(a[1] + (b[1] - a[1]) * i / n)][int(a[0] + (b[0] - a[0]) * i / n)] == 0
+               for i in range(n + 1))
+
+
+def _cell_path(game_map: Sequence[Sequence[int]], start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """Shortest 8-connected chain of empty cells start..goal without cutting wall corners; [] if none."""
+    h, w = len(game_map), len(game_map[0])
+    prev = {start: None}
+    frontier = [start]
+    while frontier and goal not in prev:
+        nxt = []
+        for x, y in frontier:
+            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)):
+                c = (x + dx, y + dy)
+                if c in prev or not (0 <= c[0] < w and 0 <= c[1] < h) or game_map[c[1]][c[0]]:
+                    continue
+                if dx and dy and (game_map[y][x + dx] or game_map[y + dy][x]):
+                    continue
+                prev[c] = (x, y)
+                nxt.append(c)
+        frontier = nxt
+    if goal not in prev:
+        return []
+    path = [goal]
+    while prev[path[-1]] is not None:
+        path.append(prev[path[-1]])
+    return path[::-1]
+
+
+def _route(game_map: Sequence[Sequence[int]], pts: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    """Waypoints moved onto empty cells, with blocked legs replaced by a cell-centre detour."""
+    pts = [(cx + 0.5, cy + 0.5) for cx, cy in (_clear_cell_near(game_map, int(x), int(y)) for x, y in pts)]
+    out = [pts[0]]
+    for a, b in zip(pts, pts[1:]):
+        if not _segment_clear(game_map, a, b):
+            cells = _cell_path(game_map, (int(a[0]), int(a[1])), (int(b[0]), int(b[1])))
+            out.extend((cx + 0.5, cy + 0.5) for cx, cy in cells[1:-1])
+        if b != out[-1]:
+            out.append(b)
+    return out
+
+
+def _clear_cell_near(game_map: Sequence[Sequence[int]], x: int, y: int) -> Tuple[int, int]:
+    """Nearest empty cell to (x, y) by ring search."""
+    h, w = len(game_map), len(game_map[0])
+    for r in range(max(w, h)):
+        for cy in range(max(0, y - r), min(h, y + r + 1)):
+            for cx in range(max(0, x - r), min(w, x + r + 1)):
+                if game_map[cy][cx] == 0:
+                    return cx, cy
+    return x, y
+
+
+def scatter_sprites(game_map: Sequence[Sequence[int]], count: int = SPRITE_COUNT, seed: int = 1) -> list:
+    """Billboards on random empty cells, to exercise the sprite stage."""
+    from game.fps import Sprite, WALL_SIZE
+
+    rng = np.random.default_rng(seed)
+    empty = [(x, y) for y, row in enumerate(game_map) for x, v in enumerate(row) if v == 0]
+    img = pygame.Surface((32, 48), pygame.SRCALPHA)
+    pygame.draw.ellipse(img, (210, 60, 60), img.get_rect())
+    picks = rng.choice(len(empty), size=min(count, len(empty)), replace=False)
+    return [Sprite((empty[i][0] + 0.5) * WALL_SIZE, (empty[i][1] + 0.5) * WALL_SIZE, img) for i in picks]
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """mean / percentiles / max of a list of ms samples, rounded for JSON."""
+    a = np.asarray(samples, dtype=np.float64)
+    if a.size == 0:
+        return {}
+    out = {"mean": round(float(a.mean()), 4)}
+    for p in PERCENTILES:
+        out[f"p{p}"] = round(float(np.percentile(a, p)), 4)
+    out["max"] = round(float(a.max()), 4)
+    return out
+
+
+def run_case(
+    screen: pygame.Surface,
+    game_map: Sequence[Sequence[int]],
+    path: str,
+    frames: int,
+    *,
+    textures=None,
+    pool=None,
+    sprites: Optional[list] = None,
+    minimap: bool = True,
+) -> Dict[str, object]:
+    """Render one camera path; returns per-stage and whole-frame timing summaries."""
+    from game import fps
+
+    stages: Dict[str, List[float]] = {s: [] for s in fps.RENDER_STAGES}
+    frame_ms: List[float] = []
+    poses = list(camera_path(path, game_map, frames + WARMUP_FRAMES))
+    for i, (px, py, angle) in enumerate(poses):
+        timings: Dict[str, float] = {}
+        t0 = time.perf_counter()
+        fps.render_first_person(screen, px, py, angle, game_map, i / 60.0, sprites=sprites,
+                                show_minimap=minimap, textures=textures, pool=pool, timings=timings)
+        dt = (time.perf_counter() - t0) * 1000.0
+        if i < WARMUP_FRAMES:
+            continue
+        frame_ms.append(dt)
+        for s in stages:
+            stages[s].append(timings.get(s, 0.0))
+    return {
+        "path": path,
+        "frames": frames,
+        "frame_ms": summarize(frame_ms),
+        "stages": {s: summarize(v) for s, v in stages.items()},
+    }
+
+
+def run_suite(
+    maps: Sequence[str] = ("fps_map", "64", "256"),
+    paths: Sequence[str] = PATHS,
+    frames: int = 120,
+    width: int = WIDTH,
+    height: int = HEIGHT,
+    *,
+    textured: bool = False,
+    workers: int = 0,
+    sprites: bool = True,
+    seed: int = 1,
+) -> Dict[str, object]:
+    """
+    Run every (map, path) pair headless. Maps are "fps_map" (game/fps_map.MAP) or
+    an integer size for generate_map. Returns a JSON-ready report. The frame
+    must be WIDTH x HEIGHT: the sprite, crosshair, weapon and vignette stages
+    draw at that size whatever the surface.
+    """
+    if (width, height) != (WIDTH, HEIGHT):
+        raise ValueError(f"the renderer draws at {WIDTH}x{HEIGHT}; got {width}x{height}")
+    from game import fps
+    from game.fps_map import MAP
+    from game.fps_parallel import StripPool
+    from game.fps_textures import default_wall_textures
+
+    pygame.display.init()
+    screen = pygame.display.set_mode((width, height))
+    textures = default_wall_textures() if textured else None
+    pool = StripPool(workers) if workers else None
+    results = []
+    try:
+        for name in maps:
+            game_map = MAP if name == "fps_map" else generate_map(int(name), seed=seed)
+            fps.invalidate_grid_array()
+            fps.invalidate_render_layers()
+            billboards = scatter_sprites(game_map, seed=seed) if sprites else None
+            for path in paths:
+                row = run_case(screen, game_map, path, frames, textures=textures, pool=pool, sprites=billboards)
+                row["map"] = name
+                results.append(row)
+    finally:
+        if pool is not None:
+            pool.close()
+        pygame.display.quit()
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "video_driver": os.environ.get("SDL_VIDEODRIVER"),
+            "size": [width, height],
+            "frames": frames,
+            "warmup": WARMUP_FRAMES,
+            "textured": textured,
+            "workers": workers,
+            "sprites": sprites,
+        },
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict, *, key: str = GATE_PERCENTILE,
+            tolerance: float = GATE_TOLERANCE) -> List[str]:
+    """
+    Regressions of `report` against `baseline`: one message per (map, path) whose
+    whole-frame `key` percentile grew by more than `tolerance`. Empty if none.
+    """
+    base = {(r["map"], r["path"]): r for r in baseline.get("results", [])}
+    failures = []
+    for r in report["results"]:
+        ref = base.get((r["map"], r["path"]))
+        if ref is None:
+            continue
+        old, new = ref["frame_ms"][key], r["frame_ms"][key]
+        if old > 0 and new > old * (1.0 + tolerance):
+            failures.append(f"{r['map']}/{r['path']}: {key} {old:.3f} -> {new:.3f} ms (+{(new / old - 1) * 100:.1f}%)")
+    return failures
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Headless first-person renderer benchmark")
+    ap.add_argument("--maps", nargs="*", default=["fps_map", "64", "256"],
+                    help='"fps_map" or generated map sizes')
+    ap.add_argument("--paths", nargs="*", default=list(PATHS), choices=PATHS)
+    ap.add_argument("--frames", type=int, default=120)
+    ap.add_argument("--width", type=int, default=WIDTH, help=f"must be {WIDTH} (see run_suite)")
+    ap.add_argument("--height", type=int, default=HEIGHT, help=f"must be {HEIGHT}")
+    ap.add_argument("--textured", action="store_true")
+    ap.add_argument("--workers", type=int, default=0, help="StripPool size; 0 renders serially")
+    ap.add_argument("--no-sprites", action="store_true")
+    ap.add_argument("--out", help="write the JSON report here (default: stdout)")
+    ap.add_argument("--baseline", help="JSON report to gate against; exits 1 on regression")
+    ap.add_argument("--tolerance", type=float, default=GATE_TOLERANCE)
+    args = ap.parse_args()
+    if (args.width, args.height) != (WIDTH, HEIGHT):
+        ap.error(f"the renderer draws at {WIDTH}x{HEIGHT}; --width/--height cannot change that")
+
+    report = run_suite(args.maps, args.paths, args.frames, args.width, args.height,
+                       textured=args.textured, workers=args.workers, sprites=not args.no_sprites)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+        for r in report["results"]:
+            fm = r["frame_ms"]
+            print(f"{r['map']:>8} {r['path']:<6} mean={fm['mean']:7.3f}  p95={fm['p95']:7.3f}  p99={fm['p99']:7.3f} ms")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = compare(report, json.load(f), tolerance=args.tolerance)
+        for msg in failures:
+            print("REGRESSION", msg, file=sys.stderr)
+        sys.exit(1 if failures else 0)
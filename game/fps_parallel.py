@@ -0,0 +1,101 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+# --------------------------------------------------------------------------------------
+# Strip-parallel execution for the raycaster (game/fps.py)
+# --------------------------------------------------------------------------------------
+
+
+class StripPool:
+    """
+    Persistent worker pool that splits a column range (rays or screen columns)
+    into contiguous strips and runs one job per strip.
+
+    Threads rather than processes: the jobs are NumPy kernels that release the
+    GIL, the map grid is shared read-only, and every job writes straight into
+    its own slice of a preallocated output, so nothing is copied to merge.
+    """
+
+    def __init__(self, workers: Optional[int] = None) -> None:
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="fps-strip")
+
+    def strips(self, n: int, align: int = 1) -> List[Tuple[int, int]]:
+        """Split range(n) into up to `workers` strips whose starts are multiples of align."""
+        per = -(-n // self.workers)
+        per = -(-per // align) * align
+        return [(lo, min(n, lo + per)) for lo in range(0, n, max(1, per))]
+
+    def run(self, job: Callable[[int, int], None], n: int, align: int = 1) -> None:
+        """Call job(lo, hi) for every strip of range(n) and wait for all of them."""
+        strips = self.strips(n, align)
+        if len(strips) == 1:
+            job(*strips[0])
+            return
+        for f in [self._executor.submit(job, lo, hi) for lo, hi in strips]:
+            f.result()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "StripPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def benchmark(map_size: int = 256, frames: int = 30, width: int = 1920, height: int = 1080,
+              worker_counts: Optional[List[int]] = None, seed: int = 1) -> List[dict]:
+    """
+    Time build_depth_buffer + rasterize_walls at one ray per column on a random
+    map_size x map_size arena, serial and with pools of each worker count.
+    """
+    import math
+    import time
+    import numpy as np
+    from game import fps
+
+    rng = np.random.default_rng(seed)
+    grid = (rng.random((map_size, map_size)) < 0.08).astype(np.uint8)
+    grid[0, :] = grid[-1, :] = grid[:, 0] = grid[:, -1] = 1
+    cx = cy = (map_size // 2 + 0.5) * fps.WALL_SIZE
+    grid[map_size // 2, map_size // 2] = 0
+    frame = np.zeros((width, height, 4), dtype=np.uint8)
+
+    def timed(pool: Optional[StripPool]) -> Tuple[float, float]:
+        t_depth = t_raster = 0.0
+        for i in range(frames):
+            ang = i * (2 * math.pi / frames)
+            t0 = time.perf_counter()
+            depth = fps.build_depth_buffer(cx, cy, ang, grid, num_rays=width, max_depth=map_size * fps.WALL_SIZE, pool=pool)
+            t1 = time.perf_counter()
+            fps.rasterize_walls(frame, depth, pool=pool)
+            t2 = time.perf_counter()
+            t_depth += t1 - t0
+            t_raster += t2 - t1
+        return t_depth * 1000 / frames, t_raster * 1000 / frames
+
+    rows = []
+    d, r = timed(None)
+    rows.append({"workers": 0, "depth_ms": round(d, 3), "raster_ms": round(r, 3)})
+    for n in worker_counts or sorted({1, 2, 4, os.cpu_count() or 1}):
+        with StripPool(n) as pool:
+            d, r = timed(pool)
+        rows.append({"workers": n, "depth_ms": round(d, 3), "raster_ms": round(r, 3)})
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Strip-parallel raycaster scaling benchmark")
+    ap.add_argument("--map-size", type=int, default=256)
+    ap.add_argument("--frames", type=int, default=30)
+    ap.add_argument("--width", type=int, default=1920)
+    ap.add_argument("--height", type=int, default=1080)
+    ap.add_argument("--workers", type=int, nargs="*")
+    args = ap.parse_args()
+    print(f"cpu_count={os.cpu_count()}  (workers=0 is the serial path)")
+    for row in benchmark(args.map_size, args.frames, args.width, args.height, args.workers):
+        print(f"workers={row['workers']:>2}  depth={row['depth_ms']:8.3f} ms  raster={row['raster_ms']:8.3f} ms")
@@ -0,0 +1,93 @@
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+from core.config import FPS
+
+# --------------------------------------------------------------------------------------
+# Dynamic resolution for the first-person raycaster (game/fps.py)
+# --------------------------------------------------------------------------------------
+SCALE_STEPS = (0.25, 0.375, 0.5, 0.625, 0.75, 0.875, 1.0)
+MIN_RAYS = 120
+
+
+class DynamicResolution:
+    """
+    Holds a target FPS by stepping a render scale up/down from recent frame times.
+
+    The scale drives the ray count (num_rays) and, when scale_render is on, an
+    internal render resolution that render_first_person upscales at present time.
+    Hysteresis: the average over `window` frames must exceed the frame budget by
+    `drop_margin` to step down, or sit below `raise_margin` of it to step up, and
+    after every change the next `cooldown` frames are ignored.
+    """
+
+    def __init__(
+        self,
+        target_fps: float = FPS,
+        *,
+        scale_render: bool = False,
+        window: int = 30,
+        cooldown: int = 60,
+        drop_margin: float = 1.05,
+        raise_margin: float = 0.75,
+    ) -> None:
+        self.target_fps = target_fps
+        self.scale_render = scale_render
+        self.window = window
+        self.cooldown = cooldown
+        self.drop_margin = drop_margin
+        self.raise_margin = raise_margin
+
+        self.level = len(SCALE_STEPS) - 1
+        self.frame_ms: Deque[float] = deque(maxlen=window)
+        self.hold = 0
+        self.changes = 0
+
+    @property
+    def scale(self) -> float:
+        return SCALE_STEPS[self.level]
+
+    @property
+    def budget_ms(self) -> float:
+        return 1000.0 / self.target_fps
+
+    def avg_ms(self) -> float:
+        return sum(self.frame_ms) / len(self.frame_ms) if self.frame_ms else 0.0
+
+    def record(self, frame_ms: float) -> None:
+        """Feed the duration of the last frame; may step the scale."""
+        if self.hold > 0:
+            self.hold -= 1
+            return
+        self.frame_ms.append(frame_ms)
+        if len(self.frame_ms) < self.window:
+            return
+        avg = self.avg_ms()
+        if avg > self.budget_ms * self.drop_margin and self.level > 0:
+            self._step(-1)
+        elif avg < self.budget_ms * self.raise_margin and self.level < len(SCALE_STEPS) - 1:
+            self._step(+1)
+
+    def _step(self, d: int) -> None:
+        self.level += d
+        self.changes += 1
+        self.frame_ms.clear()
+        self.hold = self.cooldown
+
+    def num_rays(self, full: int) -> int:
+        return max(min(MIN_RAYS, full), int(full * self.scale))
+
+    def render_size(self, size: Tuple[int, int]) -> Tuple[int, int]:
+        if not self.scale_render or self.level == len(SCALE_STEPS) - 1:
+            return size
+        w, h = size
+        return max(1, int(w * self.scale)), max(1, int(h * self.scale))
+
+    def stats(self) -> Dict[str, float]:
+        """Snapshot for the HUD / profiler."""
+        return {
+            "scale": self.scale,
+            "avg_ms": round(self.avg_ms(), 3),
+            "budget_ms": round(self.budget_ms, 3),
+            "changes": self.changes,
+        }
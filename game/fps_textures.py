@@ -0,0 +1,160 @@
+import math
+import numpy as np
+import pygame
+from typing import Dict, Optional, Tuple
+
+# --------------------------------------------------------------------------------------
+# Wall textures for the first-person raycaster (game/fps.py)
+# --------------------------------------------------------------------------------------
+TEXTURE_SIZE = 64          # square textures; must be a power of two
+MIN_MIP_SIZE = 4           # smallest mip level generated
+TEXTURE_BUDGET_MS = 6.0    # target cost of the textured wall pass per frame
+MAX_TEXTURE_STRIDE = 4     # coarsest horizontal sampling the budget may fall back to
+
+
+def _pack(surf: pygame.Surface) -> np.ndarray:
+    """Surface -> (w, h) uint32 texels packed as RGBA bytes (same layout as fps.frame_buffer)."""
+    rgb = pygame.surfarray.array3d(surf)
+    rgba = np.full(rgb.shape[:2] + (4,), 255, dtype=np.uint8)
+    rgba[..., :3] = rgb
+    return rgba.view(np.uint32)[..., 0]
+
+
+class WallTextures:
+    """
+    Wall textures keyed by map cell value, with the whole mip chain built at load.
+
+    All levels of all textures live in one flat texel atlas. Each level is stored
+    column-major (texture column u is a contiguous strip of texels), so the
+    rasterizer resolves a screen column to one strip offset and samples down it.
+    Cell values without a texture of their own use the first texture added.
+
+    Also carries the opt-in texture mode's budget state: the measured cost of the
+    textured pass (EMA) drives a horizontal sampling stride between 1 and
+    MAX_TEXTURE_STRIDE so the pass stays within budget_ms.
+    """
+
+    def __init__(self, size: int = TEXTURE_SIZE, budget_ms: float = TEXTURE_BUDGET_MS) -> None:
+        if size & (size - 1):
+            raise ValueError("texture size must be a power of two")
+        self.size = size
+        self.levels = int(math.log2(size // MIN_MIP_SIZE)) + 1
+        self.atlas = np.zeros(0, dtype=np.uint32)
+        self.base = np.zeros((0, self.levels), dtype=np.int64)   # [slot, level] -> atlas offset
+        self.slot = np.zeros(256, dtype=np.int64)                 # cell value -> slot
+        self.cells: Dict[int, int] = {}
+        self._shaded: Dict[tuple, np.ndarray] = {}
+
+        self.budget_ms = budget_ms
+        self.stride = 1
+        self.cost_ms = 0.0
+
+    @classmethod
+    def from_surfaces(cls, surfaces: Dict[int, pygame.Surface], **kwargs) -> "WallTextures":
+        textures = cls(**kwargs)
+        for cell, surf in surfaces.items():
+            textures.add(cell, surf)
+        return textures
+
+    def add(self, cell: int, surf: pygame.Surface) -> None:
+        """Register surf for cell value `cell`; its mip chain is built here, once."""
+        level = surf if surf.get_size() == (self.size, self.size) else pygame.transform.smoothscale(surf, (self.size, self.size))
+        chain = []
+        size = self.size
+        for _ in range(self.levels):
+            chain.append(_pack(level).ravel())
+            size //= 2
+            if size >= MIN_MIP_SIZE:
+                level = pygame.transform.smoothscale(level, (size, size))
+
+        offsets = np.cumsum([0] + [c.size for c in chain[:-1]]) + self.atlas.size
+        self.atlas = np.concatenate([self.atlas, *chain])
+        self.base = np.vstack([self.base, offsets[None, :]])
+        s = self.base.shape[0] - 1
+        self.cells[cell] = s
+        if 0 <= cell < self.slot.size:
+            self.slot[cell] = s
+        self._shaded.clear()
+
+    def shaded_atlas(self, key: tuple, scale: np.ndarray, add: np.ndarray) -> np.ndarray:
+        """
+        Atlas copies pre-shaded per (side, distance band), flattened so copy b starts
+        at b * atlas.size. A texel c becomes (c * scale[side, band] >> 8) + add[band];
+        scale is (2, bands) uint16, add is (bands, 3) uint8. Baked once per key.
+        """
+        shaded = self._shaded.get(key)
+        if shaded is None:
+            rgba = self.atlas.view(np.uint8).reshape(-1, 4)
+            bands = scale.shape[1]
+            out = np.empty((2, bands, rgba.shape[0], 4), dtype=np.uint8)
+            out[..., 3] = 255
+            out[..., :3] = ((rgba[None, None, :, :3] * scale[:, :, None, None]) >> 8) + add[None, :, None, :]
+            shaded = out.view(np.uint32).ravel()
+            self._shaded = {key: shaded}
+        return shaded
+
+    def column_strips(
+        self,
+        cell: np.ndarray,
+        tex_u: np.ndarray,
+        slice_h: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per screen column: (atlas offset of the sampled texel strip, strip length).
+        The mip level is picked so roughly one texel maps to one screen pixel.
+        """
+        ratio = self.size / np.maximum(slice_h, 1)
+        level = np.clip(np.floor(np.log2(np.maximum(ratio, 1.0))).astype(np.int64), 0, self.levels - 1)
+        tsize = self.size >> level
+        u = np.minimum((tex_u * tsize).astype(np.int64), tsize - 1)
+        strip = self.base[self.slot[cell], level] + u * tsize
+        return strip, tsize
+
+    def record(self, ms: float) -> None:
+        """Feed the measured textured-pass cost; adjusts the sampling stride."""
+        self.cost_ms = ms if self.cost_ms == 0.0 else self.cost_ms * 0.9 + ms * 0.1
+        if self.cost_ms > self.budget_ms and self.stride < MAX_TEXTURE_STRIDE:
+            self.stride *= 2
+            self.cost_ms = 0.0
+        elif self.cost_ms < self.budget_ms * 0.4 and self.stride > 1:
+            self.stride //= 2
+            self.cost_ms = 0.0
+
+
+def make_brick_texture(size: int = TEXTURE_SIZE, base=(150, 72, 56), mortar=(92, 88, 84)) -> pygame.Surface:
+    """Procedural brick placeholder (no texture art ships with the repo yet)."""
+    surf = pygame.Surface((size, size))
+    surf.fill(mortar)
+    rows = 4
+    bh = size // rows
+    for r in range(rows):
+        off = (size // 4) if r % 2 else 0
+        for bx in range(-off, size, size // 2):
+            shade = 12 * ((bx // (size // 2) + r) % 3)
+            color = (min(255, base[0] + shade), min(255, base[1] + shade), min(255, base[2] + shade))
+            pygame.draw.rect(surf, color, (bx + 1, r * bh + 1, size // 2 - 2, bh - 2))
+    return surf
+
+
+def make_panel_texture(size: int = TEXTURE_SIZE, base=(96, 104, 120)) -> pygame.Surface:
+    """Procedural metal panel placeholder."""
+    surf = pygame.Surface((size, size))
+    surf.fill(base)
+    edge = tuple(max(0, c - 30) for c in base)
+    hi = tuple(min(255, c + 30) for c in base)
+    pygame.draw.rect(surf, edge, (0, 0, size, size), 2)
+    pygame.draw.line(surf, hi, (2, 2), (size - 3, 2))
+    for cx, cy in ((6, 6), (size - 7, 6), (6, size - 7), (size - 7, size - 7)):
+        pygame.draw.circle(surf, hi, (cx, cy), 2)
+    return surf
+
+
+_default: Optional[WallTextures] = None
+
+
+def default_wall_textures() -> WallTextures:
+    """Shared placeholder set: bricks for 1, panels for 2 (other values fall back to bricks)."""
+    global _default
+    if _default is None:
+        _default = WallTextures.from_surfaces({1: make_brick_texture(), 2: make_panel_texture()})
+    return _default
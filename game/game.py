@@ -1,62 +1,125 @@
 import pygame, sys, json, random, time
 from core import settings as S
 from core.input import Input
+from core.utils import VisibilityCache
+from core.spatial import PointHash
 from .assets import load_assets
-from .map import TileMap
-from .player import Player
-from .projectile import Paintball
-from .ai import BotController
+from .map import open_tilemap
+from .player import ArenaPlayer
+from .projectile import ProjectilePool
+from .ai import BatchBotAI, BotController
+from .ai_lod import ThinkScheduler
+from .pathfinding import FlowFieldService
 from . import ui
 from core.config import FPS
 
+SPLASH_DAMAGE = 35
+SPLASH_PAD = 8   # splash reaches this far past a player's radius
+
 class Game:
-    def __init__(self, screen, map_data, player_color=(64,160,255), bot_count=3, ai_enabled=True):
+    def __init__(self, screen, map_data, player_color=(64,160,255), bot_count=3, ai_enabled=True, human=True):
+        # human=False: bots only, no input or display needed (headless runs, see game/sim.py)
         self.screen = screen
         self.assets = load_assets()
-        self.map = TileMap(map_data)
-        self.solids = self.map.walls
+        self.map = open_tilemap(map_data)
+        self.solids = self.map.solids
+        self.visibility = VisibilityCache(self.solids)
+        self.paths = FlowFieldService(self.map, fixed_steps=not human)  # headless: budget in steps, not ms
         self.spawn_points = self.map.spawn_points
         self.players = []
-        self.projectiles = []
+        self.projectiles = ProjectilePool()  # players fire with spawn()
+        self.bounds = pygame.Rect(0, 0, self.map.width * S.TILE_SIZE, self.map.height * S.TILE_SIZE)
+        self.player_hash = PointHash()  # live players, rebuilt when splash resolves
         self.bots = []  # (Player, BotController)
+        self.bot_ai = BatchBotAI(self.bots)  # ticks bots in one vectorized pass
+        # who thinks when: rate by distance to the human, view and state, within a frame budget
+        self.ai_lod = ThinkScheduler(lambda b: b.p.pos, state=lambda b: b.state,
+                                     in_view=lambda b: self.screen.get_rect().collidepoint(b.p.pos))
         self.round_time = 120.0
-        self._spawn_player("You", color=player_color)
+        self.time = 0.0      # simulated seconds since the round started
+        self.events = None   # list -> ("hit"/"kill", time, owner id, victim id, damage) are appended
+        self.local_player = None
+        if human:
+            self._spawn_player("You", color=player_color)
         if ai_enabled:
             for i in range(bot_count):
                 self._spawn_bot(f"Bot{i+1}")
         self.clock = pygame.time.Clock()
-        self.input = Input()
+        self.input = Input() if human else None
 
     def _spawn_player(self, name, color=(64,160,255)):
-        p = Player(random.choice(self.spawn_points), name, color=color)
+        p = ArenaPlayer(random.choice(self.spawn_points), name, color=color)
         self.players.append(p)
         self.local_player = p
 
     def _spawn_bot(self, name):
-        p = Player(random.choice(self.spawn_points), name, color=(220,64,64))
+        p = ArenaPlayer(random.choice(self.spawn_points), name, color=(220,64,64))
         bot = BotController(p, color=(220,64,64))
         self.players.append(p)
         self.bots.append(bot)
 
-    def _aim_pos(self):
+    def _aim_pos(self, pl):
+        # bots aim at their target; the mouse only means something to the human
+        if pl is not self.local_player:
+            for bot in self.bots:
+                if bot.p is pl and bot.target is not None:
+                    return pygame.Vector2(bot.target.pos)
+            return pygame.Vector2(pl.pos)
         return pygame.Vector2(pygame.mouse.get_pos())
 
-    def _damage_at(self, pos, owner_id):
-        for pl in self.players:
-            if not pl.alive or pl.id == owner_id: continue
-            if (pl.pos - pos).length() <= (pl.radius()+8):
-                pl.hit(35, owner_id)
+    def _resolve_splash(self, ts, xs, ys, owners):
+        """
+        Splash damage for every impact of the tick at once. Impacts are matched
+        against a hash of the players alive when the tick's hits resolve, and
+        damage is summed per victim and applied in one hit, credited to the
+        shooter who dealt most of it (on a tie, the one whose ball landed first,
+        then the lower id). The outcome does not depend on the pool's slot order.
+        """
+        if not len(xs):
+            return
+        self.player_hash.rebuild((pl for pl in self.players if pl.alive),
+                                 lambda pl: (pl.pos.x, pl.pos.y, pl.radius()))
+        impacts = sorted(zip(ts, xs, ys, owners), key=lambda hit: (hit[0], hit[3].id))
+        dealt = {}  # victim -> {owner_id: damage}, owners in first-contact order
+        for _, x, y, owner in impacts:
+            for pl in self.player_hash.query(x, y, SPLASH_PAD):
+                if pl.id == owner.id: continue
+                per = dealt.setdefault(pl, {})
+                per[owner.id] = per.get(owner.id, 0) + SPLASH_DAMAGE
+        for pl, per in dealt.items():
+            owner_id = max(per, key=per.get)
+            damage = sum(per.values())
+            # spawn protection refuses damage: nothing happened, so nothing is logged
+            if pl.hit(damage, owner_id) and self.events is not None:
+                self.events.append(("kill" if not pl.alive else "hit", self.time, owner_id, pl.id, damage))
 
     def update(self, dt):
         # input
-        if not self.input.poll():
+        if self.input is not None and not self.input.poll():
             return False
 
-        # bots AI -> produce move/shoot
+        # keep map chunks around live players resident (no-op for small maps)
+        self.map.track([pl.pos for pl in self.players if pl.alive])
+
+        # bots AI -> produce move/shoot (positions are fixed until players move)
+        self.visibility.next_tick()
+        if self.local_player is None:
+            thinking = [(bot, dt) for bot in self.bots]  # nobody watching: no level of detail
+        else:
+            thinking = self.ai_lod.select(dt, self.bots, [self.local_player.pos])
+        t0 = time.perf_counter()
+        fresh = self.bot_ai.update([e for _, e in thinking], self, [b for b, _ in thinking])
+        self.ai_lod.record(len(thinking), (time.perf_counter() - t0) * 1000.0)
         bot_moves = {}
         for bot in self.bots:
-            mv, shoot = bot.update(dt, self)
-            bot_moves[bot.p.id] = (mv, shoot)
+            decision = fresh.get(bot.p.id)
+            if decision is not None:
+                self.ai_lod.remember(bot, decision[0])
+            else:
+                # not its frame: keep walking the last decided way, hold fire
+                decision = (self.ai_lod.between(bot, pygame.Vector2(0, 0)), False)
+            bot_moves[bot.p.id] = decision
+        self.paths.tick()  # flow fields requested above advance within their budget
 
         # update players
         for pl in self.players:
@@ -67,29 +130,23 @@ class Game:
             else:
                 mv, shoot = bot_moves.get(pl.id, (pygame.Vector2(0,0), False))
                 reload = False
-            pl.update(dt, mv, self._aim_pos(), shoot, reload, self.solids, self.projectiles)
+            pl.update(dt, mv, self._aim_pos(pl), shoot, reload, self.solids, self.projectiles)
 
-        # projectiles
-        alive_proj = []
-        for pb in self.projectiles:
-            alive = pb.update(dt, self.solids)
-            if not alive:
-                # splash damage where it ends
-                self._damage_at(pb.pos, pb.owner_id)
-            else:
-                alive_proj.append(pb)
-        self.projectiles = alive_proj
+        # projectiles: one vectorized step, swept against walls and players, culled at the arena edge
+        hits = self.projectiles.step(dt, self.solids, self.players, self.bounds)
+        # splash damage at the true contact points, whatever the frame time
+        self._resolve_splash(hits.t, hits.x, hits.y, hits.owner)
 
         # timer
         self.round_time -= dt
+        self.time += dt
         return True
 
     def draw(self):
         # world
         self.map.draw(self.screen, self.assets["tile"])
         # projectiles
-        for pb in self.projectiles:
-            pb.draw(self.screen)
+        self.projectiles.draw(self.screen)
         # players
         for pl in self.players:
             pl.draw(self.screen)
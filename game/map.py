@@ -1,28 +1,115 @@
 import json, pygame
+import numpy as np
 from core import settings as S
+from core.spatial import SpatialGrid
+
+WALL = 1
+FLOOR_COLOR = (24, 26, 30)
+CHUNKED_MIN_TILES = 256 * 256   # maps at least this big load lazily (game/chunked_map.py)
+
+
+def merge_tiles(tiles, value=WALL):
+    """
+    Greedy rectangle merge of the cells equal to `value`: each unclaimed cell
+    (row-major) grows right as far as it can, then down while the whole span
+    below is still unclaimed wall. Returns (x, y, w, h) in tiles.
+    """
+    if isinstance(tiles, np.ndarray):
+        tiles = tiles.tolist()   # per-cell NumPy indexing is far slower than lists
+    h = len(tiles)
+    w = max((len(row) for row in tiles), default=0)
+    taken = [[False] * w for _ in range(h)]
+
+    def free(x, y):
+        return x < len(tiles[y]) and tiles[y][x] == value and not taken[y][x]
+
+    out = []
+    for y in range(h):
+        for x in range(len(tiles[y])):
+            if not free(x, y):
+                continue
+            x1 = x + 1
+            while x1 < w and free(x1, y):
+                x1 += 1
+            y1 = y + 1
+            while y1 < h and all(free(i, y1) for i in range(x, x1)):
+                y1 += 1
+            for j in range(y, y1):
+                for i in range(x, x1):
+                    taken[j][i] = True
+            out.append((x, y, x1 - x, y1 - y))
+    return out
+
 
 class TileMap:
     def __init__(self, map_json):
-        self.walls = []
+        self.tiles = []
+        self.walls = []      # merged wall colliders (see merge_tiles)
         self.width = 0
         self.height = 0
         self.spawn_points = []
+        # tile-grid index over self.walls for collision / line-of-sight queries
+        self.solids = SpatialGrid(cell=S.TILE_SIZE)
+        self._layer = None
+        self._layer_key = None
+        self.on_edit = []    # callbacks (x, y, value) after set_tile changes a tile
         self._load(map_json)
 
     def _load(self, mp):
         self.width = mp.get("width", 20)
         self.height = mp.get("height", 12)
         tiles = mp["tiles"]
+        # binary maps (game/mapfile.py) hand over a memory-mapped grid; keep it as is
+        self.tiles = tiles if isinstance(tiles, np.ndarray) else [list(row) for row in tiles]
         self.spawn_points = [pygame.Vector2(p) for p in mp.get("spawns", [(80,80),(600,400),(1000,600)])]
-        for y, row in enumerate(tiles):
-            for x, cell in enumerate(row):
-                if cell == 1:  # wall
-                    r = pygame.Rect(x*S.TILE_SIZE, y*S.TILE_SIZE, S.TILE_SIZE, S.TILE_SIZE)
-                    self.walls.append(r)
+        self._rebuild()
+
+    def _rebuild(self):
+        t = S.TILE_SIZE
+        self.walls = [pygame.Rect(x*t, y*t, w*t, h*t) for x, y, w, h in merge_tiles(self.tiles)]
+        self.solids.reset(self.walls)
+        self._layer = None
+
+    def track(self, positions):
+        """Chunked maps load around these positions; the whole map is always resident here."""
+
+    def window(self, x0, y0, x1, y1):
+        """Tile values of columns x0..x1-1, rows y0..y1-1 as a uint8 array."""
+        return np.array([row[x0:x1] for row in self.tiles[y0:y1]], dtype=np.uint8).reshape(y1 - y0, x1 - x0)
+
+    def set_tile(self, x, y, value):
+        """Runtime map edit: re-merges colliders and drops the cached map layer."""
+        if self.tiles[y][x] == value:
+            return
+        self.tiles[y][x] = value
+        self._rebuild()
+        for fn in self.on_edit:
+            fn(x, y, value)
+
+    def _build_layer(self, surf, tile_surf):
+        layer = pygame.Surface(surf.get_size(), 0, surf)  # same pixel format as the target
+        layer.fill(FLOOR_COLOR)
+        t = S.TILE_SIZE
+        nx, ny = -(-layer.get_width() // t), -(-layer.get_height() // t)   # tiles that land on the surface
+        layer.blits([(tile_surf, (x*t, y*t)) for y, row in enumerate(self.tiles[:ny])
+                     for x, cell in enumerate(row[:nx]) if cell == WALL], doreturn=False)
+        return layer
 
     def draw(self, surf, tile_surf):
-        # Fill background
-        surf.fill((24, 26, 30))
-        # Draw walls
-        for r in self.walls:
-            surf.blit(tile_surf, r.topleft)
+        # Static layer (floor + walls) is rendered once and redrawn with one blit
+        key = (surf.get_size(), tile_surf)
+        if self._layer is None or self._layer_key != key:
+            self._layer = self._build_layer(surf, tile_surf)
+            self._layer_key = key
+        surf.blit(self._layer, (0, 0))
+
+
+def open_tilemap(map_json):
+    """TileMap for regular maps, ChunkedTileMap for arenas of CHUNKED_MIN_TILES or more."""
+    tiles = map_json["tiles"]
+    h = len(tiles)
+    w = len(tiles[0]) if h else 0
+    if w * h >= CHUNKED_MIN_TILES:
+        from .chunked_map import ChunkedTileMap
+        return ChunkedTileMap(map_json)
+    return TileMap(map_json)
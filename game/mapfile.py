@@ -0,0 +1,123 @@
+import json
+import os
+import struct
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+# --------------------------------------------------------------------------------------
+# Binary map format (.pbmap)
+#
+#   header   MAGIC, version u16, width u32, height u32, spawn_count u32,
+#            meta_len u32, tile_offset u32  (little-endian, HEADER.size bytes)
+#   spawns   spawn_count x (x, y) float32
+#   meta     meta_len bytes of UTF-8 JSON (name, author, any extra keys of the
+#            source map)
+#   tiles    width * height uint8, row-major, starting at tile_offset (aligned
+#            to TILE_ALIGN so the grid can be memory-mapped in place)
+# --------------------------------------------------------------------------------------
+MAGIC = b"PBMAP\0"
+VERSION = 1
+HEADER = struct.Struct("<6sHIIIII")
+TILE_ALIGN = 64
+EXTENSION = ".pbmap"
+
+
+class MapData(NamedTuple):
+    """A loaded binary map. tiles is (height, width) uint8, memory-mapped when loaded from disk."""
+    width: int
+    height: int
+    tiles: np.ndarray
+    spawns: List[Tuple[float, float]]
+    meta: Dict[str, object]
+
+    def to_dict(self) -> Dict[str, object]:
+        """Same shape as the JSON maps, for TileMap(map_json); tiles stays an array."""
+        return {**self.meta, "width": self.width, "height": self.height,
+                "tiles": self.tiles, "spawns": list(self.spawns)}
+
+
+def save_map(
+    path: str,
+    tiles,
+    spawns: Sequence[Sequence[float]] = (),
+    meta: Optional[Dict[str, object]] = None,
+) -> None:
+    """Write a tile grid (list of rows or 2D array, values 0..255) as a .pbmap file."""
+    grid = np.ascontiguousarray(tiles, dtype=np.uint8)
+    if grid.ndim != 2:
+        raise ValueError("tiles must be a 2D grid")
+    height, width = grid.shape
+    spawn_bytes = np.asarray(spawns, dtype="<f4").reshape(-1, 2).tobytes()
+    meta_bytes = json.dumps(meta or {}, separators=(",", ":")).encode("utf-8")
+    head = HEADER.size + len(spawn_bytes) + len(meta_bytes)
+    tile_offset = -(-head // TILE_ALIGN) * TILE_ALIGN
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, width, height, len(spawn_bytes) // 8, len(meta_bytes), tile_offset))
+        f.write(spawn_bytes)
+        f.write(meta_bytes)
+        f.write(b"\0" * (tile_offset - head))
+        f.write(grid.tobytes())
+
+
+def load_map(path: str, *, writable: bool = False) -> MapData:
+    """
+    Open a .pbmap file. The tile grid is memory-mapped, not read: pages are only
+    faulted in when touched. writable=True maps it copy-on-write so runtime edits
+    (TileMap.set_tile) work without touching the file.
+    """
+    with open(path, "rb") as f:
+        raw = f.read(HEADER.size)
+        if len(raw) < HEADER.size:
+            raise ValueError(f"{path}: truncated map header")
+        magic, version, width, height, n_spawns, meta_len, tile_offset = HEADER.unpack(raw)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a {EXTENSION} file")
+        if version > VERSION:
+            raise ValueError(f"{path}: map format v{version} is newer than supported v{VERSION}")
+        spawns = np.frombuffer(f.read(n_spawns * 8), dtype="<f4").reshape(-1, 2)
+        meta = json.loads(f.read(meta_len).decode("utf-8")) if meta_len else {}
+
+    if os.path.getsize(path) < tile_offset + width * height:
+        raise ValueError(f"{path}: truncated tile grid")
+    tiles = np.memmap(path, dtype=np.uint8, mode="c" if writable else "r",
+                      offset=tile_offset, shape=(height, width))
+    return MapData(width, height, tiles, [(float(x), float(y)) for x, y in spawns], meta)
+
+
+def convert_json(src: str, dst: Optional[str] = None) -> str:
+    """Convert a JSON map (width/height/tiles/spawns + extra keys) to .pbmap; returns the output path."""
+    with open(src) as f:
+        mp = json.load(f)
+    dst = dst or os.path.splitext(src)[0] + EXTENSION
+    meta = {k: v for k, v in mp.items() if k not in ("width", "height", "tiles", "spawns")}
+    save_map(dst, mp["tiles"], mp.get("spawns", ()), meta)
+    return dst
+
+
+def read_map(path: str) -> Dict[str, object]:
+    """Load a map by extension (.json or .pbmap) into the dict TileMap expects."""
+    if path.endswith(EXTENSION):
+        return load_map(path, writable=True).to_dict()
+    with open(path) as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    ap = argparse.ArgumentParser(description="Convert JSON maps to the binary .pbmap format")
+    ap.add_argument("maps", nargs="+", help="JSON map files")
+    ap.add_argument("-o", "--out", help="output path (single input only)")
+    args = ap.parse_args()
+    if args.out and len(args.maps) > 1:
+        ap.error("--out needs exactly one input map")
+    for src in args.maps:
+        t0 = time.perf_counter()
+        dst = convert_json(src, args.out)
+        t1 = time.perf_counter()
+        load_map(dst)
+        t2 = time.perf_counter()
+        print(f"{src} ({os.path.getsize(src)} B) -> {dst} ({os.path.getsize(dst)} B)  "
+              f"convert {1000 * (t1 - t0):.1f} ms, open {1000 * (t2 - t1):.2f} ms")
@@ -0,0 +1,244 @@
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+from core import settings as S
+from .map import WALL
+
+FIELD_RADIUS = 48        # a field covers the target's cell +- this many tiles
+FIELD_BUDGET_MS = 2.0    # wavefront work allowed per tick across all pending fields
+FIELD_BUDGET_STEPS = 48  # the same as wavefront steps (~2 ms), for runs that must repeat exactly
+MAX_FIELDS = 32          # least recently used fields beyond this are dropped
+
+# 8 neighbours as (dx, dy); diagonals are only taken when both sides are open
+_NEIGHBOURS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+class FlowField:
+    """
+    Tile distances to one target cell inside a window around it, filled by a
+    breadth-first wavefront one ring per step(). Distances of reached cells are
+    final, so a field is already usable near its target while it is still
+    expanding; `done` once the wavefront runs out.
+    """
+    __slots__ = ("target", "x0", "y0", "open", "dist", "front", "d", "done", "_pad")
+
+    def __init__(self, target, x0, y0, passable):
+        self.target = target
+        self.x0, self.y0 = x0, y0
+        self.open = passable
+        self.dist = np.full(passable.shape, -1, dtype=np.int32)
+        tx, ty = target[0] - x0, target[1] - y0
+        self.front = np.zeros(passable.shape, dtype=bool)
+        self.d = 0
+        self._pad = None
+        self.done = not passable[ty, tx]
+        if not self.done:
+            self.dist[ty, tx] = 0
+            self.front[ty, tx] = True
+
+    def step(self):
+        """Expand the wavefront by one ring (4-connected)."""
+        f = self.front
+        grown = np.zeros_like(f)
+        grown[1:, :] |= f[:-1, :]
+        grown[:-1, :] |= f[1:, :]
+        grown[:, 1:] |= f[:, :-1]
+        grown[:, :-1] |= f[:, 1:]
+        grown &= self.open & (self.dist < 0)
+        self.d += 1
+        self.dist[grown] = self.d
+        self.front = grown
+        self._pad = None
+        if not grown.any():
+            self.done = True
+
+    def distance(self, x, y):
+        """Steps from tile (x, y) to the target, or None if not (yet) reached."""
+        lx, ly = x - self.x0, y - self.y0
+        h, w = self.dist.shape
+        if 0 <= lx < w and 0 <= ly < h and self.dist[ly, lx] >= 0:
+            return int(self.dist[ly, lx])
+        return None
+
+    def next_cell(self, x, y):
+        """Neighbour of tile (x, y) that leads downhill to the target, or None."""
+        here = self.distance(x, y)
+        if here is None or here == 0:
+            return None
+        best, best_d = None, here
+        for dx, dy in _NEIGHBOURS:
+            nd = self.distance(x + dx, y + dy)
+            if nd is None or nd >= best_d:
+                continue
+            if dx and dy and (self.distance(x + dx, y) is None or self.distance(x, y + dy) is None):
+                continue   # no corner cutting past walls
+            best, best_d = (x + dx, y + dy), nd
+        return best
+
+    def padded(self):
+        """dist with a -1 border, so neighbour lookups never leave the array (cached until step())."""
+        if self._pad is None:
+            self._pad = np.pad(self.dist, 1, constant_values=-1)
+        return self._pad
+
+
+class FlowFieldService:
+    """
+    Shared flow fields on the tile grid, one per target cell: every bot heading
+    to the same cell (a chased player, an objective, a patrol point) reads the
+    same field. A target moving within its cell reuses the field; a new cell
+    requests a new one. Pending fields advance in tick() within budget_ms of
+    wall time, or within budget_steps wavefront steps when `fixed_steps` is set
+    (headless matches, whose outcome must not depend on machine speed); either
+    budget left as None is read from the module setting at each tick. A bot
+    whose cell the field has not reached yet gets no direction (callers fall
+    back to steering straight at the target). Walls are read per field window
+    through the map (tile edits included), and set_tile drops the fields whose
+    window holds the edited tile.
+    """
+
+    def __init__(self, tilemap, radius=FIELD_RADIUS, budget_ms=None, max_fields=MAX_FIELDS,
+                 fixed_steps=False, budget_steps=None):
+        self.map = tilemap
+        self.radius = radius
+        self.budget_ms = budget_ms
+        self.fixed_steps = fixed_steps
+        self.budget_steps = budget_steps
+        self.max_fields = max_fields
+        self.fields = OrderedDict()   # target cell -> FlowField, least recently used first
+        self.steps = 0
+        self.built = 0
+        tilemap.on_edit.append(self.invalidate)
+
+    def invalidate(self, x=None, y=None, value=None):
+        """Drop the fields whose window holds tile (x, y) (called by set_tile), or every field."""
+        if x is None:
+            self.fields.clear()
+            return
+        stale = [key for key, f in self.fields.items()
+                 if 0 <= x - f.x0 < f.dist.shape[1] and 0 <= y - f.y0 < f.dist.shape[0]]
+        for key in stale:
+            del self.fields[key]
+
+    def cell(self, pos):
+        t = S.TILE_SIZE
+        return int(pos[0] // t), int(pos[1] // t)
+
+    def field(self, target_pos):
+        """Field toward the cell containing target_pos (created pending if new), or None off-map."""
+        key = self.cell(target_pos)
+        f = self.fields.get(key)
+        if f is not None:
+            self.fields.move_to_end(key)
+            return f
+        tiles = self.map.tiles
+        h = len(tiles)
+        w = len(tiles[0]) if h else 0
+        tx, ty = key
+        if not (0 <= tx < w and 0 <= ty < h):
+            return None
+        r = self.radius
+        x0, y0 = max(0, tx - r), max(0, ty - r)
+        x1, y1 = min(w, tx + r + 1), min(h, ty + r + 1)
+        f = self.fields[key] = FlowField(key, x0, y0, self.map.window(x0, y0, x1, y1) != WALL)
+        self.built += 1
+        while len(self.fields) > self.max_fields:
+            self.fields.popitem(last=False)
+        return f
+
+    def steer(self, pos, target_pos):
+        """Unit direction from pos along the shared field toward target_pos, or None."""
+        f = self.field(target_pos)
+        if f is None:
+            return None
+        nxt = f.next_cell(*self.cell(pos))
+        if nxt is None:
+            return None
+        t = S.TILE_SIZE
+        d = pygame.Vector2((nxt[0] + 0.5) * t - pos[0], (nxt[1] + 0.5) * t - pos[1])
+        return d.normalize() if d.length_squared() > 1e-6 else None
+
+    def steer_many(self, pos, goals):
+        """
+        steer() for many pairs at once: (n, 2) pixel arrays in, (n, 2) unit
+        directions out, NaN rows where steer() gives None. The fields of all
+        goal cells are laid end to end in one table, so the downhill step for
+        every pair is a handful of array lookups whatever the number of fields.
+        """
+        t = S.TILE_SIZE
+        pos = np.asarray(pos, dtype=np.float64).reshape(-1, 2)
+        goals = np.asarray(goals, dtype=np.float64).reshape(-1, 2)
+        out = np.full(pos.shape, np.nan)
+        if not len(pos):
+            return out
+        _, first, inv = np.unique(np.floor(goals / t).astype(np.int64), axis=0,
+                                  return_index=True, return_inverse=True)
+        inv = inv.reshape(-1)
+        k = len(first)
+        # per field: table offset, padded width/height, window origin (off-map goals get a dead slot)
+        meta = np.zeros((k, 5), dtype=np.int64)
+        flats, size = [np.full(1, -1, dtype=np.int32)], 1
+        for i, g in enumerate(first.tolist()):
+            f = self.field(goals[g])
+            if f is None:
+                continue
+            p = f.padded()
+            meta[i] = (size, p.shape[1], p.shape[0], f.x0, f.y0)
+            flats.append(p.ravel())
+            size += p.size
+        table = np.concatenate(flats)
+        off, w, h, x0, y0 = meta[inv].T
+
+        cells = np.floor(pos / t).astype(np.int64)
+        lx, ly = cells[:, 0] - x0 + 1, cells[:, 1] - y0 + 1
+        inside = (w > 0) & (lx >= 1) & (lx < w - 1) & (ly >= 1) & (ly < h - 1)
+        here = np.full(len(pos), -1, dtype=np.int32)
+        here[inside] = table[(off + ly * w + lx)[inside]]
+        live = np.flatnonzero(here > 0)
+        if not len(live):
+            return out
+        base = off[live] + ly[live] * w[live] + lx[live]
+        row = w[live]
+        best_d = here[live]
+        step = np.zeros((len(live), 2), dtype=np.int64)
+        ok = np.zeros(len(live), dtype=bool)
+        for dx, dy in _NEIGHBOURS:
+            nd = table[base + dy * row + dx]
+            better = (nd >= 0) & (nd < best_d)
+            if dx and dy:
+                # no corner cutting past walls
+                better &= (table[base + dx] >= 0) & (table[base + dy * row] >= 0)
+            step[better] = (dx, dy)
+            best_d[better] = nd[better]
+            ok |= better
+        d = (cells[live] + step + 0.5) * t - pos[live]
+        l2 = (d * d).sum(axis=1)
+        ok &= l2 > 1e-6
+        out[live[ok]] = d[ok] / np.sqrt(l2[ok])[:, None]
+        return out
+
+    def tick(self):
+        """Advance pending fields round-robin until the per-tick budget is spent."""
+        pending = [f for f in self.fields.values() if not f.done]
+        if not pending:
+            return
+        if self.fixed_steps:
+            limit = self.steps + (FIELD_BUDGET_STEPS if self.budget_steps is None else self.budget_steps)
+            spent = lambda: self.steps >= limit
+        else:
+            deadline = time.perf_counter() + (FIELD_BUDGET_MS if self.budget_ms is None else self.budget_ms) / 1000.0
+            spent = lambda: time.perf_counter() >= deadline
+        while pending:
+            for f in pending:
+                f.step()
+                self.steps += 1
+            pending = [f for f in pending if not f.done]
+            if spent():
+                break
+
+    def stats(self):
+        return {"fields": len(self.fields), "pending": sum(not f.done for f in self.fields.values()),
+                "built": self.built, "steps": self.steps}
@@ -1,8 +1,10 @@
-import pygame, math
-from core.config import BLUE, FIRE_COOLDOWN, HEIGHT, PLAYER_MAX_HP, PLAYER_SIZE, PLAYER_SPEED, RED, RED
+import pygame, math, itertools
+from core import settings as S
+from core.config import AMMO_CAPACITY, BLUE, FIRE_COOLDOWN, HEIGHT, PLAYER_MAX_HP, PLAYER_SIZE, PLAYER_SPEED, RED, RED
 from game.gun import PaintballGun
 from core.config import WIDTH
 from game.projectile import Paintball
+from core.spatial import solids_near
 
 class Player:
     def __init__(self, x, y, name, color, team_name):
@@ -26,19 +28,21 @@ class Player:
         dy *= PLAYER_SPEED * dt
 
         # Horizontal
+        before = self.rect.copy()
         self.rect.x += int(dx)
         if self.rect.left < 0: self.rect.left = 0
         if self.rect.right > WIDTH: self.rect.right = WIDTH
-        for ob in obstacles:
+        for ob in solids_near(obstacles, self.rect.union(before)):
             if self.rect.colliderect(ob):
                 if dx > 0: self.rect.right = ob.left
                 elif dx < 0: self.rect.left = ob.right
 
         # Vertical
+        before = self.rect.copy()
         self.rect.y += int(dy)
         if self.rect.top < 0: self.rect.top = 0
         if self.rect.bottom > HEIGHT: self.rect.bottom = HEIGHT
-        for ob in obstacles:
+        for ob in solids_near(obstacles, self.rect.union(before)):
             if self.rect.colliderect(ob):
                 if dy > 0: self.rect.bottom = ob.top
                 elif dy < 0: self.rect.top = ob.bottom
@@ -75,3 +79,92 @@ class Player:
         if pct < 1:
             pygame.draw.rect(surf, (40,40,44), (self.rect.x, self.rect.y-8, self.rect.w, 6), border_radius=3)
             pygame.draw.rect(surf, (90,230,140), (self.rect.x, self.rect.y-8, int(self.rect.w*pct), 6), border_radius=3)
+
+
+class ArenaPlayer:
+    """
+    Round player of the top-down arena (game/game.py), tuned by core.settings.
+    The human and the bots drive it through the same update(); `id` is unique
+    per process so events and pooled balls can name their owner.
+    """
+    _ids = itertools.count(1)
+
+    def __init__(self, pos, name, color=S.BLUE, team_name=None):
+        self.id = next(ArenaPlayer._ids)
+        self.name = name
+        self.color = color
+        self.team_name = team_name or name   # free-for-all unless a team is given
+        self.pos = pygame.Vector2(pos)
+        self.vel = pygame.Vector2(0, 0)
+        self.health = S.PLAYER_MAX_HEALTH
+        self.alive = True
+        self.invuln = S.INVINCIBLE_SPAWN_TIME
+        self.fire_cd = 0.0
+        self.max_ammo = AMMO_CAPACITY
+        self.ammo = self.max_ammo
+        self.reload_t = 0.0   # > 0 while reloading; bots start it by setting it
+
+    def radius(self):
+        return S.PLAYER_RADIUS
+
+    def _box(self):
+        r = S.PLAYER_RADIUS
+        return pygame.Rect(int(round(self.pos.x - r)), int(round(self.pos.y - r)), 2 * r, 2 * r)
+
+    def move(self, mv, dt, solids):
+        mv = pygame.Vector2(mv)
+        if mv.length_squared() > 1:
+            mv = mv.normalize()
+        self.vel = mv * S.PLAYER_SPEED
+        r = S.PLAYER_RADIUS
+        # one axis at a time, sliding along walls
+        for axis in (0, 1):
+            step = self.vel[axis] * dt
+            if not step: continue
+            before = self._box()
+            self.pos[axis] += step
+            box = self._box()
+            for ob in solids_near(solids, box.union(before)):
+                if box.colliderect(ob):
+                    lo, hi = (ob.left, ob.right) if axis == 0 else (ob.top, ob.bottom)
+                    self.pos[axis] = lo - r if step > 0 else hi + r
+                    box = self._box()
+
+    def update(self, dt, mv, aim_pos, shoot, reload, solids, projectiles):
+        self.fire_cd = max(0.0, self.fire_cd - dt)
+        if self.invuln > 0: self.invuln -= dt
+        if not self.alive:
+            self.vel.update(0, 0)
+            return
+        if self.reload_t > 0:
+            self.reload_t -= dt
+            if self.reload_t <= 0:
+                self.ammo = self.max_ammo
+        elif reload and self.ammo < self.max_ammo:
+            self.reload_t = S.RELOAD_TIME
+        self.move(mv, dt, solids)
+        if shoot and self.fire_cd <= 0 and self.ammo > 0 and self.reload_t <= 0:
+            aim = pygame.Vector2(aim_pos) - self.pos
+            if aim.length_squared() < 1e-9:
+                aim = self.vel if self.vel.length_squared() > 0 else pygame.Vector2(1, 0)
+            self.fire_cd = S.PLAYER_FIRE_COOLDOWN
+            self.ammo -= 1
+            projectiles.spawn(self.pos, aim.normalize(), self, self.team_name, self.color)
+
+    def hit(self, damage, owner_id=None):
+        """Apply damage (owner_id is the shooter's id); returns the damage taken, 0 while down or invulnerable."""
+        if not self.alive or self.invuln > 0: return 0
+        self.health -= damage
+        if self.health <= 0:
+            self.alive = False
+        return damage
+
+    def draw(self, surf):
+        if not self.alive: return
+        c = (int(self.pos.x), int(self.pos.y))
+        pygame.draw.circle(surf, self.color, c, S.PLAYER_RADIUS)
+        pct = max(0, self.health) / S.PLAYER_MAX_HEALTH
+        if pct < 1:
+            r = S.PLAYER_RADIUS
+            pygame.draw.rect(surf, (40,40,44), (c[0]-r, c[1]-r-10, 2*r, 6), border_radius=3)
+            pygame.draw.rect(surf, (90,230,140), (c[0]-r, c[1]-r-10, int(2*r*pct), 6), border_radius=3)
@@ -1,8 +1,11 @@
 import pygame, math
+from typing import NamedTuple
+import numpy as np
 from core.config import PAINTBALL_RADIUS, PAINTBALL_SPEED, PAINTBALL_SPEED
+from core.spatial import SpatialGrid, sweep_rect
 
 class Paintball:
-    __slots__ = ("pos","vel","owner","team_name","alive","life","color")
+    __slots__ = ("pos","vel","owner","team_name","alive","life","color","toi","struck")
     def __init__(self, pos, direction, owner, team_name, color, speed=PAINTBALL_SPEED):
         self.pos = pygame.Vector2(pos)
         self.vel = pygame.Vector2(direction) * speed
@@ -11,24 +14,311 @@ class Paintball:
         self.color = color
         self.alive = True
         self.life = 1.2  # seconds
+        self.toi = None     # fraction of the last step at which the ball stopped
+        self.struck = None  # entity hit, if any
 
-    def update(self, dt, bounds, obstacles):
-        if not self.alive: return
-        self.pos += self.vel * dt
-        self.life -= dt
-        if self.life <= 0: 
-            self.alive = False
-            return
-        # bounds
-        if not bounds.collidepoint(self.pos.x, self.pos.y):
-            self.alive = False
-            return
-        # obstacle hit
-        r = pygame.Rect(self.pos.x-PAINTBALL_RADIUS, self.pos.y-PAINTBALL_RADIUS, PAINTBALL_RADIUS*2, PAINTBALL_RADIUS*2)
-        for ob in obstacles:
-            if r.colliderect(ob):
-                self.alive = False
-                return
+    def update(self, dt, bounds, obstacles, targets=()):
+        # swept: walls/targets anywhere along this step's path count, not just its end
+        sweep_projectiles((self,), dt, obstacles, targets, bounds)
 
     def draw(self, surf):
         pygame.draw.circle(surf, self.color, (int(self.pos.x), int(self.pos.y)), PAINTBALL_RADIUS)
+
+
+class Impact(NamedTuple):
+    """A ball that stopped during sweep_projectiles."""
+    ball: Paintball
+    t: float       # fraction of the step travelled before contact (exact time of impact = t * dt)
+    x: float       # contact point (ball centre at t)
+    y: float
+    target: object  # entity struck; None for walls, leaving bounds or running out of life
+
+
+def _circle(ent):
+    # (x, y, radius) of a target: pos/radius() entities or rect-based ones
+    if hasattr(ent, "pos"):
+        r = ent.radius() if callable(getattr(ent, "radius", None)) else getattr(ent, "radius", 0)
+        return ent.pos[0], ent.pos[1], r
+    rect = ent.rect
+    return rect.centerx, rect.centery, max(rect.w, rect.h) * 0.5
+
+
+def _sweep_walls(solids, a, b, radius):
+    if isinstance(solids, SpatialGrid):
+        hit = solids.sweep(a, b, radius)
+        return hit[0] if hit else None
+    best = None
+    for r in solids:
+        t = sweep_rect(a, b, r, radius)
+        if t is not None and (best is None or t < best):
+            best = t
+    return best
+
+
+def _wall_candidates(solids, a, b, radius):
+    # balls whose swept box touches an occupied cell; all of them without an occupancy mask
+    occ = solids.occupancy() if isinstance(solids, SpatialGrid) else None
+    n = a.shape[0]
+    if occ is None:
+        return np.arange(n)
+    ox, oy, mask = occ
+    c = solids.cell
+    lo = np.floor((np.minimum(a, b) - radius) / c).astype(np.intp)
+    hi = np.floor((np.maximum(a, b) + radius) / c).astype(np.intp)
+    small = np.all(hi - lo <= 1, axis=1)
+    h, w = mask.shape
+    near = np.zeros(n, dtype=bool)
+    for cx, cy in ((lo[:, 0], lo[:, 1]), (hi[:, 0], lo[:, 1]), (lo[:, 0], hi[:, 1]), (hi[:, 0], hi[:, 1])):
+        mx, my = cx - ox, cy - oy
+        inside = (mx >= 0) & (mx < w) & (my >= 0) & (my < h)
+        near |= inside & mask[np.where(inside, my, 0), np.where(inside, mx, 0)]
+    return np.nonzero(near | ~small)[0]
+
+
+def _resolve(a, d, t_stop, skip, solids, targets, bounds, radius):
+    """
+    Shared core of sweep_projectiles and ProjectilePool.update. a/d: (n, 2) start
+    and step motion; t_stop: (n,) step fraction at which each ball expires;
+    skip: (n, m) pairs not to test (shooter vs own ball). Returns (t, who, hit):
+    stop fraction, index of the target struck (-1 for none) and whether
+    something (target, wall, bounds) stopped the ball.
+    """
+    n = a.shape[0]
+    t_stop = t_stop.copy()
+    who = np.full(n, -1, dtype=np.intp)
+    if targets:
+        circles = np.array([_circle(tg) for tg in targets], dtype=np.float64)
+        c, rr = circles[:, :2], circles[:, 2] + radius
+        rel = a[:, None, :] - c[None, :, :]                         # (n, m, 2)
+        qa = np.einsum("nk,nk->n", d, d)[:, None]
+        qb = 2.0 * np.einsum("nk,nmk->nm", d, rel)
+        qc = np.einsum("nmk,nmk->nm", rel, rel) - rr[None, :] ** 2
+        disc = qb * qb - 4.0 * qa * qc
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(qc <= 0.0, 0.0, (-qb - np.sqrt(disc)) / (2.0 * qa))
+        ok = (disc >= 0.0) & (t >= 0.0) & (t <= t_stop[:, None]) & ~skip
+        t = np.where(ok, t, np.inf)
+        first = np.argmin(t, axis=1)
+        t_first = t[np.arange(n), first]
+        struck = np.isfinite(t_first)
+        t_stop = np.where(struck, t_first, t_stop)
+        who = np.where(struck, first, -1)
+    hit = who >= 0
+
+    for i in _wall_candidates(solids, a, a + d * t_stop[:, None], radius):
+        ts = float(t_stop[i])
+        if ts > 0.0:
+            tw = _sweep_walls(solids, a[i], a[i] + d[i] * ts, radius)
+            if tw is not None:
+                t_stop[i], who[i], hit[i] = tw * ts, -1, True
+
+    if bounds is not None:
+        t_out = np.ones(n)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for k, lo, hi in ((0, bounds.left, bounds.right), (1, bounds.top, bounds.bottom)):
+                v = d[:, k]
+                t_out = np.minimum(t_out, np.where(v > 0, (hi - a[:, k]) / v, np.where(v < 0, (lo - a[:, k]) / v, 1.0)))
+        t_out = np.maximum(t_out, 0.0)
+        out = t_out < t_stop
+        t_stop = np.where(out, t_out, t_stop)
+        who = np.where(out, -1, who)
+        hit |= out
+    return t_stop, who, hit
+
+
+def sweep_projectiles(balls, dt, solids, targets=(), bounds=None, radius=PAINTBALL_RADIUS):
+    """
+    Advance every live ball by one step with continuous collision, resolved in
+    one pass: each ball's path this step is swept against target circles (all
+    balls x targets at once in NumPy, the shooter skipped) and against solids
+    (SpatialGrid sweep, or a scan of a plain rect list) up to the nearest target
+    contact. Balls that hit, leave `bounds` or run out of life stop at that
+    point; returns an Impact for each of them with its exact time of impact.
+    """
+    live = [b for b in balls if b.alive]
+    if not live or dt <= 0:
+        return []
+    a = np.array([(b.pos.x, b.pos.y) for b in live], dtype=np.float64)
+    d = np.array([(b.vel.x, b.vel.y) for b in live], dtype=np.float64) * dt
+    life = np.array([b.life for b in live])
+    targets = [tg for tg in targets if getattr(tg, "alive", True)]
+    skip = np.array([[tg is b.owner for tg in targets] for b in live], dtype=bool).reshape(len(live), len(targets))
+    t, who, hit = _resolve(a, d, np.clip(life / dt, 0.0, 1.0), skip, solids, targets, bounds, radius)
+
+    impacts = []
+    for i, b in enumerate(live):
+        ts = float(t[i])
+        b.pos.update(a[i, 0] + d[i, 0] * ts, a[i, 1] + d[i, 1] * ts)
+        b.life -= dt
+        if hit[i] or b.life <= 0:
+            struck = targets[who[i]] if who[i] >= 0 else None
+            b.alive = False
+            b.toi = ts
+            b.struck = struck
+            impacts.append(Impact(b, ts, b.pos.x, b.pos.y, struck))
+    return impacts
+
+
+POOL_CAPACITY = 4096
+
+
+class PoolImpacts(NamedTuple):
+    """Balls a ProjectilePool step retired, as parallel arrays."""
+    slot: np.ndarray     # pool slot (already freed)
+    t: np.ndarray        # fraction of the step travelled before stopping
+    x: np.ndarray        # stop point
+    y: np.ndarray
+    owner: list          # owner objects
+    target: list         # entity struck or None
+
+
+class BallView:
+    """Paintball-like handle on one pool slot, so draw/inspection code keeps working."""
+    __slots__ = ("pool", "slot")
+
+    def __init__(self, pool, slot):
+        self.pool, self.slot = pool, slot
+
+    @property
+    def pos(self):
+        return pygame.Vector2(*self.pool.pos[self.slot])
+
+    @property
+    def vel(self):
+        return pygame.Vector2(*self.pool.vel[self.slot])
+
+    @property
+    def life(self):
+        return float(self.pool.life[self.slot])
+
+    @property
+    def alive(self):
+        return bool(self.pool.alive[self.slot])
+
+    @property
+    def owner(self):
+        return self.pool.owners[self.pool.owner[self.slot]]
+
+    @property
+    def team_name(self):
+        return self.pool.teams[self.pool.team[self.slot]]
+
+    @property
+    def color(self):
+        return tuple(int(v) for v in self.pool.color[self.slot])
+
+    def draw(self, surf):
+        x, y = self.pool.pos[self.slot]
+        pygame.draw.circle(surf, self.color, (int(x), int(y)), PAINTBALL_RADIUS)
+
+
+class ProjectilePool:
+    """
+    Preallocated structure-of-arrays store for paintballs: position, velocity,
+    life, owner, team and color live in NumPy arrays and a step moves every live
+    ball at once (swept collision via the same resolver as sweep_projectiles,
+    lifetime expiry, bounds culling). Retired slots go back on a free stack and
+    are reused by the next spawn; the arrays double only when every slot is live.
+
+    Owners and team names are interned to small ints. append(paintball) ingests
+    a Paintball so producers that build them keep working, and iterating yields
+    BallView handles for existing draw code (draw() is the fast path).
+    """
+
+    def __init__(self, capacity=POOL_CAPACITY, radius=PAINTBALL_RADIUS):
+        self.radius = radius
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.life = np.zeros(capacity)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.owner = np.zeros(capacity, dtype=np.int32)
+        self.team = np.zeros(capacity, dtype=np.int16)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.free = list(range(capacity - 1, -1, -1))   # stack; pops lowest slot first
+        self.owners, self._owner_ids = [], {}
+        self.teams, self._team_ids = [], {}
+        self.spawned = 0
+        self.grown = 0
+
+    @property
+    def capacity(self):
+        return self.life.shape[0]
+
+    def __len__(self):
+        return self.capacity - len(self.free)
+
+    def __iter__(self):
+        for s in np.nonzero(self.alive)[0]:
+            yield BallView(self, int(s))
+
+    def _intern(self, value, table, ids):
+        key = id(value) if value is not None and not isinstance(value, (str, int)) else value
+        i = ids.get(key)
+        if i is None:
+            i = ids[key] = len(table)
+            table.append(value)
+        return i
+
+    def _grow(self):
+        old = self.capacity
+        for name in ("pos", "vel", "life", "alive", "owner", "team", "color"):
+            arr = getattr(self, name)
+            setattr(self, name, np.concatenate([arr, np.zeros_like(arr)]))
+        self.free.extend(range(2 * old - 1, old - 1, -1))
+        self.grown += 1
+
+    def spawn(self, pos, direction, owner, team_name, color, speed=PAINTBALL_SPEED, life=1.2):
+        """Fire one ball; returns its slot."""
+        if not self.free:
+            self._grow()
+        s = self.free.pop()
+        self.pos[s] = pos[0], pos[1]
+        self.vel[s] = direction[0] * speed, direction[1] * speed
+        self.life[s] = life
+        self.alive[s] = True
+        self.owner[s] = self._intern(owner, self.owners, self._owner_ids)
+        self.team[s] = self._intern(team_name, self.teams, self._team_ids)
+        self.color[s] = color[:3]
+        self.spawned += 1
+        return s
+
+    def append(self, ball):
+        """Adopt a Paintball built elsewhere (list-style producers)."""
+        s = self.spawn(ball.pos, (ball.vel.x, ball.vel.y), ball.owner, ball.team_name, ball.color,
+                       speed=1.0, life=ball.life)
+        return s
+
+    def step(self, dt, solids=(), targets=(), bounds=None):
+        """Move every live ball by dt; retire and return those that stopped (PoolImpacts)."""
+        live = np.nonzero(self.alive)[0]
+        empty = PoolImpacts(live[:0], np.zeros(0), np.zeros(0), np.zeros(0), [], [])
+        if live.size == 0 or dt <= 0:
+            return empty
+        a = self.pos[live]
+        d = self.vel[live] * dt
+        targets = [tg for tg in targets if getattr(tg, "alive", True)]
+        tgt_owner = np.array([self._owner_ids.get(id(tg), -1) for tg in targets], dtype=np.int32)
+        skip = self.owner[live][:, None] == tgt_owner[None, :]
+        t, who, hit = _resolve(a, d, np.clip(self.life[live] / dt, 0.0, 1.0), skip,
+                               solids, targets, bounds, self.radius)
+
+        self.pos[live] = a + d * t[:, None]
+        self.life[live] -= dt
+        done = hit | (self.life[live] <= 0)
+        if not done.any():
+            return empty
+        gone = live[done]
+        self.alive[gone] = False
+        self.free.extend(gone[::-1].tolist())
+        return PoolImpacts(gone, t[done], self.pos[gone, 0].copy(), self.pos[gone, 1].copy(),
+                           [self.owners[o] for o in self.owner[gone]],
+                           [targets[w] if w >= 0 else None for w in who[done]])
+
+    def clear(self):
+        self.alive[:] = False
+        self.free = list(range(self.capacity - 1, -1, -1))
+
+    def draw(self, surf):
+        r = int(self.radius)
+        for s in np.nonzero(self.alive)[0]:
+            pygame.draw.circle(surf, tuple(self.color[s].tolist()), (int(self.pos[s, 0]), int(self.pos[s, 1])), r)
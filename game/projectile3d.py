@@ -1,22 +1,102 @@
 # game/projectile3d.py
+POOL_SIZE = 128  # paintball nodes created up front by PaintballPool3D
+
+
+class PaintballPool3D:
+    """
+    Reusable paintball nodes for the Panda3D mode. The model is loaded once and
+    `size` nodes are pre-created as instances of it (shared geometry), stashed
+    until fired. Finished balls are stashed again and go back on the free list
+    instead of being removed, so sustained fire allocates nothing. When every
+    node is out, the pool grows by one node (grow=True) or refuses the shot.
+    """
+
+    def __init__(self, parent, loader, size=POOL_SIZE, model="models/smiley", scale=0.12, grow=True):
+        self.parent = parent
+        self.model = loader.loadModel(model)
+        self.model.set_scale(scale)
+        self.grow = grow
+        self.free = []
+        self.created = 0
+        self.in_use = 0
+        self.peak = 0
+        self.reuses = 0
+        self.grown = 0
+        self._fresh = 0  # never-used nodes at the bottom of self.free
+        for _ in range(size):
+            self.free.append(self._make())
+        self._fresh = len(self.free)
+
+    def _make(self):
+        node = self.parent.attach_new_node("paintball")
+        self.model.instance_to(node)
+        node.stash()  # out of the scene graph traversal until fired
+        self.created += 1
+        return node
+
+    def acquire(self, origin, color):
+        """A live node at origin tinted color, or None when exhausted and not growing."""
+        if self.free:
+            if len(self.free) > self._fresh:
+                self.reuses += 1
+            else:
+                self._fresh -= 1
+            node = self.free.pop()
+        elif self.grow:
+            node = self._make()
+            self.grown += 1
+        else:
+            return None
+        node.unstash()
+        node.set_pos(origin)
+        node.set_color(*color, 1)  # priority 1 overrides the model's own colors
+        self.in_use += 1
+        self.peak = max(self.peak, self.in_use)
+        return node
+
+    def release(self, node):
+        node.stash()
+        self.free.append(node)
+        self.in_use -= 1
+
+    def stats(self):
+        return {"size": self.created, "in_use": self.in_use, "peak": self.peak,
+                "reuses": self.reuses, "grown": self.grown}
+
+
 class Paintball3D:
-    def __init__(self, parent, origin, direction, speed=40.0, ttl=2.0, color=(0.3,0.9,0.4,1)):
-        self.node = parent.attach_new_node("paintball")
-        self.model = loader.loadModel("models/smiley")
-        self.model.set_scale(0.12)
-        self.model.set_color(*color)
-        self.model.reparent_to(self.node)
-        self.node.set_pos(origin)
+    def __init__(self, parent, origin, direction, speed=40.0, ttl=2.0, color=(0.3,0.9,0.4,1), pool=None):
+        self.pool = pool
+        if pool is not None:
+            self.node = pool.acquire(origin, color)
+        else:
+            self.node = parent.attach_new_node("paintball")
+            self.model = loader.loadModel("models/smiley")
+            self.model.set_scale(0.12)
+            self.model.set_color(*color)
+            self.model.reparent_to(self.node)
+            self.node.set_pos(origin)
         self.dir = direction.normalized()
+        self.step = self.dir * 0.0  # displacement of the last update (swept by game/collision3d.py)
         self.speed = speed
         self.ttl = ttl
-        self.alive = True
+        self.alive = self.node is not None
+
+    def kill(self):
+        """Stop the ball: back to the pool, or removed when unpooled."""
+        if not self.alive: return
+        self.alive = False
+        if self.pool is not None:
+            self.pool.release(self.node)
+        else:
+            self.node.remove_node()
 
     def update(self, dt):
         if not self.alive: return False
         self.ttl -= dt
         if self.ttl <= 0:
-            self.node.remove_node()
+            self.kill()
             return False
-        self.node.set_pos(self.node.get_pos() + self.dir * (self.speed * dt))
+        self.step = self.dir * (self.speed * dt)
+        self.node.set_pos(self.node.get_pos() + self.step)
         return True
@@ -0,0 +1,242 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # stdout carries the JSON report
+
+import importlib
+import json
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pygame
+
+from core import settings as S
+from .game import Game
+from .mapfile import read_map
+
+# --------------------------------------------------------------------------------------
+# Headless AI-vs-AI matches for balance runs (game/game.py without display or clock)
+# --------------------------------------------------------------------------------------
+DEFAULT_MAP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "maps", "basic_map.json")
+SIM_DT = 1.0 / 60.0      # fixed simulation step
+ROUND_TIME = 120.0       # simulated seconds before a match times out
+BOTS = 4
+PERCENTILES = (50, 90)
+
+_maps: Dict[str, dict] = {}   # per-process map cache
+
+
+def _load(path: str) -> dict:
+    if path not in _maps:
+        _maps[path] = read_map(path)
+    return _maps[path]
+
+
+def _target(key: str):
+    """(module, attribute) an override key names: bare names live in core.settings."""
+    if "." not in key:
+        return S, key
+    mod, name = key.rsplit(".", 1)
+    return importlib.import_module(mod), name
+
+
+def apply_overrides(overrides: Optional[Dict[str, object]]) -> Dict[str, object]:
+    """
+    Set tuning values for the next match(es); returns the previous values for
+    restore_overrides(). "BOT_SIGHT_RANGE" sets core.settings.BOT_SIGHT_RANGE,
+    "game.game.SPLASH_DAMAGE" any module attribute. Only code that reads the
+    attribute at use time sees the change (not names imported by value).
+    """
+    previous = {}
+    for key, value in (overrides or {}).items():
+        mod, name = _target(key)
+        if not hasattr(mod, name):
+            raise KeyError(f"unknown tuning value {key!r}")
+        previous[key] = getattr(mod, name)
+        setattr(mod, name, value)
+    return previous
+
+
+def restore_overrides(previous: Dict[str, object]) -> None:
+    for key, value in previous.items():
+        mod, name = _target(key)
+        setattr(mod, name, value)
+
+
+def run_match(
+    seed: int,
+    map_path: str = DEFAULT_MAP,
+    bots: int = BOTS,
+    dt: float = SIM_DT,
+    round_time: float = ROUND_TIME,
+    overrides: Optional[Dict[str, object]] = None,
+) -> Dict[str, object]:
+    """
+    One bot-only free-for-all driven at a fixed dt with seeded RNG and no
+    drawing, until one bot is left or the round times out. Same seed, map and
+    overrides give the same match.
+    """
+    previous = apply_overrides(overrides)
+    try:
+        random.seed(seed)
+        np.random.seed(seed % 2 ** 32)
+        screen = pygame.Surface((S.SCREEN_WIDTH, S.SCREEN_HEIGHT))
+        game = Game(screen, _load(map_path), bot_count=bots, human=False)
+        game.round_time = round_time
+        game.events = []
+        t0 = time.perf_counter()
+        ticks = 0
+        while game.round_time > 0 and sum(pl.alive for pl in game.players) > 1:
+            game.update(dt)
+            ticks += 1
+        wall_ms = (time.perf_counter() - t0) * 1000.0
+    finally:
+        restore_overrides(previous)
+
+    names = {pl.id: pl.name for pl in game.players}
+    kills = {name: 0 for name in names.values()}
+    damage = {name: 0 for name in names.values()}
+    first_hit, ttk = {}, []
+    for kind, t, owner, victim, dmg in game.events:
+        first_hit.setdefault(victim, t)
+        damage[names[owner]] = damage.get(names[owner], 0) + dmg
+        if kind == "kill":
+            kills[names[owner]] = kills.get(names[owner], 0) + 1
+            ttk.append(round(t - first_hit[victim], 4))
+    alive = [pl.name for pl in game.players if pl.alive]
+    return {
+        "seed": seed,
+        "ticks": ticks,
+        "sim_time": round(game.time, 4),
+        "wall_ms": round(wall_ms, 2),
+        "winner": alive[0] if len(alive) == 1 else None,
+        "timeout": len(alive) > 1,
+        "kills": kills,
+        "damage": damage,
+        "ttk": ttk,
+        "overrides": dict(overrides or {}),
+    }
+
+
+def _match_job(args):
+    return run_match(*args[:5], overrides=args[5])
+
+
+def simulate(
+    matches: int,
+    workers: Optional[int] = None,
+    seed: int = 0,
+    map_path: str = DEFAULT_MAP,
+    bots: int = BOTS,
+    dt: float = SIM_DT,
+    round_time: float = ROUND_TIME,
+    overrides: Optional[Dict[str, object]] = None,
+) -> Iterator[Dict[str, object]]:
+    """
+    Run matches seed, seed+1, ... across a process pool, yielding each result
+    as soon as it finishes (completion order, not seed order). workers=1 runs
+    in this process.
+    """
+    jobs = [(seed + i, map_path, bots, dt, round_time, overrides) for i in range(matches)]
+    workers = max(1, workers or os.cpu_count() or 1)
+    if workers == 1:
+        for job in jobs:
+            yield _match_job(job)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for fut in as_completed([pool.submit(_match_job, job) for job in jobs]):
+            yield fut.result()
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"n": 0}
+    a = np.asarray(values, dtype=np.float64)
+    out = {"n": int(a.size), "mean": round(float(a.mean()), 4)}
+    for p in PERCENTILES:
+        out[f"p{p}"] = round(float(np.percentile(a, p)), 4)
+    return out
+
+
+def aggregate(results: Iterable[Dict[str, object]], wall_s: Optional[float] = None) -> Dict[str, object]:
+    """Fold per-match results into one report: win rates, kills, time-to-kill, throughput."""
+    results = list(results)
+    n = len(results)
+    wins, kills = {}, {}
+    for r in results:
+        if r["winner"] is not None:
+            wins[r["winner"]] = wins.get(r["winner"], 0) + 1
+        for name, k in r["kills"].items():
+            kills[name] = kills.get(name, 0) + k
+    report = {
+        "matches": n,
+        "timeouts": sum(1 for r in results if r["timeout"]),
+        "win_rate": {k: round(v / n, 4) for k, v in sorted(wins.items())} if n else {},
+        "kills_per_match": {k: round(v / n, 4) for k, v in sorted(kills.items())} if n else {},
+        "match_time": _summary([r["sim_time"] for r in results]),
+        "ttk": _summary([t for r in results for t in r["ttk"]]),
+        "match_wall_ms": _summary([r["wall_ms"] for r in results]),
+        "overrides": results[0]["overrides"] if results else {},
+    }
+    if wall_s:
+        report["wall_s"] = round(wall_s, 2)
+        report["matches_per_min"] = round(n * 60.0 / wall_s, 1)
+    return report
+
+
+def _parse_set(items: List[str]) -> Dict[str, object]:
+    out = {}
+    for item in items:
+        key, sep, raw = item.partition("=")
+        if not sep:
+            raise ValueError(f"--set expects KEY=VALUE, got {item!r}")
+        try:
+            out[key] = json.loads(raw)
+        except ValueError:
+            out[key] = raw
+    return out
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Headless bot-only matches for balance runs")
+    ap.add_argument("--matches", type=int, default=100)
+    ap.add_argument("--workers", type=int, default=0, help="processes (0 = one per CPU)")
+    ap.add_argument("--seed", type=int, default=0, help="first match seed; match i uses seed + i")
+    ap.add_argument("--map", default=DEFAULT_MAP, help="JSON or .pbmap map")
+    ap.add_argument("--bots", type=int, default=BOTS)
+    ap.add_argument("--dt", type=float, default=SIM_DT)
+    ap.add_argument("--round-time", type=float, default=ROUND_TIME)
+    ap.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                    help="tuning override, e.g. BOT_FIRE_COOLDOWN=0.3 or game.game.SPLASH_DAMAGE=40")
+    ap.add_argument("--out", help="stream per-match results here as JSON lines")
+    ap.add_argument("--report", help="write the aggregated report here (JSON)")
+    args = ap.parse_args()
+
+    overrides = _parse_set(args.set)
+    t0 = time.perf_counter()
+    results = []
+    stream = open(args.out, "w") if args.out else None
+    try:
+        for r in simulate(args.matches, args.workers or None, args.seed, args.map, args.bots,
+                          args.dt, args.round_time, overrides):
+            results.append(r)
+            if stream:
+                stream.write(json.dumps(r) + "\n")
+                stream.flush()
+            print(f"[{len(results)}/{args.matches}] seed {r['seed']}: winner {r['winner']}  "
+                  f"{r['sim_time']:.1f} s sim in {r['wall_ms']:.0f} ms", file=sys.stderr)
+    finally:
+        if stream:
+            stream.close()
+    report = aggregate(results, time.perf_counter() - t0)
+    text = json.dumps(report, indent=2)
+    if args.report:
+        with open(args.report, "w") as f:
+            f.write(text + "\n")
+    print(text)
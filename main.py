@@ -11,7 +11,8 @@ from core.team_communication import TeamCommunication
 from game.team import Team
 from game.game_modes import GameModes, GameMode
 from game.entities3d import Player3D, Enemy3D
-from game.projectile3d import Paintball3D
+from game.projectile3d import Paintball3D, PaintballPool3D, POOL_SIZE
+from game.collision3d import HitDetector3D
 
 WORLD_SIZE = 80.0  # half-extent of square arena
 
@@ -39,7 +40,8 @@ class EpicPaintball3D(ShowBase):
         self.scoring.add_team(self.team_blue)
         self.scoring.add_team(self.team_red)
 
-        # Scene
+        # Scene (hit detection runs in Panda3D's collision traverser)
+        self.hits = HitDetector3D(self.render)
         self._build_arena()
         self._setup_lights()
 
@@ -62,10 +64,12 @@ class EpicPaintball3D(ShowBase):
             ey = random.uniform(-WORLD_SIZE*0.6, WORLD_SIZE*0.6)
             bot = Enemy3D(f"Bot{i+1}", RED, self.team_red.name, base=self, pos=(ex, ey, 2.0))
             self.team_red.add_player(bot)
+            self.hits.add_target(bot, bot.team_name, radius=1.0)
             self.enemies.append(bot)
 
-        # Projectiles
+        # Projectiles (nodes come from a pool; the model is loaded once)
         self.projectiles = []
+        self.ball_pool = PaintballPool3D(self.render, self.loader, size=POOL_SIZE)
 
         # Input
         self.keys = {"w":False, "s":False, "a":False, "d":False}
@@ -94,6 +98,7 @@ class EpicPaintball3D(ShowBase):
         ground.set_hpr(0, -90, 0)
         ground.set_pos(0, 0, 0)
         ground.set_color(0.15, 0.17, 0.2, 1)
+        self.hits.add_ground()
 
         # perimeter walls
         def wall(a, b):
@@ -105,6 +110,7 @@ class EpicPaintball3D(ShowBase):
             w.set_pos(a[0], a[1], 0)
             w.set_two_sided(True)
             w.set_color(0.35, 0.37, 0.42, 1)
+            self.hits.add_wall(a, b, 4.0)
             return w
         s = WORLD_SIZE
         wall((-s,-s),( s,-s))
@@ -143,8 +149,11 @@ class EpicPaintball3D(ShowBase):
             self.player.consume_shot()
             origin = self.camera.get_pos(self.render)
             fwd = self.camera.get_quat(self.render).get_forward()
-            proj = Paintball3D(self.render, origin, fwd, speed=40.0, ttl=2.0, color=(0.3,0.9,0.4,1))
-            self.projectiles.append(proj)
+            proj = Paintball3D(self.render, origin, fwd, speed=40.0, ttl=2.0, color=(0.3,0.9,0.4,1),
+                               pool=self.ball_pool)
+            if proj.alive:
+                self.hits.add_ball(proj, self.player.team_name)
+                self.projectiles.append(proj)
 
     # ---------- Update ----------
     def _update(self, task: Task):
@@ -186,21 +195,18 @@ class EpicPaintball3D(ShowBase):
             if not bot.alive: continue
             bot.update(dt, target_pos=self.player.node.get_pos())
 
-        # Projectiles
-        alive = []
+        # Projectiles: move, then one traversal for bot and wall hits
+        moving = []
         for p in self.projectiles:
-            if p.update(dt):
-                # enemy hit check
-                for bot in self.enemies:
-                    if bot.alive and (bot.node.get_pos() - p.node.get_pos()).length() < 1.0:
-                        if bot.take_hit(50):
-                            self.comms.send("System", f"You splatted {bot.name}")
-                            self.modes.on_frag(self.player.team_name, self.scoring)
-                        p.alive = False
-                        p.node.remove_node()
-                        break
-                if p.alive: alive.append(p)
-        self.projectiles = alive
+            if p.update(dt): moving.append(p)
+            else: self.hits.drop(p)
+        for p, bot, _ in self.hits.resolve(moving):
+            if bot is not None and bot.take_hit(50):
+                self.comms.send("System", f"You splatted {bot.name}")
+                self.modes.on_frag(self.player.team_name, self.scoring)
+            p.kill()
+            self.hits.drop(p)
+        self.projectiles = [p for p in moving if p.alive]
 
         # Respawns
         for who in self.respawns.update():
@@ -8,8 +8,10 @@ from game.player import Player
 from game.enemy import Enemy
 from game.projectile import Paintball
 from game.game_modes import GameModes, GameMode
-from game.fps import render_first_person, hitscan, WALL_SIZE
+from game.fps import render_first_person, hitscan_entities, WALL_SIZE, FOV
+from game.fps_resolution import DynamicResolution
 from game.fps_map import MAP
+from game.ai_lod import ThinkScheduler
 
 def draw_text(surface, txt, pos, size=20, color=WHITE, center=False):
     font = pygame.font.SysFont("arial", size, bold=True)
@@ -57,7 +59,15 @@ def main():
         red.add_player(bot)
         enemies.append(bot)
 
+    # Bots far from the player or behind the camera think less often, within a frame budget
+    def in_view(bot):
+        bx, by = bot.center()
+        off = math.atan2(by - player.rect.centery, bx - player.rect.centerx) - player_angle
+        return abs((off + math.pi) % (2 * math.pi) - math.pi) <= FOV / 2 + 0.2
+    ai_lod = ThinkScheduler(lambda bot: bot.center(), in_view=in_view)
+
     projectiles = []  # left for compatibility
+    resolution = DynamicResolution(FPS, scale_render=True)
     last_time = time.time()
 
     # mouse sensitivity
@@ -83,15 +93,14 @@ def main():
                 # hitscan along player_angle
                 if player.gun.can_fire():
                     player.gun.consume_shot()
-                    hit, hx, hy, dist = hitscan(player.rect.centerx, player.rect.centery, player_angle, 1200, MAP)
-                    if hit:
-                        # If hitpoint overlaps an enemy, apply damage
-                        for bot in enemies:
-                            if bot.alive and pygame.Rect(bot.rect).inflate(-10,-10).collidepoint(hx, hy):
-                                died = bot.take_hit(50)
-                                if died:
-                                    comms.send("System", f"You splatted {bot.name}")
-                                    modes.on_frag(player.team_name, scoring)
+                    targets = [bot for bot in enemies if bot.alive]
+                    shot = hitscan_entities(player.rect.centerx, player.rect.centery, player_angle, 1200, MAP,
+                                            targets, shrink=10)
+                    if shot.entity is not None:
+                        died = shot.entity.take_hit(50)
+                        if died:
+                            comms.send("System", f"You splatted {shot.entity.name}")
+                            modes.on_frag(player.team_name, scoring)
 
         keys = pygame.key.get_pressed()
 
@@ -120,10 +129,15 @@ def main():
         if player.gun.ammo == 0 and player.gun.reload_t <= 0:
             player.gun.start_reload()
 
-        for bot in enemies:
-            if not bot.alive:
-                continue
-            _ = bot.update(dt, player.center(), [])  # obstacles ignored for FPS demo
+        # timers run and bots move every frame; only the decision (heading, shot) is rationed,
+        # so a bot between thinks keeps walking its last heading instead of jumping when it thinks
+        live = [bot for bot in enemies if bot.alive]
+        for bot in live:
+            bot.tick(dt)
+        ai_lod.run(dt, live, [player.center()],
+                   lambda bot, elapsed: ai_lod.remember(bot, bot.think(player.center())[0]))
+        for bot in live:
+            bot.step(ai_lod.between(bot, (0.0, 0.0)), dt, [])  # obstacles ignored for FPS demo
 
         # Respawns
         for p in respawns.update():
@@ -136,7 +150,8 @@ def main():
                                  random.randint(2, len(MAP)-3) * WALL_SIZE + WALL_SIZE//2)
 
         # Render first-person
-        render_first_person(screen, player.rect.centerx, player.rect.centery, player_angle, MAP, now)
+        render_first_person(screen, player.rect.centerx, player.rect.centery, player_angle, MAP, now,
+                            resolution=resolution)
 
         # HUD
         def hud(txt, pos, size=20, color=WHITE):
@@ -145,8 +160,10 @@ def main():
         hud(f"HP: {max(0, player.hp)}", (20, 44), 18, GREEN)
         ammo_txt = "RELOADING..." if player.gun.reload_t > 0 else f"Ammo: {player.gun.ammo}/{player.gun.capacity}"
         hud(ammo_txt, (20, 66), 18, YELLOW)
+        hud(f"Res: {int(resolution.scale * 100)}%", (WIDTH - 110, 16), 16, WHITE)
 
         pygame.display.flip()
+        resolution.record((time.time() - now) * 1000.0)  # work time, excluding the tick sleep
         clock.tick(FPS)
 
     pygame.mouse.set_visible(True)
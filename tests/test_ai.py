@@ -0,0 +1,80 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import random
+
+import numpy as np
+import pygame
+
+from core import settings as S
+from game import ai
+from game.game import Game
+from game.mapfile import read_map
+from game.sim import DEFAULT_MAP
+
+TICKS = 600
+BOTS = 6
+
+
+class _Draws:
+    """random stand-in whose draws depend on their arguments, not on call order (the batch draws in another)."""
+
+    def __init__(self):
+        self.salt = 0
+
+    def choice(self, seq):
+        key = getattr(seq[0], "id", 0)
+        return seq[(self.salt + key) % len(seq)]
+
+    def uniform(self, a, b):
+        return a + (b - a) * ((self.salt * 0.6180339887498949) % 1.0)
+
+
+def _snapshot(bot):
+    wp = None if bot.waypoint is None else pygame.Vector2(bot.waypoint)
+    return bot.state, bot.target, bot.fire_cd, wp, bot.repath_t, bot.p.reload_t
+
+
+def _restore(bot, snap):
+    bot.state, bot.target, bot.fire_cd, wp, bot.repath_t, bot.p.reload_t = snap
+    bot.waypoint = None if wp is None else pygame.Vector2(wp)
+
+
+def test_batch_matches_per_bot_controllers(monkeypatch):
+    draws = _Draws()
+    monkeypatch.setattr(ai, "random", draws)
+    random.seed(7)
+    rng = np.random.default_rng(7)
+    screen = pygame.Surface((S.SCREEN_WIDTH, S.SCREEN_HEIGHT))
+    game = Game(screen, read_map(DEFAULT_MAP), bot_count=BOTS, human=False)
+    checked = {"chase": 0, "hunt": 0, "patrol": 0, "shots": 0, "reloads": 0}
+
+    for _ in range(TICKS):
+        draws.salt = int(rng.integers(1 << 16))
+        for pl in game.players:
+            if rng.random() < 0.02:
+                pl.ammo = 0           # force reloads now and then
+        dts = rng.uniform(0.005, 0.2, len(game.bots))   # per-bot think gaps, as under ai_lod
+        before = [_snapshot(b) for b in game.bots]
+        game.visibility.next_tick()
+
+        single = [b.update(dt, game) for b, dt in zip(game.bots, dts)]
+        after = [_snapshot(b) for b in game.bots]
+        for b, snap in zip(game.bots, before):
+            _restore(b, snap)
+        batch = game.bot_ai.update(dts, game)
+
+        for b, (move, shoot), want in zip(game.bots, single, after):
+            got_move, got_shoot = batch[b.p.id]
+            assert got_shoot == shoot
+            assert (got_move - pygame.Vector2(move)).length() < 1e-9
+            assert _snapshot(b) == want
+            if b.p.alive:
+                checked[b.state] += 1
+            checked["shots"] += shoot
+            checked["reloads"] += b.p.reload_t == 1.2 and b.p.ammo <= 0
+        game.update(1 / 60)
+
+    # the run covered every branch the batch vectorizes
+    assert all(checked.values()), checked
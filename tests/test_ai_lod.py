@@ -0,0 +1,110 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import random
+
+import pygame
+import pytest
+
+from core import settings as S
+from game import ai_lod
+from game.ai_lod import FAR_RANGE, NEAR_RANGE, THINK_HZ, ThinkScheduler
+from game.game import Game
+from game.mapfile import read_map
+from game.sim import DEFAULT_MAP
+
+DT = 1 / 60
+
+
+class _Bot:
+    def __init__(self, pos, state="chase", seen=True):
+        self.pos, self.state, self.seen = pos, state, seen
+
+
+def _scheduler(**kwargs):
+    return ThinkScheduler(lambda b: b.pos, state=lambda b: b.state, in_view=lambda b: b.seen, **kwargs)
+
+
+def test_each_tier_thinks_at_its_rate():
+    bots = {
+        "near": _Bot((NEAR_RANGE - 100, 0)),
+        "mid": _Bot(((NEAR_RANGE + FAR_RANGE) / 2, 0), state="patrol"),
+        "far": _Bot((FAR_RANGE + 100, 0)),
+        "unseen": _Bot((NEAR_RANGE / 2, 0), seen=False),
+        "idle": _Bot((FAR_RANGE + 100, 0), state="patrol"),
+    }
+    lod = _scheduler()
+    counts = dict.fromkeys(bots, 0)
+    seconds = 10
+    for _ in range(int(seconds / DT)):
+        for bot, _elapsed in lod.select(DT, list(bots.values()), [(0, 0)]):
+            counts[next(k for k, b in bots.items() if b is bot)] += 1
+    assert counts["near"] == seconds / DT
+    for name, tier in (("mid", "mid"), ("far", "far"), ("unseen", "far"), ("idle", "idle")):
+        assert abs(counts[name] - THINK_HZ[tier] * seconds) <= 1, (name, counts)
+    assert lod.deferred == 0
+
+
+def test_budget_caps_each_frame_and_rotates_the_backlog():
+    bots = [_Bot((10 * i, 0)) for i in range(10)]   # all near: due every frame
+    lod = _scheduler(budget_ms=2.0)
+    picked = lod.select(DT, bots, [(0, 0)])
+    assert len(picked) == 10                       # no cost learned yet
+    lod.record(len(picked), 10.0)                  # 1 ms a think: two fit in the budget
+    seen = []
+    for frame in range(5):
+        picked = lod.select(DT, bots, [(0, 0)])
+        assert len(picked) == 2
+        seen += [b for b, _ in picked]
+        lod.record(len(picked), 2.0)
+    assert sorted(map(id, seen)) == sorted(map(id, bots))   # longest overdue first: each once
+    assert lod.deferred == 5 * 8
+    # the last bots waited five frames and are told so
+    assert [e for _, e in picked] == [pytest.approx(5 * DT)] * 2
+
+
+def test_run_stops_when_the_budget_is_spent(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(ai_lod.time, "perf_counter", lambda: clock[0])
+
+    def think(bot, elapsed):
+        clock[0] += 0.0007   # 0.7 ms a think
+
+    lod = _scheduler(budget_ms=2.0)
+    bots = [_Bot((10 * i, 0)) for i in range(10)]
+    assert lod.run(DT, bots, [(0, 0)], think) == 3
+    assert lod.deferred == 7
+    assert lod.run(DT, bots, [(0, 0)], lambda b, e: None) == 10   # a free frame clears the backlog
+
+
+def test_skipped_bots_replay_their_last_move(monkeypatch):
+    random.seed(3)
+    pygame.display.init()   # the human's input and mouse aim read it (dummy driver)
+    screen = pygame.Surface((S.SCREEN_WIDTH, S.SCREEN_HEIGHT))
+    game = Game(screen, read_map(DEFAULT_MAP), bot_count=0, human=True)
+    game.local_player.pos.update(100, 100)
+    game._spawn_bot("Bot1")
+    bot = game.bots[0]
+    bot.p.pos.update(1100, 600)      # beyond NEAR_RANGE and not fighting: rated, not every frame
+
+    fresh, applied = [], []
+    think = game.bot_ai.update
+    monkeypatch.setattr(game.bot_ai, "update", lambda *a: fresh.append(think(*a)) or fresh[-1])
+    move = bot.p.update
+    monkeypatch.setattr(bot.p, "update", lambda dt, mv, *a: applied.append((pygame.Vector2(mv), a[1])) or move(dt, mv, *a))
+
+    last = None
+    skipped = 0
+    for _ in range(120):
+        game.update(DT)
+        decision = fresh[-1].get(bot.p.id)
+        mv, shoot = applied[-1]
+        if decision is not None:
+            last = decision[0]
+            assert (mv, shoot) == (decision[0], decision[1])
+        else:
+            skipped += 1
+            assert mv == (last if last is not None else (0, 0)) and not shoot
+    assert skipped >= 30   # until it closes in and thinks every frame
+    assert game.ai_lod.between(bot) == last
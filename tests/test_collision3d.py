@@ -0,0 +1,69 @@
+import pytest
+
+pytest.importorskip("panda3d")
+from panda3d.core import NodePath, Vec3
+
+from game.collision3d import HitDetector3D
+from game.projectile3d import Paintball3D, PaintballPool3D
+
+
+class _Loader:
+    def loadModel(self, path):
+        return NodePath(path)
+
+
+class _Bot:
+    def __init__(self, root, name, pos):
+        self.name = name
+        self.alive = True
+        self.node = root.attach_new_node(name)
+        self.node.set_pos(*pos)
+
+
+def _scene(bot_pos):
+    root = NodePath("render")
+    hits = HitDetector3D(root)
+    hits.add_wall((10, -10), (10, 10), 4.0)
+    bot = _Bot(root, "bot", bot_pos)
+    hits.add_target(bot, "Red", radius=1.0)
+    pool = PaintballPool3D(root, _Loader(), size=4)
+    return root, hits, bot, pool
+
+
+def _fly(hits, pool, origin, direction, frames, dt=0.05, speed=20.0):
+    ball = Paintball3D(None, Vec3(*origin), Vec3(*direction), speed=speed, ttl=5.0, pool=pool)
+    hits.add_ball(ball, "Blue")
+    for _ in range(frames):
+        ball.update(dt)
+        found = hits.resolve([ball])
+        if found:
+            return found[0]
+    return None
+
+
+def test_ball_hits_bot_on_its_path():
+    _, hits, bot, pool = _scene((5, 0, 2))
+    hit = _fly(hits, pool, (0, 0, 2), (1, 0, 0), frames=10)
+    assert hit is not None and hit[1] is bot
+
+
+def test_ball_passing_beside_bot_misses():
+    # 1.5 units off the flight line: outside the 1.0 hit sphere in every direction of travel
+    for d in ((1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0)):
+        _, hits, bot, pool = _scene((5 * d[0] + 1.5 * abs(d[1]), 5 * d[1] + 1.5 * abs(d[0]), 2))
+        hit = _fly(hits, pool, (0, 0, 2), d, frames=8)
+        assert hit is None or hit[1] is not bot
+
+
+def test_ball_stops_at_wall():
+    _, hits, bot, pool = _scene((0, 8, 2))
+    hit = _fly(hits, pool, (0, 0, 2), (1, 0, 0), frames=20)
+    assert hit is not None and hit[1] is None
+    assert abs(hit[2].x - 10) < 1e-4
+
+
+def test_unmoved_ball_is_not_tested():
+    _, hits, bot, pool = _scene((0, 0, 2))
+    ball = Paintball3D(None, Vec3(0, 0, 2), Vec3(1, 0, 0), pool=pool)
+    hits.add_ball(ball, "Blue")
+    assert hits.resolve([ball]) == []
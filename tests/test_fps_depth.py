@@ -0,0 +1,109 @@
+import math
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pytest
+
+from game import fps
+from game.fps_bench import generate_map
+from game.fps_map import MAP
+from game.fps_parallel import StripPool
+
+TOL = 1e-6
+POSES = 25
+
+GENERATED = generate_map(64, 0.02, seed=3)
+
+
+def _poses(game_map, seed, n=POSES):
+    """Random (px, py, angle) at least a quarter cell inside empty cells."""
+    rng = np.random.default_rng(seed)
+    h, w = len(game_map), len(game_map[0])
+    out = []
+    while len(out) < n:
+        cx, cy = rng.uniform(0.25, w - 0.25), rng.uniform(0.25, h - 0.25)
+        if game_map[int(cy)][int(cx)] == 0:
+            out.append((cx * fps.WALL_SIZE, cy * fps.WALL_SIZE, rng.uniform(0.0, 2 * math.pi)))
+    return out
+
+
+def _worst(game_map, seed, **kwargs):
+    return max(fps.depth_parity_error(px, py, a, game_map, num_rays=240, **kwargs)
+               for px, py, a in _poses(game_map, seed))
+
+
+@pytest.mark.parametrize("game_map", [MAP, GENERATED], ids=["fps_map", "generated"])
+def test_depth_buffer_matches_reference(game_map):
+    assert _worst(game_map, 1) < TOL
+
+
+@pytest.mark.parametrize("skip", [True, False])
+@pytest.mark.parametrize("game_map", [MAP, GENERATED], ids=["fps_map", "generated"])
+def test_skip_paths_match_reference(game_map, skip):
+    # long range so rays cross the open middle of the generated map
+    depth = fps.WALL_SIZE * len(game_map)
+    assert _worst(game_map, 2, skip=skip, max_depth=depth) < TOL
+
+
+@pytest.mark.parametrize("game_map", [MAP, GENERATED], ids=["fps_map", "generated"])
+def test_pooled_depth_buffer_matches_reference(game_map):
+    with StripPool(workers=3) as pool:
+        assert _worst(game_map, 3, pool=pool) < TOL
+        assert _worst(game_map, 4, pool=pool, skip=True) < TOL
+
+
+def test_skip_field_follows_openness():
+    assert fps.skip_field(MAP) is None
+    open_map = generate_map(64, 0.0, seed=1)
+    assert fps.skip_field(open_map) is not None
+
+
+CORNERS = generate_map(64, 0.02, seed=2)  # 45-degree rays here once jumped across corner ties
+AXES = [k * math.pi / 4 for k in range(8)]
+
+
+def _grid_poses(game_map, stride=3):
+    """(px, py) at the centre and the top-left corner of every stride-th empty cell."""
+    out = []
+    for cy in range(1, len(game_map) - 1, stride):
+        for cx in range(1, len(game_map[0]) - 1, stride):
+            if game_map[cy][cx] == 0:
+                out += [((cx + 0.5) * fps.WALL_SIZE, (cy + 0.5) * fps.WALL_SIZE),
+                        (cx * fps.WALL_SIZE, cy * fps.WALL_SIZE)]
+    return out
+
+
+@pytest.mark.parametrize("game_map", [GENERATED, CORNERS], ids=["generated", "corners"])
+def test_skip_matches_dda_on_grid_aligned_rays(game_map):
+    depth = fps.WALL_SIZE * len(game_map)
+    field = fps.distance_field(game_map)
+    poses = [(px, py, a) for px, py in _grid_poses(game_map) for a in AXES]
+    plain = [fps.cast_single_ray_dda(px, py, a, game_map, depth) for px, py, a in poses]
+    jumped = [fps.cast_single_ray_dda(px, py, a, game_map, depth, field=field) for px, py, a in poses]
+    assert jumped == plain
+
+    origins = np.array([p[:2] for p in poses])
+    angles = np.array([p[2] for p in poses])
+    batched = fps.hitscan_batch(origins, angles, depth, game_map, skip=True)
+    reference = fps.hitscan_batch(origins, angles, depth, game_map, skip=False)
+    assert np.array_equal(batched.dist, reference.dist)
+    assert np.array_equal(batched.dist, [p[0] for p in plain])
+
+
+def test_skip_keeps_the_corner_tie():
+    # the reported ray: a 45-degree cast that the jump used to carry through a wall corner
+    hits = fps.hitscan_batch(np.array([[1312.0, 160.0]]), np.array([math.pi / 4]), 5000, CORNERS, skip=True)
+    ref = fps.cast_single_ray_dda(1312.0, 160.0, math.pi / 4, CORNERS, 5000)
+    assert hits.dist[0] == ref[0]
+
+
+def test_minimap_layer_follows_a_new_map():
+    cell = 4
+    wall, floor = (60, 60, 66, 255), (28, 30, 36, 255)
+    for first in range(2):
+        game_map = [[(x + y + first) % 2 for x in range(8)] for y in range(6)]
+        layer = fps.minimap_layer(game_map, cell)
+        assert tuple(layer.get_at((3, 3))) == (wall if game_map[0][0] else floor)
+        del game_map, layer   # the next map may get the freed id
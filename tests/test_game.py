@@ -0,0 +1,74 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from core import settings as S
+from game.game import Game
+from game.player import ArenaPlayer
+
+W, H = 12, 8
+
+
+def _open_game():
+    tiles = [[0] * W for _ in range(H)]
+    screen = pygame.Surface((S.SCREEN_WIDTH, S.SCREEN_HEIGHT))
+    return Game(screen, {"width": W, "height": H, "tiles": tiles, "spawns": [(100, 100)]},
+                bot_count=0, human=False)
+
+
+def test_player_fires_through_the_pool():
+    game = _open_game()
+    pl = ArenaPlayer((100, 100), "A")
+    game.players.append(pl)
+    pl.update(0.0, (0, 0), (200, 100), True, False, game.solids, game.projectiles)
+    assert game.projectiles.spawned == 1 and len(game.projectiles) == 1
+    assert pl.ammo == pl.max_ammo - 1
+
+
+def test_balls_stop_at_the_arena_edge():
+    game = _open_game()
+    pl = ArenaPlayer((100, 100), "A")
+    game.players.append(pl)
+    # no walls: only the arena bounds can stop a ball flying left
+    game.projectiles.spawn(pl.pos, (-1, 0), pl, pl.team_name, pl.color, life=10.0)
+    game.update(0.5)
+    assert len(game.projectiles) == 0
+    assert game.projectiles.pos[0].tolist() == [game.bounds.left, 100]
+
+
+def test_spawn_protection_logs_no_damage():
+    game = _open_game()
+    game.events = []
+    shooter, fresh = ArenaPlayer((100, 100), "A"), ArenaPlayer((300, 100), "B")
+    game.players += [shooter, fresh]
+    game.projectiles.spawn(shooter.pos, (1, 0), shooter, shooter.team_name, shooter.color)
+    for _ in range(30):
+        game.update(1 / 60)
+    assert fresh.invuln > 0 and fresh.health == S.PLAYER_MAX_HEALTH
+    assert game.events == []
+
+    fresh.invuln = 0.0
+    game.projectiles.spawn(shooter.pos, (1, 0), shooter, shooter.team_name, shooter.color)
+    for _ in range(30):
+        game.update(1 / 60)
+    assert [e[0] for e in game.events] == ["hit"]
+    assert S.PLAYER_MAX_HEALTH - fresh.health == game.events[0][4]
+
+
+def test_splash_tie_goes_to_the_earliest_hit():
+    for late_first in (True, False):
+        game = _open_game()
+        game.events = []
+        # late has the lower id, so only the impact time can credit early
+        late, early = ArenaPlayer((600, 400), "A"), ArenaPlayer((700, 400), "B")
+        victim = ArenaPlayer((300, 100), "C")
+        victim.invuln = 0.0
+        game.players += [late, early, victim]
+        r = victim.radius()
+        shots = [(late, (300 - r - 40, 100), (1, 0)), (early, (300, 100 + r + 10), (0, -1))]
+        for owner, pos, direction in (shots if late_first else shots[::-1]):
+            game.projectiles.spawn(pos, direction, owner, owner.team_name, owner.color, speed=600)
+        game.update(0.1)   # both balls land this tick, 35 damage each
+        assert game.events == [("hit", 0.0, early.id, victim.id, 70)]
@@ -0,0 +1,39 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pytest
+
+from game.map import WALL, merge_tiles
+
+
+def _cover(rects, shape):
+    """How many rects cover each cell."""
+    count = np.zeros(shape, dtype=int)
+    for x, y, w, h in rects:
+        assert w > 0 and h > 0
+        count[y:y + h, x:x + w] += 1
+    return count
+
+
+@pytest.mark.parametrize("density", [0.0, 0.1, 0.5, 0.9, 1.0])
+def test_merged_rects_cover_exactly_the_walls(density):
+    rng = np.random.default_rng(int(density * 10))
+    for _ in range(40):
+        h, w = rng.integers(1, 30, size=2)
+        tiles = np.where(rng.random((h, w)) < density, WALL, rng.choice([0, 2], size=(h, w))).astype(np.uint8)
+        rects = merge_tiles(tiles)
+        assert (_cover(rects, tiles.shape) == (tiles == WALL)).all()   # every wall once, nothing else
+        assert rects == merge_tiles(tiles.tolist())
+        assert (_cover(merge_tiles(tiles, 2), tiles.shape) == (tiles == 2)).all()
+
+
+def test_ragged_rows_merge_only_existing_cells():
+    tiles = [[WALL, WALL, WALL], [WALL], [WALL, WALL, 0, WALL]]
+    rects = merge_tiles(tiles)
+    count = _cover(rects, (3, 4))
+    walls = np.zeros((3, 4), dtype=bool)
+    for y, row in enumerate(tiles):
+        walls[y, :len(row)] = np.array(row) == WALL
+    assert (count == walls).all()
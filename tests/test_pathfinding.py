@@ -0,0 +1,73 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+
+from core import settings as S
+from game.chunked_map import ChunkedTileMap
+from game.map import WALL, TileMap
+from game.pathfinding import FlowFieldService
+
+T = S.TILE_SIZE
+
+
+def _px(x, y):
+    return ((x + 0.5) * T, (y + 0.5) * T)
+
+
+def _arena(w, h):
+    tiles = np.zeros((h, w), dtype=np.uint8)
+    tiles[0, :] = tiles[-1, :] = tiles[:, 0] = tiles[:, -1] = WALL
+    return tiles
+
+
+def _expand(paths):
+    while paths.stats()["pending"]:
+        paths.tick()
+
+
+def test_set_tile_drops_the_fields_it_touches():
+    tiles = _arena(20, 12)
+    tm = TileMap({"width": 20, "height": 12, "tiles": tiles.tolist()})
+    paths = FlowFieldService(tm, radius=4)
+    near = paths.field(_px(5, 5))
+    far = paths.field(_px(15, 5))
+    _expand(paths)
+    assert near.distance(6, 5) == 1
+
+    tm.set_tile(6, 5, WALL)
+    assert (5, 5) not in paths.fields and paths.fields[(15, 5)] is far
+    fresh = paths.field(_px(5, 5))
+    _expand(paths)
+    assert fresh is not near and fresh.distance(6, 5) is None
+
+
+def test_chunked_fields_read_edits_without_loading_chunks():
+    tiles = _arena(300, 300)
+    tm = ChunkedTileMap({"tiles": tiles})
+    paths = FlowFieldService(tm, radius=6)
+    tm.set_tile(150, 151, WALL)   # before the field exists: comes from the edit log
+    f = paths.field(_px(150, 150))
+    _expand(paths)
+    assert tm.stats()["loads"] == 0
+    assert f.distance(150, 151) is None and f.distance(151, 151) == 2
+
+    tm.set_tile(150, 149, WALL)   # after: the field is rebuilt around the new wall
+    f = paths.field(_px(150, 150))
+    _expand(paths)
+    assert f.distance(150, 149) is None and f.distance(150, 148) == 4
+
+
+def test_fixed_step_budget_reads_the_setting_each_tick(monkeypatch):
+    tiles = _arena(40, 40)
+    tm = TileMap({"width": 40, "height": 40, "tiles": tiles.tolist()})
+    paths = FlowFieldService(tm, radius=12, fixed_steps=True)
+    for x in (8, 20, 31):
+        paths.field(_px(x, 20))
+    monkeypatch.setattr("game.pathfinding.FIELD_BUDGET_STEPS", 4)
+    paths.tick()
+    assert paths.stats()["steps"] == 6   # whole round-robin rounds, stopped once 4 are spent
+    monkeypatch.setattr("game.pathfinding.FIELD_BUDGET_STEPS", 9)
+    paths.tick()
+    assert paths.stats()["steps"] == 15
@@ -0,0 +1,67 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from core import settings as S
+from core.config import PAINTBALL_RADIUS as R
+from core.spatial import SpatialGrid
+from game.player import ArenaPlayer
+from game.projectile import Paintball, ProjectilePool, sweep_projectiles
+
+T = S.TILE_SIZE
+DT = 0.1
+SPEED = 6000.0   # 600 px, 12.5 tiles, per step
+WALL = pygame.Rect(10 * T, 2 * T, T, T)   # one tile thick
+
+
+def _solids(kind):
+    return SpatialGrid([WALL], T) if kind == "grid" else [WALL]
+
+
+def _step(kind, pos, direction, solids, targets=()):
+    """Fire one ball and take one step; (t, x, y, target) of where it stopped, or None."""
+    if kind == "pool":
+        pool = ProjectilePool(capacity=4)
+        pool.spawn(pos, direction, None, "A", (255, 0, 0), speed=SPEED)
+        hits = pool.step(DT, solids, targets)
+        return (hits.t[0], hits.x[0], hits.y[0], hits.target[0]) if len(hits.t) else None
+    ball = Paintball(pos, direction, None, "A", (255, 0, 0), speed=SPEED)
+    hits = sweep_projectiles([ball], DT, solids, targets)
+    return (hits[0].t, hits[0].x, hits[0].y, hits[0].target) if hits else None
+
+
+@pytest.mark.parametrize("solid_kind", ["grid", "list"])
+@pytest.mark.parametrize("kind", ["pool", "balls"])
+def test_fast_ball_stops_at_a_thin_wall(kind, solid_kind):
+    y = WALL.centery
+    t, x, hy, target = _step(kind, (100, y), (1, 0), _solids(solid_kind))
+    assert t == pytest.approx((WALL.left - R - 100) / (SPEED * DT))
+    assert (x, hy, target) == (pytest.approx(WALL.left - R), y, None)
+
+    # from the far side, and straight down onto it
+    t, x, _, _ = _step(kind, (WALL.right + 300, y), (-1, 0), _solids(solid_kind))
+    assert t == pytest.approx((300 - R) / (SPEED * DT))
+    assert x == pytest.approx(WALL.right + R)
+    t, _, hy, _ = _step(kind, (WALL.centerx, 10), (0, 1), _solids(solid_kind))
+    assert t == pytest.approx((WALL.top - R - 10) / (SPEED * DT))
+    assert hy == pytest.approx(WALL.top - R)
+
+
+@pytest.mark.parametrize("kind", ["pool", "balls"])
+def test_fast_ball_hits_a_player_it_would_jump(kind):
+    victim = ArenaPlayer((400, 500), "B")
+    start = 400 - 250
+    t, x, _, target = _step(kind, (start, 500), (1, 0), [], [victim])
+    assert target is victim
+    assert t == pytest.approx((250 - victim.radius() - R) / (SPEED * DT))
+    assert x == pytest.approx(400 - victim.radius() - R)
+
+
+@pytest.mark.parametrize("kind", ["pool", "balls"])
+def test_wall_in_front_of_a_player_shields_them(kind):
+    victim = ArenaPlayer((WALL.right + 60, WALL.centery), "B")
+    t, x, _, target = _step(kind, (100, WALL.centery), (1, 0), _solids("grid"), [victim])
+    assert target is None and x == pytest.approx(WALL.left - R)
@@ -0,0 +1,81 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import random
+
+import pygame
+import pytest
+
+from core.spatial import SpatialGrid, segment_hits_rect, sweep_rect
+
+CELL = 32
+SIZE = 20 * CELL
+
+
+def _tiles(rng, density=0.2):
+    return [pygame.Rect(x * CELL, y * CELL, CELL, CELL)
+            for y in range(20) for x in range(20) if rng.random() < density]
+
+
+def _loose(rng, n=40):
+    """Unaligned rects, many spanning several cells."""
+    return [pygame.Rect(rng.randrange(SIZE), rng.randrange(SIZE), rng.randrange(1, 120), rng.randrange(1, 120))
+            for _ in range(n)]
+
+
+def _point(rng):
+    return rng.uniform(-20, SIZE + 20), rng.uniform(-20, SIZE + 20)
+
+
+def _key(rects):
+    return sorted(tuple(r) for r in rects)
+
+
+@pytest.mark.parametrize("layout", [_tiles, _loose], ids=["tiles", "loose"])
+def test_query_rect_matches_a_full_scan(layout):
+    rng = random.Random(1)
+    solids = layout(rng)
+    grid = SpatialGrid(solids, CELL)
+    for _ in range(300):
+        box = pygame.Rect(rng.randrange(-40, SIZE), rng.randrange(-40, SIZE), rng.randrange(0, 200), rng.randrange(0, 200))
+        found = grid.query_rect(box)
+        assert len(found) == len({id(r) for r in found})   # a spanning rect comes back once
+        want = [s for s in solids if box.colliderect(s)]
+        assert _key(found) == _key(want)
+        assert grid.collides_rect(box) == bool(want)
+
+
+def test_spanning_rect_is_reported_once():
+    big, tile = pygame.Rect(10, 10, 5 * CELL, 3 * CELL), pygame.Rect(0, 0, CELL, CELL)
+    grid = SpatialGrid([big, tile], CELL)
+    assert sum(0 in ids for ids in grid.buckets.values()) == 24   # bucketed under 6 x 4 cells
+    assert _key(grid.query_rect((0, 0, SIZE, SIZE))) == _key([big, tile])
+    assert grid.query_rect(big.inflate(-60, -60)) == [big]   # spans 4 x 2 cells, clear of the tile
+
+
+@pytest.mark.parametrize("layout", [_tiles, _loose], ids=["tiles", "loose"])
+def test_line_of_sight_matches_a_full_scan(layout):
+    rng = random.Random(2)
+    solids = layout(rng)
+    grid = SpatialGrid(solids, CELL)
+    for _ in range(500):
+        a, b = _point(rng), _point(rng)
+        assert grid.line_of_sight(a, b) == (not any(segment_hits_rect(a, b, s) for s in solids))
+
+
+@pytest.mark.parametrize("radius", [0.0, 6.0, 40.0])
+@pytest.mark.parametrize("layout", [_tiles, _loose], ids=["tiles", "loose"])
+def test_sweep_finds_the_earliest_contact(layout, radius):
+    rng = random.Random(3)
+    solids = layout(rng)
+    grid = SpatialGrid(solids, CELL)
+    for _ in range(300):
+        a, b = _point(rng), _point(rng)
+        times = [t for t in (sweep_rect(a, b, s, radius) for s in solids) if t is not None]
+        hit = grid.sweep(a, b, radius)
+        if not times:
+            assert hit is None
+        else:
+            t, rect = hit
+            assert t == min(times) and sweep_rect(a, b, rect, radius) == t
@@ -0,0 +1,54 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import random
+
+import pygame
+
+from core.spatial import SpatialGrid
+from core.utils import VisibilityCache, line_of_sight
+
+CELL = 32
+
+
+def _walls(seed, n=20, density=0.25):
+    rng = random.Random(seed)
+    return [pygame.Rect(x * CELL, y * CELL, CELL, CELL)
+            for y in range(n) for x in range(n) if rng.random() < density]
+
+
+def test_visibility_is_symmetric_and_matches_line_of_sight():
+    grid = SpatialGrid(_walls(1), CELL)
+    cache = VisibilityCache(grid)
+    rng = random.Random(2)
+    for _ in range(400):
+        a = (rng.uniform(0, 20 * CELL), rng.uniform(0, 20 * CELL))
+        b = (rng.uniform(0, 20 * CELL), rng.uniform(0, 20 * CELL))
+        first, second = min(a, b), max(a, b)
+        assert cache.visible(a, b) == cache.visible(b, a) == line_of_sight(first, second, grid)
+
+
+def test_pairs_are_counted_once_per_tick():
+    cache = VisibilityCache(SpatialGrid(_walls(3), CELL))
+    a, b = pygame.Vector2(40, 40), pygame.Vector2(500, 300)
+    cache.visible(a, b)
+    cache.visible(b, a)                     # same entry, other order
+    cache.visible((40.0, 40.0), (500, 300))  # tuples and Vector2 share keys
+    assert (cache.misses, cache.hits, len(cache.table)) == (1, 2, 1)
+    cache.visible(a, (41, 40))
+    assert (cache.misses, cache.hits, len(cache.table)) == (2, 2, 2)
+    assert cache.stats() == {"hits": 2, "misses": 2, "ticks": 0, "hit_rate": 0.5}
+
+
+def test_next_tick_forgets_last_ticks_answers():
+    grid = SpatialGrid([], CELL)
+    cache = VisibilityCache(grid)
+    a, b = (16, 16), (300, 16)
+    assert cache.visible(a, b)
+    grid.reset([pygame.Rect(5 * CELL, 0, CELL, CELL)])   # a wall drops between them
+    assert cache.visible(a, b)                           # still this tick's answer
+    cache.next_tick()
+    assert not cache.table and cache.ticks == 1
+    assert not cache.visible(a, b)
+    assert (cache.misses, cache.hits) == (2, 1)